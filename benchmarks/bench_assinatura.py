@@ -0,0 +1,64 @@
+"""
+Custo por assinatura de um evento de cancelamento instanciando o
+`Assinatura` a cada chamada e reaproveitando o assinador do certificado.
+
+    python benchmarks/bench_assinatura.py [repeticoes]
+"""
+
+import sys
+import timeit
+
+from erpbrasil.assinatura import misc
+from erpbrasil.assinatura.assinatura import Assinatura
+from erpbrasil.assinatura.certificado import Certificado
+from erpbrasil.edoc.assinador import obter_assinador
+from lxml import etree
+
+EVENTO = b"""<evento xmlns="http://www.portalfiscal.inf.br/nfe" versao="1.00">
+<infEvento Id="ID1101113524011234567800019555001000000001100000000101">
+<cOrgao>35</cOrgao><tpAmb>2</tpAmb><CNPJ>12345678000195</CNPJ>
+<chNFe>35240112345678000195550010000000011000000001</chNFe>
+<dhEvento>2024-01-16T14:00:00-03:00</dhEvento><tpEvento>110111</tpEvento>
+<nSeqEvento>1</nSeqEvento><verEvento>1.00</verEvento></infEvento></evento>"""
+
+ID = "ID1101113524011234567800019555001000000001100000000101"
+
+
+def main(repeticoes=200):
+    certificado = Certificado(
+        misc.create_fake_certificate_file(
+            valid=True,
+            passwd="123456",
+            issuer="EMISSOR A TESTE",
+            country="BR",
+            subject="CERTIFICADO VALIDO TESTE",
+        ),
+        "123456",
+    )
+
+    def por_chamada():
+        assinado = Assinatura(certificado).assina_xml2(etree.fromstring(EVENTO), ID)
+        return assinado.replace("\n", "").replace("\r", "")
+
+    def reaproveitado():
+        assinador = obter_assinador(certificado)
+        return etree.tostring(
+            assinador.assina_etree(etree.fromstring(EVENTO), ID), encoding=str
+        )
+
+    def nfse_por_chamada():
+        return Assinatura(certificado).assina_nfse(etree.fromstring(EVENTO))
+
+    def nfse_reaproveitado():
+        return obter_assinador(certificado).assina_nfse(etree.fromstring(EVENTO))
+
+    assert por_chamada() == reaproveitado()
+    assert nfse_por_chamada() == nfse_reaproveitado()
+
+    for funcao in (por_chamada, reaproveitado, nfse_por_chamada, nfse_reaproveitado):
+        tempo = min(timeit.repeat(funcao, number=repeticoes, repeat=3)) / repeticoes
+        print(f"{funcao.__name__:>20}: {tempo * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
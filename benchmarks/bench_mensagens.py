@@ -0,0 +1,52 @@
+"""
+Compara a montagem das mensagens de formato fixo pelos bindings do
+generateDS (export + fromstring) e pelos esqueletos pré-analisados.
+
+    python benchmarks/bench_mensagens.py [repetições]
+"""
+
+import sys
+import timeit
+from unittest import mock
+
+from erpbrasil.edoc.nfe import NFe
+from lxml import etree
+
+CHAVE = "35200159594315000157550010000000012062777161"
+
+
+def main(repeticoes=2000):
+    nfe = NFe(None, "35", versao="4.00", ambiente="1")
+    mensagens = {
+        "consStatServ": nfe.status_servico,
+        "consSitNFe": lambda: nfe.consulta_documento(CHAVE),
+        "consReciNFe": lambda: nfe.consulta_recibo(numero="351000000000001"),
+        "distDFeInt": lambda: nfe.consultar_distribuicao(
+            "59594315000157", ultimo_nsu="000000000000010"
+        ),
+    }
+
+    # Mede apenas a montagem do elemento enviado ao webservice
+    def post(raiz, url, operacao, classe):
+        return nfe._generateds_to_etree(raiz)
+
+    with mock.patch.object(nfe, "_post", post):
+        for nome, montar in mensagens.items():
+            tempos = {}
+            resultados = []
+            for esqueletos_xml in (False, True):
+                nfe.esqueletos_xml = esqueletos_xml
+                resultados.append(etree.tostring(montar(), method="c14n"))
+                tempos[esqueletos_xml] = (
+                    min(timeit.repeat(montar, number=repeticoes, repeat=5)) / repeticoes
+                )
+            assert resultados[0] == resultados[1]
+            print(
+                f"{nome:>12}: generateDS {tempos[False] * 1e6:8.1f} us"
+                f"  esqueleto {tempos[True] * 1e6:8.1f} us"
+                f"  ({tempos[False] / tempos[True]:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
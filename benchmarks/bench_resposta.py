@@ -0,0 +1,49 @@
+"""
+Compara a análise de um retConsReciNFe com muitos protNFe reanalisando o
+XML (tostring + parseString) e montando o binding direto do elemento.
+
+    python benchmarks/bench_resposta.py [quantidade de protNFe]
+"""
+
+import sys
+import timeit
+
+from erpbrasil.edoc.resposta import construir_binding
+from erpbrasil.nfelib_legacy.v4_00 import retConsReciNFe
+from lxml import etree
+
+PROT_NFE = """<protNFe versao="4.00"><infProt>
+<tpAmb>1</tpAmb><verAplic>SP_NFE_PL009_V4</verAplic>
+<chNFe>3524011234567800019555001{numero:09d}1000000000</chNFe>
+<dhRecbto>2024-01-16T14:00:00-03:00</dhRecbto><nProt>135240000000000</nProt>
+<digVal>abcd1234abcd1234abcd1234abcd123=</digVal><cStat>100</cStat>
+<xMotivo>Autorizado o uso da NF-e</xMotivo></infProt></protNFe>"""
+
+RET_CONS_RECI = """<retConsReciNFe versao="4.00"
+xmlns="http://www.portalfiscal.inf.br/nfe"><tpAmb>1</tpAmb><verAplic>SP_NFE_PL009_V4</verAplic><nRec>351000000000000</nRec>
+<cStat>104</cStat><xMotivo>Lote processado</xMotivo><cUF>35</cUF>
+<dhRecbto>2024-01-16T14:00:00-03:00</dhRecbto>{protocolos}</retConsReciNFe>"""
+
+
+def main(quantidade=50, repeticoes=20):
+    xml = RET_CONS_RECI.format(
+        protocolos="".join(PROT_NFE.format(numero=i) for i in range(quantidade))
+    ).encode()
+    elemento = etree.fromstring(xml)
+    retConsReciNFe.Validate_simpletypes_ = False
+
+    def reanalisando():
+        return retConsReciNFe.parseString(etree.tostring(elemento), silence=True)
+
+    def direto():
+        return construir_binding(elemento, retConsReciNFe)
+
+    assert len(direto().protNFe) == len(reanalisando().protNFe) == quantidade
+
+    for nome, funcao in (("tostring + parseString", reanalisando), ("build", direto)):
+        tempo = min(timeit.repeat(funcao, number=repeticoes, repeat=5)) / repeticoes
+        print(f"{nome:>24}: {tempo * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -33,6 +33,9 @@ nfelib_require = [
 mdfelib_require = [
     "mdfelib",
 ]
+async_require = [
+    "httpx",
+]
 
 
 def read(*names, **kwargs):
@@ -104,6 +107,7 @@ setup(
         "nfselib.issnet": nfselib_issnet_require,
         "nfelib": nfelib_require,
         "mdfelib": mdfelib_require,
+        "async": async_require,
     },
     setup_requires=[],
     entry_points={
@@ -0,0 +1,277 @@
+# License MIT
+
+import collections
+import gzip
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+
+from lxml import etree
+
+DocumentoArquivado = collections.namedtuple(
+    "DocumentoArquivado",
+    "hash chave nsu interessado cnpj modelo data schema",
+)
+
+_CAMPOS = DocumentoArquivado._fields
+
+# Chave de acesso no protocolo/resumo ou no Id do documento
+_CHAVE = re.compile(rb"<ch(?:NFe|CTe|MDFe)>(\d{44})<|Id=\"(?:NFe|CTe|MDFe)(\d{44})\"")
+
+# Data de emissão do documento ou do evento, no início do dhEmi/dhEvento
+_DATA_XML = re.compile(rb"<(?:dhEmi|dEmi|dhEvento)>(\d{4}-\d{2}-\d{2})")
+_DATA = re.compile(r"\d{4}-\d{2}(?:-\d{2})?")
+
+_FILTROS = {
+    "chave": "chave = ?",
+    "nsu": "nsu = ?",
+    "interessado": "interessado = ?",
+    "cnpj": "cnpj = ?",
+    "modelo": "modelo = ?",
+    "schema": "schema = ?",
+    "data_inicial": "data >= ?",
+    "data_final": "data <= ?",
+}
+
+
+def _condicoes(filtros):
+    """Cláusula WHERE e parâmetros dos filtros de `Acervo.buscar`"""
+    try:
+        condicoes = [_FILTROS[campo] for campo in filtros]
+    except KeyError as erro:
+        raise TypeError(f"Filtro desconhecido: {erro.args[0]}") from None
+    if not condicoes:
+        return "", []
+    return " WHERE " + " AND ".join(condicoes), list(filtros.values())
+
+
+def _bytes(xml):
+    if isinstance(xml, etree._Element):
+        return etree.tostring(xml)
+    if isinstance(xml, str):
+        return xml.encode("utf-8")
+    return xml
+
+
+def _data(valor):
+    """Data no formato AAAA-MM-DD de uma data/hora; quando apenas o ano e o
+    mês são conhecidos (chave de acesso), é usado o dia 01"""
+    encontrada = _DATA.match(valor or "")
+    if not encontrada:
+        return ""
+    data = encontrada.group()
+    return data if len(data) == 10 else data + "-01"
+
+
+def _chave(xml):
+    encontrada = _CHAVE.search(xml)
+    if encontrada:
+        return (encontrada.group(1) or encontrada.group(2)).decode("ascii")
+    return None
+
+
+class Acervo:
+    """Arquivo local dos XML de documentos fiscais.
+
+    Cada XML é gravado uma única vez em `diretorio/objetos`, compactado e
+    nomeado pelo seu SHA-256, e indexado em `diretorio/acervo.sqlite` por
+    chave, NSU, CNPJ/CPF interessado (distribuição de DF-e), CNPJ do
+    emitente, modelo e data. As consultas usam apenas os índices do SQLite,
+    sem percorrer os diretórios.
+
+    Quando não informados, chave, CNPJ, modelo e data são obtidos do XML:
+    a data, sempre no formato AAAA-MM-DD, vem do dhEmi/dhEvento ou, na sua
+    falta, do ano e mês da chave de acesso (dia 01)::
+
+        acervo = Acervo("/var/lib/edoc")
+        acervo.guardar(proc.processo_xml)
+        acervo.guardar_distribuidos(sincronizador.sincronizar(nfe, cnpj))
+        acervo.obter_xml(chave=chave)
+    """
+
+    def __init__(self, diretorio, timeout=30):
+        self.diretorio = diretorio
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(os.path.join(diretorio, "objetos"), exist_ok=True)
+        conexao = self._conexao()
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.executescript(
+            "CREATE TABLE IF NOT EXISTS documentos ("
+            "hash TEXT NOT NULL, chave TEXT NOT NULL, nsu TEXT NOT NULL, "
+            "interessado TEXT NOT NULL, cnpj TEXT NOT NULL, "
+            "modelo TEXT NOT NULL, data TEXT NOT NULL, schema TEXT NOT NULL, "
+            "UNIQUE (hash, chave, nsu, interessado));"
+            "CREATE INDEX IF NOT EXISTS documentos_chave ON documentos (chave);"
+            "CREATE INDEX IF NOT EXISTS documentos_nsu "
+            "ON documentos (interessado, nsu);"
+            "CREATE INDEX IF NOT EXISTS documentos_cnpj ON documentos (cnpj, data);"
+            "CREATE INDEX IF NOT EXISTS documentos_modelo "
+            "ON documentos (modelo, data);"
+        )
+
+    def _conexao(self):
+        # Conexões do sqlite3 não podem ser compartilhadas entre threads
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = self._local.conexao = sqlite3.connect(
+                os.path.join(self.diretorio, "acervo.sqlite"),
+                timeout=self.timeout,
+                isolation_level=None,
+            )
+        return conexao
+
+    def _caminho(self, hash):
+        return os.path.join(self.diretorio, "objetos", hash[:2], hash[2:] + ".xml.gz")
+
+    def _gravar_objeto(self, xml):
+        hash = hashlib.sha256(xml).hexdigest()
+        caminho = self._caminho(hash)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            # Grava em um arquivo temporário para que um objeto nunca seja
+            # lido pela metade
+            descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho))
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(gzip.compress(xml, compresslevel=6))
+            os.replace(temporario, caminho)
+        return hash
+
+    def _registro(
+        self,
+        xml,
+        chave=None,
+        nsu=None,
+        interessado=None,
+        cnpj=None,
+        modelo=None,
+        data=None,
+        schema=None,
+    ):
+        xml = _bytes(xml)
+        chave = chave or _chave(xml) or ""
+        if not data:
+            encontrada = _DATA_XML.search(xml)
+            if encontrada:
+                data = encontrada.group(1).decode("ascii")
+            elif len(chave) == 44:
+                data = f"20{chave[2:4]}-{chave[4:6]}"
+        return DocumentoArquivado(
+            self._gravar_objeto(xml),
+            chave,
+            nsu or "",
+            interessado or "",
+            cnpj or chave[6:20],
+            modelo or chave[20:22],
+            _data(data),
+            schema or "",
+        )
+
+    def guardar_varios(self, documentos):
+        """Grava vários documentos em uma única transação.
+
+        :param documentos: dicionários com os argumentos de `guardar`
+        :return: lista de DocumentoArquivado
+        """
+        registros = [self._registro(**documento) for documento in documentos]
+        conexao = self._conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            conexao.executemany(
+                "INSERT OR IGNORE INTO documentos (hash, chave, nsu, interessado, "
+                "cnpj, modelo, data, schema) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                registros,
+            )
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        conexao.execute("COMMIT")
+        return registros
+
+    def guardar(self, xml, **metadados):
+        """Grava um XML (bytes, str ou elemento) e o indexa.
+
+        :param metadados: chave, nsu, interessado, cnpj, modelo, data
+        (AAAA-MM-DD, as horas são descartadas) e schema
+        :return: DocumentoArquivado
+        """
+        return self.guardar_varios([dict(metadados, xml=xml)])[0]
+
+    def guardar_distribuidos(self, documentos):
+        """Grava os DocumentoDistribuido de um lote da distribuição de DF-e"""
+        itens = []
+        for documento in documentos:
+            resumo = documento.resumo
+            data = getattr(resumo, "dhEmi", None) or getattr(resumo, "dhEvento", None)
+            itens.append(
+                {
+                    "xml": documento.xml,
+                    "chave": getattr(resumo, "chNFe", None),
+                    "nsu": documento.nsu,
+                    "interessado": documento.cnpj_cpf,
+                    "data": data,
+                    "schema": documento.schema,
+                }
+            )
+        return self.guardar_varios(itens)
+
+    def guardar_processos(self, proc):
+        """Grava os processos montados por `monta_processo`"""
+        return self.guardar_varios(
+            {"xml": processo, "chave": chave}
+            for chave, processo in getattr(proc, "processos", {}).items()
+        )
+
+    def buscar(self, limite=None, **filtros):
+        """Documentos indexados, do mais antigo para o mais recente.
+
+        :param filtros: chave, nsu, interessado, cnpj, modelo, schema,
+        data_inicial e data_final (AAAA-MM-DD, inclusivas)
+        """
+        where, parametros = _condicoes(filtros)
+        sql = "SELECT " + ", ".join(_CAMPOS) + " FROM documentos" + where
+        sql += " ORDER BY rowid"
+        if limite:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        return [
+            DocumentoArquivado(*registro)
+            for registro in self._conexao().execute(sql, parametros)
+        ]
+
+    def obter(self, hash):
+        """XML (bytes) gravado com o hash informado"""
+        with gzip.open(self._caminho(hash), "rb") as arquivo:
+            return arquivo.read()
+
+    def obter_xml(self, **filtros):
+        """XML do último documento gravado que atenda aos filtros de `buscar`,
+        ou None"""
+        where, parametros = _condicoes(filtros)
+        registro = (
+            self._conexao()
+            .execute(
+                "SELECT hash FROM documentos" + where + " ORDER BY rowid DESC LIMIT 1",
+                parametros,
+            )
+            .fetchone()
+        )
+        return self.obter(registro[0]) if registro else None
+
+    def ultimo_nsu(self, interessado):
+        """Maior NSU gravado para o CNPJ/CPF interessado"""
+        registro = (
+            self._conexao()
+            .execute(
+                "SELECT MAX(nsu) FROM documentos WHERE interessado = ? AND nsu != ''",
+                (interessado,),
+            )
+            .fetchone()
+        )
+        return registro[0]
+
+    def __len__(self):
+        return self._conexao().execute("SELECT COUNT(*) FROM documentos").fetchone()[0]
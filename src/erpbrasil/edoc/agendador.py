@@ -0,0 +1,155 @@
+# License MIT
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+class ReciboPendente:
+    """Lote enviado aguardando o resultado do processamento"""
+
+    def __init__(self, documento, edoc, proc_envio):
+        self.documento = documento
+        self.edoc = edoc
+        self.proc_envio = proc_envio
+        self.proc_recibo = None
+        self.tentativas = 0
+        self.erro = None
+
+
+class AgendadorRecibos:
+    """Consulta os recibos de vários lotes com poucas threads.
+
+    Em vez de cada envio dormir o tempo médio em sua própria thread, os
+    recibos ficam em uma fila de prioridade ordenada pelo horário da próxima
+    consulta, atendida por `workers` threads. Ao final, o processo é montado
+    com `monta_processo` e o ReciboPendente é entregue ao `callback` ou, na
+    falta dele, ao iterador `concluidos()`.
+    """
+
+    def __init__(self, workers=4, callback=None):
+        self.workers = workers
+        self.callback = callback
+        self._fila = []
+        self._sequencia = itertools.count()
+        self._condicao = threading.Condition()
+        self._concluidos = queue.Queue()
+        self._em_andamento = 0
+        self._threads = []
+        self._encerrar = False
+
+    @property
+    def pendentes(self):
+        return self._em_andamento
+
+    def agendar(self, documento, edoc, proc_envio):
+        """Agenda a consulta do recibo de um envio assíncrono"""
+        pendente = ReciboPendente(documento, edoc, proc_envio)
+        with self._condicao:
+            self._em_andamento += 1
+            self._iniciar_threads()
+            self._enfileirar(pendente)
+        return pendente
+
+    def _enfileirar(self, pendente):
+        momento = time.monotonic() + pendente.documento._tempo_espera(
+            pendente.proc_envio
+        )
+        heapq.heappush(self._fila, (momento, next(self._sequencia), pendente))
+        self._condicao.notify()
+
+    def _iniciar_threads(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._executar, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _proximo(self):
+        with self._condicao:
+            while True:
+                if self._encerrar:
+                    return None
+                if self._fila:
+                    espera = self._fila[0][0] - time.monotonic()
+                    if espera <= 0:
+                        return heapq.heappop(self._fila)[2]
+                    self._condicao.wait(espera)
+                else:
+                    self._condicao.wait()
+
+    def _executar(self):
+        while True:
+            pendente = self._proximo()
+            if pendente is None:
+                return
+            try:
+                concluido = self._consultar(pendente)
+            except Exception as erro:
+                _logger.exception("Erro ao consultar o recibo")
+                pendente.erro = erro
+                concluido = True
+            if concluido:
+                self._entregar(pendente)
+            else:
+                with self._condicao:
+                    self._enfileirar(pendente)
+
+    def _consultar(self, pendente):
+        # Cada consulta usa uma cópia do documento para não disputar o
+        # cliente SOAP da transmissão entre as threads
+        documento = pendente.documento
+        proc_recibo = documento._clonar().consulta_recibo(
+            proc_envio=pendente.proc_envio
+        )
+        pendente.proc_recibo = proc_recibo
+        documento._observa_recibo(pendente.proc_envio, proc_recibo)
+        if not proc_recibo.resposta:
+            return True
+        if (
+            documento._edoc_situacao_em_processamento(proc_recibo)
+            and pendente.tentativas < documento._maximo_tentativas_consulta_recibo
+        ):
+            pendente.tentativas += 1
+            return False
+        documento.monta_processo(pendente.edoc, pendente.proc_envio, proc_recibo)
+        return True
+
+    def _entregar(self, pendente):
+        try:
+            if self.callback:
+                self.callback(pendente)
+            else:
+                self._concluidos.put(pendente)
+        finally:
+            with self._condicao:
+                self._em_andamento -= 1
+                self._condicao.notify_all()
+
+    def concluidos(self):
+        """Iterador dos recibos concluídos, até que não haja pendentes"""
+        while True:
+            try:
+                yield self._concluidos.get(timeout=0.1)
+            except queue.Empty:
+                if not self._em_andamento and self._concluidos.empty():
+                    return
+
+    def aguardar(self, timeout=None):
+        """Bloqueia até que todos os recibos agendados sejam concluídos"""
+        with self._condicao:
+            return self._condicao.wait_for(
+                lambda: not self._em_andamento, timeout=timeout
+            )
+
+    def fechar(self):
+        with self._condicao:
+            self._encerrar = True
+            self._condicao.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
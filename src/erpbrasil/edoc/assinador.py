@@ -0,0 +1,154 @@
+# License MIT
+
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import signxml
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from lxml import etree
+
+from erpbrasil.assinatura.assinatura import XMLSignerWithSHA1
+
+NAMESPACE_DS = "http://www.w3.org/2000/09/xmldsig#"
+C14N = "http://www.w3.org/TR/2001/REC-xml-c14n-20010315"
+
+
+class Assinador:
+    """Assinatura XML que recebe e devolve elementos lxml.
+
+    Produz o mesmo resultado do `Assinatura.assina_xml2` seguido da remoção
+    das quebras de linha feita pelo `assina_raiz`, mas sem converter o
+    documento para texto, permitindo anexá-lo diretamente ao lote.
+
+    A chave privada, o certificado e os XMLSigner são preparados uma única
+    vez; use `obter_assinador` para reaproveitar a instância do certificado.
+    """
+
+    def __init__(self, certificado):
+        # Não guarda o certificado para não impedir a sua coleta enquanto
+        # o assinador estiver no cache
+        self.chave = certificado.key
+        self.cert = certificado._cert.decode()
+        self.cadeia = [self.cert]
+
+        self._signer = XMLSignerWithSHA1(
+            method=signxml.methods.enveloped,
+            signature_algorithm="rsa-sha1",
+            digest_algorithm="sha1",
+            c14n_algorithm=C14N,
+        )
+        self._signer.excise_empty_xmlns_declarations = True
+        self._signer.namespaces = {None: signxml.namespaces.ds}
+
+        self._signer_nfse = XMLSignerWithSHA1(
+            method=signxml.methods.enveloped,
+            signature_algorithm="rsa-sha1",
+            digest_algorithm="sha1",
+            c14n_algorithm=C14N,
+        )
+
+    @classmethod
+    def de_pem(cls, chave, cert):
+        """Assinador a partir dos bytes PEM da chave e do certificado
+        (`Certificado._chave` e `Certificado._cert`), para uso em outros
+        processos, onde o Certificado não está disponível."""
+        return cls(SimpleNamespace(key=load_pem_private_key(chave, None), _cert=cert))
+
+    def assina_etree(self, xml_element, reference, getchildren=False):
+        for element in xml_element.iter("*"):
+            if element.text is not None and not element.text.strip():
+                element.text = None
+            if element.tail is not None and not element.tail.strip():
+                element.tail = None
+
+        signed_root = self._signer.sign(
+            xml_element,
+            key=self.chave,
+            cert=self.cadeia,
+            reference_uri=("#%s" % reference) if reference else None,
+        )
+
+        # Com getchildren a assinatura permanece como último filho da raiz
+        if reference and not getchildren:
+            element_signed = signed_root.find(".//*[@Id='%s']" % reference)
+            signature = signed_root.find(".//{%s}Signature" % NAMESPACE_DS)
+            if element_signed is not None and signature is not None:
+                parent = element_signed.getparent()
+                if parent is not None:
+                    parent.append(signature)
+
+        for element in signed_root.iter():
+            if element.text:
+                element.text = element.text.replace("\n", "").replace("\r", "")
+            if element.tail:
+                element.tail = element.tail.replace("\n", "").replace("\r", "")
+        return signed_root
+
+    def assina_nfse(self, xml_etree):
+        """Equivalente ao `Assinatura.assina_nfse`"""
+        signed_root = self._signer_nfse.sign(
+            xml_etree, key=self.chave, cert=self.cadeia
+        )
+        return etree.tostring(signed_root, encoding=str)
+
+    def sign_pkcs1v15_sha1(self, data):
+        """Equivalente ao `Assinatura.sign_pkcs1v15_sha1`"""
+        return self.chave.sign(data, padding.PKCS1v15(), hashes.SHA1())
+
+
+_assinadores = weakref.WeakKeyDictionary()
+_trava = threading.Lock()
+
+
+def obter_assinador(certificado):
+    """Assinador do certificado, criado na primeira assinatura e mantido
+    enquanto o certificado estiver em uso"""
+    with _trava:
+        assinador = _assinadores.get(certificado)
+        if assinador is None:
+            assinador = _assinadores[certificado] = Assinador(certificado)
+        return assinador
+
+
+_pools = weakref.WeakKeyDictionary()
+
+
+def criar_pool_assinatura(certificado, max_workers=None):
+    """ProcessPoolExecutor com o assinador do certificado carregado em cada
+    processo, para ser informado em `executor_assinatura` por quem quiser
+    controlar o ciclo de vida do pool"""
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_iniciar_processo,
+        initargs=(certificado._chave, certificado._cert),
+    )
+
+
+def pool_assinatura(certificado, max_workers=None):
+    """Pool de assinatura do certificado, criado no primeiro lote e mantido
+    enquanto o certificado estiver em uso"""
+    with _trava:
+        pool = _pools.get(certificado)
+        if pool is None:
+            pool = _pools[certificado] = criar_pool_assinatura(certificado, max_workers)
+            weakref.finalize(certificado, pool.shutdown, wait=False)
+        return pool
+
+
+_assinador_processo = None
+
+
+def _iniciar_processo(chave, cert):
+    global _assinador_processo
+    _assinador_processo = Assinador.de_pem(chave, cert)
+
+
+def _assina_em_processo(xml, reference, getchildren=False):
+    elemento = _assinador_processo.assina_etree(
+        etree.fromstring(xml), reference, getchildren
+    )
+    return etree.tostring(elemento)
@@ -0,0 +1,229 @@
+# License MIT
+
+import asyncio
+import inspect
+import threading
+from contextlib import suppress
+
+from .cte import CTe
+from .mdfe import MDFe
+from .nfce import NFCe
+from .nfe import NFe
+from .pool import contexto_ssl
+from .wsdl import CACHE_WSDL, TransportCacheWSDL
+
+with suppress(ImportError):
+    import httpx
+    from zeep import AsyncClient, Settings
+    from zeep.transports import AsyncTransport
+
+    class TransportAssincronoCacheWSDL(TransportCacheWSDL, AsyncTransport):
+        pass
+
+
+class TransmissaoAssincrona:
+    """Transmissão SOAP assíncrona baseada no httpx.
+
+    Reaproveita o certificado e a interpretação de mensagens da transmissão
+    síncrona informada. Um cliente é mantido por webservice, com o WSDL
+    carregado uma única vez em uma thread auxiliar, e todas as requisições
+    compartilham o mesmo pool de conexões. Os clientes HTTP são fechados por
+    `fechar`.
+    """
+
+    def __init__(self, transmissao, max_conexoes=100, timeout=300):
+        self.transmissao = transmissao
+        self.certificado = transmissao.certificado
+        self.max_conexoes = max_conexoes
+        self.timeout = timeout
+        self._contexto_ssl = None
+        self._http = None
+        # Cliente síncrono usado apenas na leitura dos WSDL/XSD
+        self._http_wsdl = None
+        self._trava_http = threading.Lock()
+        self._clientes = {}
+        self._travas = {}
+
+    def _criar_http(self):
+        with self._trava_http:
+            if self._contexto_ssl is None:
+                self._contexto_ssl = contexto_ssl(self.certificado)
+            if self._http is None:
+                self._http = httpx.AsyncClient(
+                    verify=self._contexto_ssl,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.max_conexoes),
+                )
+            if self._http_wsdl is None:
+                self._http_wsdl = httpx.Client(
+                    verify=self._contexto_ssl, timeout=self.timeout
+                )
+
+    def _criar_cliente(self, url):
+        self._criar_http()
+        transport = TransportAssincronoCacheWSDL(
+            CACHE_WSDL,
+            client=self._http,
+            wsdl_client=self._http_wsdl,
+            cache=getattr(self.transmissao, "_cache", None),
+        )
+        return AsyncClient(
+            CACHE_WSDL.documento(url, transport),
+            transport=transport,
+            settings=Settings(raw_response=True),
+        )
+
+    async def cliente(self, url):
+        if url not in self._clientes:
+            trava = self._travas.setdefault(url, asyncio.Lock())
+            async with trava:
+                if url not in self._clientes:
+                    loop = asyncio.get_running_loop()
+                    self._clientes[url] = await loop.run_in_executor(
+                        None, self._criar_cliente, url
+                    )
+        return self._clientes[url]
+
+    async def enviar(self, url, operacao, mensagem):
+        cliente = await self.cliente(url)
+        mensagem = self.transmissao.interpretar_mensagem(mensagem)
+        return await cliente.service[operacao](mensagem)
+
+    async def fechar(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._http_wsdl is not None:
+            self._http_wsdl.close()
+            self._http_wsdl = None
+        self._clientes.clear()
+
+
+class DocumentoEletronicoAssincrono:
+    """Torna as operações de um DocumentoEletronico assíncronas.
+
+    Como todas as operações terminam em `_post`, basta que ele retorne uma
+    corotina para que `status_servico`, `consulta_documento`,
+    `envia_documento`, `consulta_recibo` etc. possam ser aguardados,
+    reutilizando a montagem das mensagens e a análise dos retornos.
+    """
+
+    def __init__(self, transmissao, *args, **kwargs):
+        super().__init__(transmissao, *args, **kwargs)
+        self._transmissao_assincrona = TransmissaoAssincrona(transmissao)
+
+    def _post(self, raiz, url, operacao, classe):
+        return self._post_assincrono(raiz, url, operacao, classe)
+
+    async def _post_assincrono(self, raiz, url, operacao, classe):
+        if self.limitador is not None:
+            await self.limitador.adquirir_assincrono(
+                *self._chave_limitador(raiz, operacao)
+            )
+        xml_etree = self._generateds_to_etree(raiz)
+        try:
+            retorno = await self._transmissao_assincrona.enviar(
+                url, operacao, xml_etree
+            )
+            proc = self._analisar_retorno(operacao, raiz, xml_etree, retorno, classe)
+        except httpx.HTTPError as erro:
+            self._registra_disjuntor(url, erro=erro)
+            raise
+        self._registra_disjuntor(url, proc)
+        if proc is not None:
+            proc.url = url
+        return proc
+
+    async def _status_servico_em_cache(self):
+        cache = self._cache_status_servico
+        if cache is None:
+            return await self.status_servico()
+        chave = self._chave_status_servico()
+        proc_servico = cache.obter(chave)
+        if proc_servico is None:
+            proc_servico = await self.status_servico()
+            cache.guardar(chave, proc_servico)
+        return proc_servico
+
+    async def _consultar_recibo(self, proc_envio):
+        # Sem número de recibo o consulta_recibo retorna None em vez de uma
+        # corotina
+        proc_recibo = self.consulta_recibo(proc_envio=proc_envio)
+        if inspect.isawaitable(proc_recibo):
+            proc_recibo = await proc_recibo
+        return proc_recibo
+
+    async def processar_documento(self, edoc):
+        """Versão assíncrona de DocumentoEletronico.processar_documento,
+        utilizável com `async for`."""
+        if self._consulta_servico_ao_enviar:
+            proc_servico = await self._status_servico_em_cache()
+            yield proc_servico
+            if not self._verifica_servico_em_operacao(proc_servico):
+                return
+
+        if self._consulta_documento_antes_de_enviar:
+            documento, chave = self.get_documento_id(edoc)
+            if not chave:
+                return
+            proc_consulta = await self.consulta_documento(chave)
+            yield proc_consulta
+            if self._verifica_documento_ja_enviado(proc_consulta):
+                return
+
+        proc_envio = await self.envia_documento(edoc)
+        if self.envio_sincrono:
+            self.monta_processo(edoc, proc_envio)
+        yield proc_envio
+
+        if (
+            not proc_envio.resposta
+            or not self._verifica_resposta_envio_sucesso(proc_envio)
+            or self.envio_sincrono
+        ):
+            return
+
+        await asyncio.sleep(self._tempo_espera(proc_envio))
+        proc_recibo = await self._consultar_recibo(proc_envio)
+        self._observa_recibo(proc_envio, proc_recibo)
+        if not proc_recibo or not proc_recibo.resposta:
+            return
+
+        tentativa = 0
+        while (
+            self._edoc_situacao_em_processamento(proc_recibo)
+            and tentativa < self._maximo_tentativas_consulta_recibo
+        ):
+            await asyncio.sleep(self._tempo_espera(proc_envio))
+            tentativa += 1
+            proc_recibo = await self._consultar_recibo(proc_envio)
+            self._observa_recibo(proc_envio, proc_recibo)
+        self.monta_processo(edoc, proc_envio, proc_recibo)
+        yield proc_recibo
+
+    async def fechar(self):
+        await self._transmissao_assincrona.fechar()
+
+
+class AsyncNFe(DocumentoEletronicoAssincrono, NFe):
+    async def sondar_autorizador(self):
+        disjuntor = self._disjuntor_sondagem()
+        if disjuntor is not None:
+            try:
+                await self.status_servico()
+            except Exception:
+                disjuntor.registrar_falha()
+        return not self.em_contingencia()
+
+
+class AsyncNFCe(DocumentoEletronicoAssincrono, NFCe):
+    async def consulta_recibo(self, proc_envio):
+        return proc_envio
+
+
+class AsyncCTe(DocumentoEletronicoAssincrono, CTe):
+    pass
+
+
+class AsyncMDFe(DocumentoEletronicoAssincrono, MDFe):
+    pass
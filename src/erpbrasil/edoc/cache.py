@@ -0,0 +1,71 @@
+# License MIT
+
+import threading
+import time
+
+# Serviço paralisado momentaneamente / sem previsão
+CSTAT_PARALISADO = ("108", "109")
+CSTAT_EM_OPERACAO = ("107",)
+
+
+class CacheStatusServico:
+    """Último retorno do status_servico por (UF, modelo, ambiente,
+    contingência), compartilhado pelo processo.
+
+    Retornos "em operação" valem por ``ttl`` segundos e os de serviço
+    paralisado por ``ttl_paralisado`` segundos, para que o envio não volte a
+    consultar o webservice a cada documento enquanto ele estiver fora do ar.
+    Os demais retornos (rejeições, falhas de comunicação) não são guardados.
+    """
+
+    def __init__(self, ttl=300, ttl_paralisado=60):
+        self.ttl = ttl
+        self.ttl_paralisado = ttl_paralisado
+        self.acertos = 0
+        self.falhas = 0
+        self._entradas = {}
+        self._lock = threading.Lock()
+
+    def _validade(self, proc_servico):
+        resposta = getattr(proc_servico, "resposta", None)
+        cStat = str(getattr(resposta, "cStat", ""))
+        if cStat in CSTAT_EM_OPERACAO:
+            return self.ttl
+        if cStat in CSTAT_PARALISADO:
+            return self.ttl_paralisado
+        return None
+
+    def obter(self, chave):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada and entrada[0] > time.monotonic():
+                self.acertos += 1
+                return entrada[1]
+            self._entradas.pop(chave, None)
+            self.falhas += 1
+            return None
+
+    def guardar(self, chave, proc_servico):
+        validade = self._validade(proc_servico)
+        if not validade:
+            return
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + validade, proc_servico)
+
+    def limpar(self, chave=None):
+        with self._lock:
+            if chave is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(chave, None)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "tamanho": len(self._entradas),
+            }
+
+
+CACHE_STATUS_SERVICO = CacheStatusServico()
@@ -15,8 +15,63 @@ Why does this file exist, and why not put this in __main__?
   Also see (1) from http://click.pocoo.org/5/setuptools/#setuptools-integration
 """
 
+import argparse
+import getpass
+import os
 import sys
 
+from erpbrasil.edoc.wsdl import DIRETORIO_PADRAO, CacheWSDL, urls_wsdl
+
+# Variável de ambiente com a senha do certificado; sem ela, a senha é
+# solicitada no terminal
+VARIAVEL_SENHA = "ERPBRASIL_EDOC_SENHA_CERTIFICADO"
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="erpbrasil.edoc")
+    comandos = parser.add_subparsers(dest="comando")
+
+    atualizar = comandos.add_parser(
+        "atualizar-wsdl", help="Baixa os WSDL/XSD de todos os webservices"
+    )
+    atualizar.add_argument("--diretorio", default=DIRETORIO_PADRAO)
+    atualizar.add_argument("--certificado", required=True)
+    atualizar.add_argument("--url", action="append", dest="urls")
+
+    verificar = comandos.add_parser(
+        "verificar-wsdl", help="Confere o checksum dos WSDL em cache"
+    )
+    verificar.add_argument("--diretorio", default=DIRETORIO_PADRAO)
+    return parser
+
+
+def _atualizar_wsdl(args):
+    from requests import Session
+
+    from erpbrasil.assinatura.certificado import Certificado
+    from erpbrasil.edoc.pool import AdaptadorCertificado, contexto_ssl
+
+    senha = os.environ.get(VARIAVEL_SENHA)
+    if senha is None:
+        senha = getpass.getpass("Senha do certificado: ")
+    cache = CacheWSDL(args.diretorio)
+    certificado = Certificado(args.certificado, senha)
+    session = Session()
+    session.mount("https://", AdaptadorCertificado(contexto_ssl(certificado)))
+    session.verify = False
+    erros = cache.atualizar(session, args.urls or urls_wsdl())
+
+    for url, erro in erros:
+        print(f"{url}: {erro}")
+    return 1 if erros else 0
+
+
+def _verificar_wsdl(args):
+    invalidos = CacheWSDL(args.diretorio).verificar()
+    for url in invalidos:
+        print(url)
+    return 1 if invalidos else 0
+
 
 def main(argv=sys.argv):
     """
@@ -26,7 +81,12 @@ def main(argv=sys.argv):
     Returns:
         int: A return code
 
-    Does stuff.
+    Runs the cache maintenance commands (atualizar-wsdl, verificar-wsdl).
     """
+    args = _parser().parse_args(argv[1:])
+    if args.comando == "atualizar-wsdl":
+        return _atualizar_wsdl(args)
+    if args.comando == "verificar-wsdl":
+        return _verificar_wsdl(args)
     print(argv)
     return 0
@@ -4,7 +4,19 @@ from contextlib import suppress
 
 from lxml import etree
 
+from erpbrasil.edoc import webservices
 from erpbrasil.edoc.edoc import DocumentoEletronico
+from erpbrasil.edoc.webservices import (  # noqa: F401
+    CODIGO_UF,
+    QR_CODE_URL,
+    REGISTRO,
+    WS_CTE_CONSULTA,
+    WS_CTE_RECEPCAO_EVENTO,
+    WS_CTE_RECEPCAO_GT,
+    WS_CTE_RECEPCAO_OS,
+    WS_CTE_RECEPCAO_SINC,
+    WS_CTE_STATUS_SERVICO,
+)
 from erpbrasil.transmissao import TransmissaoSOAP
 
 with suppress(ImportError):
@@ -30,229 +42,29 @@ prestação;II - a correção de dados cadastrais que implique mudança do \
 emitente, tomador, remetente ou do destinatário;III - a data de emissão ou \
 de saída."""
 
-AMBIENTE_PRODUCAO = "producao"
-AMBIENTE_HOMOLOGACAO = "homologacao"
-
-WS_CTE_CONSULTA = "CTeConsultaV4"
-WS_CTE_RECEPCAO_EVENTO = "CTeRecepcaoEventoV4"
-WS_CTE_RECEPCAO_GT = "CTeRecepcaoGTVeV4"
-WS_CTE_RECEPCAO_OS = "CTeRecepcaoOSV4"
-WS_CTE_RECEPCAO_SINC = "CTeRecepcaoSincV4"
-WS_CTE_STATUS_SERVICO = "CTeStatusServicoV4"
-QR_CODE_URL = "QRCode"
-
-SIGLA_ESTADO = {
-    "AC": 12,
-    "AL": 27,
-    "AM": 13,
-    "AP": 16,
-    "BA": 29,
-    "CE": 23,
-    "DF": 53,
-    "ES": 32,
-    "GO": 52,
-    "MA": 21,
-    "MG": 31,
-    "MS": 50,
-    "MT": 51,
-    "PA": 15,
-    "PB": 25,
-    "PE": 26,
-    "PI": 22,
-    "PR": 41,
-    "RJ": 33,
-    "RN": 24,
-    "RO": 11,
-    "RR": 14,
-    "RS": 43,
-    "SC": 42,
-    "SE": 28,
-    "SP": 35,
-    "TO": 17,
-    "AN": 91,
-}
-
-SVSP_STATES = ["AP", "PE", "RR", "SP"]
-SVRS_STATES = [
-    "AC",
-    "AL",
-    "AM",
-    "BA",
-    "CE",
-    "DF",
-    "ES",
-    "GO",
-    "MA",
-    "PA",
-    "PB",
-    "PI",
-    "RJ",
-    "RN",
-    "RO",
-    "SC",
-    "SE",
-    "TO",
-]
-
-SVSP = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "nfe.fazenda.sp.gov.br",
-        WS_CTE_CONSULTA: "CTeWS/WS/CTeConsultaV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "CTeWS/WS/CTeRecepcaoEventoV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_GT: "CTeWS/WS/CTeRecepcaoGTVeV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_OS: "CTeWS/WS/CTeRecepcaoOSV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_SINC: "CTeWS/WS/CTeRecepcaoSincV4.asmx?wsdl",
-        WS_CTE_STATUS_SERVICO: "CTeWS/WS/CTeStatusServicoV4.asmx?wsdl",
-        QR_CODE_URL: "https://nfe.fazenda.sp.gov.br/CTeConsulta/qrCode",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "homologacao.nfe.fazenda.sp.gov.br",
-        WS_CTE_CONSULTA: "CTeWS/WS/CTeConsultaV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "CTeWS/WS/CTeRecepcaoEventoV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_GT: "CTeWS/WS/CTeRecepcaoGTVeV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_OS: "CTeWS/WS/CTeRecepcaoOSV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_SINC: "CTeWS/WS/CTeRecepcaoSincV4.asmx?wsdl",
-        WS_CTE_STATUS_SERVICO: "CTeWS/WS/CTeStatusServicoV4.asmx?wsdl",
-        QR_CODE_URL: "https://homologacao.nfe.fazenda.sp.gov.br/CTeConsulta/qrCode",
-    },
-}
-
-SVRS = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "cte.svrs.rs.gov.br",
-        WS_CTE_CONSULTA: "ws/CTeConsultaV4/CTeConsultaV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4/CTeRecepcaoEventoV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4/CTeRecepcaoGTVeV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4/CTeRecepcaoOSV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4/CTeRecepcaoSincV4.asmx?wsdl",
-        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4/CTeStatusServicoV4.asmx?wsdl",
-        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/cte/qrCode",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "cte-homologacao.svrs.rs.gov.br",
-        WS_CTE_CONSULTA: "ws/CTeConsultaV4/CTeConsultaV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4/CTeRecepcaoEventoV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4/CTeRecepcaoGTVeV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4/CTeRecepcaoOSV4.asmx?wsdl",
-        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4/CTeRecepcaoSincV4.asmx?wsdl",
-        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4/CTeStatusServicoV4.asmx?wsdl",
-        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/cte/qrCode",
-    },
-}
-
-MT = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "cte.sefaz.mt.gov.br",
-        WS_CTE_CONSULTA: "ctews2/services/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "ctews2/services/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "ctews2/services/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "ctews/services/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "ctews2/services/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "ctews2/services/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "https://www.sefaz.mt.gov.br/cte/qrcode",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "homologacao.sefaz.mt.gov.br",
-        WS_CTE_CONSULTA: "ctews2/services/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "ctews2/services/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "ctews2/services/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "ctews/services/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "ctews2/services/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "ctews2/services/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "https://homologacao.sefaz.mt.gov.br/cte/qrcode",
-    },
-}
-
-MS = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "producao.cte.ms.gov.br",
-        WS_CTE_CONSULTA: "ws/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "http://www.dfe.ms.gov.br/cte/qrcode",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "homologacao.cte.ms.gov.br",
-        WS_CTE_CONSULTA: "ws/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "http://www.dfe.ms.gov.br/cte/qrcode",
-    },
-}
-
-MG = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "cte.fazenda.mg.gov.br",
-        WS_CTE_CONSULTA: "cte/services/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "cte/services/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "cte/services/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "cte/services/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "cte/services/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "cte/services/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "https://cte.fazenda.mg.gov.br/portalcte/sistema/qrcode.xhtml",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "hcte.fazenda.mg.gov.br",
-        WS_CTE_CONSULTA: "cte/services/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "cte/services/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "cte/services/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "cte/services/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "cte/services/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "cte/services/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "https://cte.fazenda.mg.gov.br/portalcte/sistema/qrcode.xhtml",
-    },
-}
-
-PR = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "cte.fazenda.pr.gov.br",
-        WS_CTE_CONSULTA: "cte4/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "cte4/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "cte4/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "cte4/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "cte4/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "cte4/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "http://www.fazenda.pr.gov.br/cte/qrcode",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "homologacao.cte.fazenda.pr.gov.br",
-        WS_CTE_CONSULTA: "cte4/CTeConsultaV4?wsdl",
-        WS_CTE_RECEPCAO_EVENTO: "cte4/CTeRecepcaoEventoV4?wsdl",
-        WS_CTE_RECEPCAO_GT: "cte4/CTeRecepcaoGTVeV4?wsdl",
-        WS_CTE_RECEPCAO_OS: "cte4/CTeRecepcaoOSV4?wsdl",
-        WS_CTE_RECEPCAO_SINC: "cte4/CTeRecepcaoSincV4?wsdl",
-        WS_CTE_STATUS_SERVICO: "cte4/CTeStatusServicoV4?wsdl",
-        QR_CODE_URL: "http://www.fazenda.pr.gov.br/cte/qrcode",
-    },
-}
+# Tabelas de webservices com os nomes usados anteriormente neste módulo
+AMBIENTE_HOMOLOGACAO = webservices.CTE_AMBIENTE_HOMOLOGACAO
+AMBIENTE_PRODUCAO = webservices.CTE_AMBIENTE_PRODUCAO
+MG = webservices.CTE_MG
+MS = webservices.CTE_MS
+MT = webservices.CTE_MT
+PR = webservices.CTE_PR
+SVRS = webservices.CTE_SVRS
+SVRS_STATES = webservices.CTE_SVRS_STATES
+SVSP = webservices.CTE_SVSP
+SVSP_STATES = webservices.CTE_SVSP_STATES
+
+# Código IBGE da UF por sigla
+SIGLA_ESTADO = {sigla: int(codigo) for sigla, codigo in CODIGO_UF.items()}
 
 
 def get_service_url(sigla_estado, service, ambiente):
-    if sigla_estado in SVSP_STATES:
-        state_config = SVSP
-    elif sigla_estado in SVRS_STATES:
-        state_config = SVRS
-    else:
-        state_config = sigla_estado
-
-    if not state_config:
+    try:
+        return REGISTRO.url(service, CODIGO_UF[sigla_estado], "57", ambiente)
+    except KeyError as erro:
         raise ValueError(
             f"Estado {sigla_estado} não suportado ou configuração ausente."
-        )
-
-    environment = AMBIENTE_PRODUCAO if ambiente == 1 else AMBIENTE_HOMOLOGACAO
-    if service == "QRCode":
-        return state_config[environment][QR_CODE_URL]
-
-    server = state_config[environment]["servidor"]
-    service_path = state_config[environment][service]
-    return f"https://{server}/{service_path}"
+        ) from erro
 
 
 class CTe(DocumentoEletronico):
@@ -271,16 +83,14 @@ class CTe(DocumentoEletronico):
         self.mod = str(mod)
 
     def _get_ws_endpoint(self, service):
-        sigla = None
-        for uf_code, ibge_code in SIGLA_ESTADO.items():
-            if ibge_code == self.uf:
-                sigla = uf_code
-                break
-
-        if not sigla:
-            raise ValueError(f"UF {self.uf} não suportado ou configuração ausente.")
-
-        return get_service_url(sigla, service, self.ambiente)
+        try:
+            return self.registro_webservices.url(
+                service, self.uf, self.mod, self.ambiente
+            )
+        except KeyError as erro:
+            raise ValueError(
+                f"UF {self.uf} não suportado ou configuração ausente."
+            ) from erro
 
     def _verifica_resposta_envio_sucesso(self, proc_envio):
         return (
@@ -0,0 +1,95 @@
+# License MIT
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+FECHADO = "fechado"
+ABERTO = "aberto"
+SEMI_ABERTO = "semi-aberto"
+
+# Serviço paralisado momentaneamente / sem previsão
+CSTAT_FALHA = ("108", "109")
+
+
+class Disjuntor:
+    """Circuit breaker de um servidor de webservices.
+
+    Abre após `limite_falhas` falhas consecutivas (timeouts, erros HTTP ou
+    serviço paralisado). Depois de `tempo_aberto` segundos, `permite` libera
+    uma única requisição de sondagem: se ela tiver sucesso o disjuntor
+    fecha, senão volta a abrir.
+    """
+
+    def __init__(self, limite_falhas=3, tempo_aberto=60):
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self.estado = FECHADO
+        self.falhas = 0
+        self.aberto_em = None
+        self._lock = threading.Lock()
+
+    @property
+    def fechado(self):
+        return self.estado == FECHADO
+
+    def permite(self):
+        """Indica se uma requisição pode ser enviada ao servidor"""
+        with self._lock:
+            if self.estado == FECHADO:
+                return True
+            # Uma sondagem sem resultado é refeita após o mesmo intervalo
+            if time.monotonic() - self.aberto_em >= self.tempo_aberto:
+                self.estado = SEMI_ABERTO
+                self.aberto_em = time.monotonic()
+                return True
+            return False
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self.estado = FECHADO
+            self.falhas = 0
+            self.aberto_em = None
+
+    def registrar_falha(self):
+        with self._lock:
+            self.falhas += 1
+            if self.estado == SEMI_ABERTO or self.falhas >= self.limite_falhas:
+                self.estado = ABERTO
+                self.aberto_em = time.monotonic()
+
+
+class Disjuntores:
+    """Disjuntores indexados pelo servidor de cada URL, compartilhados pelos
+    documentos que usarem a mesma instância."""
+
+    def __init__(self, limite_falhas=3, tempo_aberto=60):
+        self.limite_falhas = limite_falhas
+        self.tempo_aberto = tempo_aberto
+        self._disjuntores = {}
+        self._lock = threading.Lock()
+
+    def obter(self, url):
+        servidor = urlsplit(url).netloc or url
+        with self._lock:
+            disjuntor = self._disjuntores.get(servidor)
+            if disjuntor is None:
+                disjuntor = self._disjuntores[servidor] = Disjuntor(
+                    self.limite_falhas, self.tempo_aberto
+                )
+            return disjuntor
+
+    def registrar(self, url, proc=None, erro=None):
+        """Registra o resultado de uma requisição ao servidor da URL"""
+        resposta = getattr(proc, "resposta", None)
+        if erro is not None or str(getattr(resposta, "cStat", "")) in CSTAT_FALHA:
+            self.obter(url).registrar_falha()
+        else:
+            self.obter(url).registrar_sucesso()
+
+    def estados(self):
+        with self._lock:
+            return {
+                servidor: disjuntor.estado
+                for servidor, disjuntor in self._disjuntores.items()
+            }
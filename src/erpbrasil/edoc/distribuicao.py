@@ -0,0 +1,451 @@
+# License MIT
+
+import base64
+import gzip
+import heapq
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lxml import etree
+from requests import RequestException
+from zeep.exceptions import TransportError
+
+from erpbrasil.edoc.limitador import LimiteConsultaExcedido
+from erpbrasil.edoc.mde import LIMITE_EVENTOS_LOTE
+from erpbrasil.edoc.resposta import _parser
+from erpbrasil.edoc.resumo import resumir
+
+_logger = logging.getLogger(__name__)
+
+# Documentos localizados / nenhum documento localizado
+CSTAT_DOCUMENTOS = "138"
+CSTAT_SEM_DOCUMENTOS = "137"
+# Consumo indevido: a SEFAZ bloqueia o CNPJ por uma hora
+CSTAT_CONSUMO_INDEVIDO = "656"
+
+# Quando não houver mais documentos (cStat 137 ou ultNSU = maxNSU) a SEFAZ
+# exige que a próxima consulta aguarde uma hora
+ESPERA_SEM_DOCUMENTOS = 3600
+
+NSU_INICIAL = "000000000000000"
+
+# Espera após uma falha de comunicação, dobrada a cada falha seguida do mesmo
+# CNPJ/CPF até ESPERA_SEM_DOCUMENTOS
+ESPERA_FALHA_TRANSPORTE = 60
+
+ERROS_TRANSPORTE = (RequestException, TransportError)
+
+
+class ErroDistribuicao(Exception):
+    """A SEFAZ rejeitou a consulta à distribuição de DF-e"""
+
+    def __init__(self, cnpj_cpf, cStat, xMotivo):
+        super().__init__(f"{cnpj_cpf}: {cStat} - {xMotivo}")
+        self.cnpj_cpf = cnpj_cpf
+        self.cStat = cStat
+        self.xMotivo = xMotivo
+
+
+class CursorNSU:
+    """Posição da distribuição de um CNPJ/CPF em um ambiente"""
+
+    def __init__(self, ult_nsu=NSU_INICIAL, max_nsu=NSU_INICIAL, bloqueado_ate=0):
+        self.ult_nsu = ult_nsu
+        self.max_nsu = max_nsu
+        self.bloqueado_ate = bloqueado_ate
+
+    @property
+    def atualizado(self):
+        return int(self.ult_nsu) >= int(self.max_nsu)
+
+
+class CursoresMemoria:
+    """Cursores mantidos apenas enquanto o processo estiver em execução"""
+
+    def __init__(self):
+        self._cursores = {}
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        with self._trava:
+            cursor = self._cursores.get(chave)
+            if cursor is None:
+                return CursorNSU()
+            return CursorNSU(cursor.ult_nsu, cursor.max_nsu, cursor.bloqueado_ate)
+
+    def gravar(self, chave, cursor):
+        with self._trava:
+            self._cursores[chave] = CursorNSU(
+                cursor.ult_nsu, cursor.max_nsu, cursor.bloqueado_ate
+            )
+
+
+class CursoresSQLite:
+    """Cursores gravados em um banco SQLite local, para que a sincronização
+    continue do último NSU após reiniciar o processo."""
+
+    def __init__(self, caminho, timeout=30):
+        self.caminho = caminho
+        self.timeout = timeout
+        self._local = threading.local()
+        self._conexao().execute(
+            "CREATE TABLE IF NOT EXISTS cursores ("
+            "chave TEXT PRIMARY KEY, ult_nsu TEXT, max_nsu TEXT, "
+            "bloqueado_ate REAL)"
+        )
+
+    def _conexao(self):
+        # Conexões do sqlite3 não podem ser compartilhadas entre threads
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = self._local.conexao = sqlite3.connect(
+                self.caminho, timeout=self.timeout, isolation_level=None
+            )
+        return conexao
+
+    def obter(self, chave):
+        registro = (
+            self._conexao()
+            .execute(
+                "SELECT ult_nsu, max_nsu, bloqueado_ate FROM cursores "
+                "WHERE chave = ?",
+                ("|".join(str(parte) for parte in chave),),
+            )
+            .fetchone()
+        )
+        return CursorNSU(*registro) if registro else CursorNSU()
+
+    def gravar(self, chave, cursor):
+        self._conexao().execute(
+            "INSERT OR REPLACE INTO cursores "
+            "(chave, ult_nsu, max_nsu, bloqueado_ate) VALUES (?, ?, ?, ?)",
+            (
+                "|".join(str(parte) for parte in chave),
+                cursor.ult_nsu,
+                cursor.max_nsu,
+                cursor.bloqueado_ate,
+            ),
+        )
+
+
+class DocumentoDistribuido:
+    """Documento de um docZip já descompactado. `xml` guarda os bytes
+    originais e `elemento` o XML já analisado."""
+
+    def __init__(self, cnpj_cpf, nsu, schema, xml, elemento=None):
+        self.cnpj_cpf = cnpj_cpf
+        self.nsu = nsu
+        self.schema = schema
+        self.xml = xml
+        self.elemento = elemento
+
+    @property
+    def resumo(self):
+        """Registro com os campos principais do documento (ver `resumir`)"""
+        if self.elemento is None:
+            return None
+        return resumir(self.schema, self.elemento, self.nsu, self.xml)
+
+    def __repr__(self):
+        return f"<DocumentoDistribuido {self.cnpj_cpf} {self.nsu} {self.schema}>"
+
+
+def descompactar(conteudo):
+    """XML (bytes) de um docZip, codificado em base64 e compactado com gzip"""
+    return gzip.decompress(base64.b64decode(conteudo))
+
+
+def _decodificar(doc_zip):
+    xml = descompactar(doc_zip.valueOf_)
+    return doc_zip.NSU, doc_zip.schema, xml, etree.fromstring(xml, parser=_parser())
+
+
+def _decodificar_lote(lote, executor=None, max_workers=None):
+    doc_zips = sorted(getattr(lote, "docZip", None) or [], key=lambda d: int(d.NSU))
+    if len(doc_zips) < 2:
+        yield from map(_decodificar, doc_zips)
+    elif executor is None:
+        with ThreadPoolExecutor(max_workers) as executor:
+            yield from executor.map(_decodificar, doc_zips)
+    else:
+        yield from executor.map(_decodificar, doc_zips)
+
+
+def decodificar_lote(lote, executor=None, max_workers=None):
+    """Descompacta e analisa os docZip de um loteDistDFeInt em paralelo.
+
+    O gunzip e a análise pelo lxml liberam o GIL, então as threads do
+    `executor` (ou de um pool criado para o lote com `max_workers`) trabalham
+    em paralelo e os elementos não precisam ser copiados entre processos.
+    Num backfill, reutilize o mesmo executor em todos os lotes.
+
+    :return: iterador de tuplas (NSU, schema, elemento) em ordem de NSU
+    """
+    for nsu, schema, _, elemento in _decodificar_lote(lote, executor, max_workers):
+        yield nsu, schema, elemento
+
+
+def documentos_lote(cnpj_cpf, resposta, executor=None):
+    """Documentos distribuídos no lote de um retDistDFeInt"""
+    lote = getattr(resposta, "loteDistDFeInt", None)
+    for nsu, schema, xml, elemento in _decodificar_lote(lote, executor):
+        yield DocumentoDistribuido(cnpj_cpf, nsu, schema, xml, elemento)
+
+
+class Inscricao:
+    """CNPJ/CPF acompanhado pelo sincronizador"""
+
+    def __init__(self, documento, cnpj_cpf):
+        self.documento = documento
+        self.cnpj_cpf = cnpj_cpf
+        # Falhas de comunicação seguidas
+        self.falhas = 0
+
+    @property
+    def chave(self):
+        return self.cnpj_cpf, str(self.documento.ambiente)
+
+
+class SincronizadorDistribuicao:
+    """Mantém atualizada a caixa de entrada de DF-e de vários CNPJ/CPF.
+
+    Cada consulta parte do último NSU gravado em `cursores` e os documentos
+    de cada lote são entregues já descompactados. O cursor só avança depois
+    que todos os documentos do lote foram consumidos, então um processo
+    interrompido volta a receber o lote em andamento (entrega "ao menos uma
+    vez").
+
+    Quando a SEFAZ informa que não há mais documentos (cStat 137 ou
+    ultNSU = maxNSU), o CNPJ/CPF fica sem consultas por
+    `espera_sem_documentos` segundos, como exige a NT 2014.002.
+
+    Os CNPJ/CPF inscritos são atendidos um lote por vez, em rodízio pelo
+    horário em que cada um pode voltar a consultar. Com um limitador não
+    bloqueante no documento (``LimitadorConsultas(bloquear=False)``), um
+    CNPJ sem fichas é reagendado sem atrasar os demais.
+
+    Os docZip são decodificados com `decodificar_lote`, no `executor`
+    informado ou em um pool criado para cada lote. Com um `acervo`, cada
+    lote é gravado (Acervo.guardar_distribuidos) antes de ser entregue.
+
+    Em `executar`, uma falha de comunicação (timeout, erro de conexão ou
+    HTTP) reagenda apenas o CNPJ/CPF afetado, com espera crescente a partir
+    de ESPERA_FALHA_TRANSPORTE segundos.
+    """
+
+    def __init__(
+        self,
+        cursores=None,
+        espera_sem_documentos=ESPERA_SEM_DOCUMENTOS,
+        executor=None,
+        acervo=None,
+    ):
+        self.cursores = cursores or CursoresMemoria()
+        self.executor = executor
+        self.acervo = acervo
+        self.espera_sem_documentos = espera_sem_documentos
+        self._fila = []
+        self._sequencia = itertools.count()
+
+    def inscrever(self, documento, cnpj_cpf):
+        """Inclui um CNPJ/CPF no rodízio, consultado com o documento (NFe)
+        de seu certificado"""
+        inscricao = Inscricao(documento, cnpj_cpf)
+        cursor = self.cursores.obter(inscricao.chave)
+        self._agendar(inscricao, cursor.bloqueado_ate)
+        return inscricao
+
+    def _agendar(self, inscricao, momento):
+        # Quem pode consultar agora vai para o fim da fila dos já liberados
+        momento = max(momento, time.time())
+        heapq.heappush(self._fila, (momento, next(self._sequencia), inscricao))
+
+    def _consultar_lote(self, inscricao, cursor):
+        """Consulta um lote e atualiza o cursor.
+
+        :return: tupla (documentos do lote, há mais documentos)
+        """
+        proc = inscricao.documento.consultar_distribuicao(
+            inscricao.cnpj_cpf, ultimo_nsu=cursor.ult_nsu
+        )
+        resposta = getattr(proc, "resposta", None)
+        cStat = str(getattr(resposta, "cStat", ""))
+        if cStat not in (CSTAT_DOCUMENTOS, CSTAT_SEM_DOCUMENTOS):
+            if cStat == CSTAT_CONSUMO_INDEVIDO:
+                cursor.bloqueado_ate = time.time() + self.espera_sem_documentos
+                self.cursores.gravar(inscricao.chave, cursor)
+            raise ErroDistribuicao(
+                inscricao.cnpj_cpf, cStat, getattr(resposta, "xMotivo", None)
+            )
+
+        documentos = documentos_lote(inscricao.cnpj_cpf, resposta, self.executor)
+        if self.acervo is not None:
+            documentos = list(documentos)
+            self.acervo.guardar_distribuidos(documentos)
+        cursor.ult_nsu = resposta.ultNSU or cursor.ult_nsu
+        cursor.max_nsu = resposta.maxNSU or cursor.max_nsu
+        mais = cStat == CSTAT_DOCUMENTOS and not cursor.atualizado
+        cursor.bloqueado_ate = 0 if mais else time.time() + self.espera_sem_documentos
+        return documentos, mais
+
+    def sincronizar(self, documento, cnpj_cpf):
+        """Documentos de um único CNPJ/CPF, até alcançar o maxNSU"""
+        inscricao = Inscricao(documento, cnpj_cpf)
+        while True:
+            cursor = self.cursores.obter(inscricao.chave)
+            if cursor.bloqueado_ate > time.time():
+                return
+            documentos, mais = self._consultar_lote(inscricao, cursor)
+            yield from documentos
+            self.cursores.gravar(inscricao.chave, cursor)
+            if not mais:
+                return
+
+    def _espera_falha(self, inscricao):
+        espera = ESPERA_FALHA_TRANSPORTE * 2**inscricao.falhas
+        inscricao.falhas += 1
+        return min(espera, self.espera_sem_documentos)
+
+    def executar(self, continuo=False):
+        """Documentos de todos os CNPJ/CPF inscritos, um lote de cada vez.
+
+        :param continuo: aguarda o fim da espera dos CNPJ/CPF já atualizados
+        em vez de encerrar quando todos estiverem em espera
+        """
+        while self._fila:
+            momento, _, inscricao = self._fila[0]
+            espera = momento - time.time()
+            if espera > 0:
+                if not continuo:
+                    return
+                time.sleep(espera)
+            heapq.heappop(self._fila)
+
+            cursor = self.cursores.obter(inscricao.chave)
+            if cursor.bloqueado_ate > time.time():
+                self._agendar(inscricao, cursor.bloqueado_ate)
+                continue
+            try:
+                documentos, _ = self._consultar_lote(inscricao, cursor)
+            except LimiteConsultaExcedido as erro:
+                self._agendar(inscricao, time.time() + erro.espera)
+                continue
+            except ErroDistribuicao:
+                _logger.exception("Erro na distribuição de DF-e")
+                cursor = self.cursores.obter(inscricao.chave)
+                self._agendar(
+                    inscricao,
+                    max(cursor.bloqueado_ate, time.time() + self.espera_sem_documentos),
+                )
+                continue
+            except ERROS_TRANSPORTE:
+                _logger.exception(
+                    "Falha de comunicação na distribuição de DF-e do %s",
+                    inscricao.cnpj_cpf,
+                )
+                self._agendar(inscricao, time.time() + self._espera_falha(inscricao))
+                continue
+            inscricao.falhas = 0
+            yield from documentos
+            self.cursores.gravar(inscricao.chave, cursor)
+            self._agendar(inscricao, cursor.bloqueado_ate)
+
+
+class EntradaDocumentos:
+    """Etapa da entrada de NF-e recebidas na distribuição de DF-e.
+
+    Para cada resNFe autorizado do fluxo de `processar`, registra a ciência
+    da operação e baixa o procNFe completo por consChNFe. As ciências são
+    enviadas em lotes de até 20 eventos (MDe.ciencia_da_operacao_lote) e os
+    downloads de cada lote são feitos por até `max_workers` threads, sujeitos
+    ao limitador de consultas do documento. Se o documento não tiver
+    limitador, os downloads são feitos um de cada vez, evitando o bloqueio
+    por consumo indevido.
+
+    As chaves cuja ciência foi rejeitada ficam em `rejeitadas` e as que
+    não retornaram o procNFe em `pendentes`, ambas com o cStat recebido.
+    """
+
+    # Evento registrado (com ou sem vinculação) ou já registrado antes
+    CSTAT_CIENCIA = ("135", "136", "573")
+    # Situação do resNFe: uso autorizado
+    SITUACAO_AUTORIZADA = "1"
+
+    def __init__(self, mde, cnpj_cpf, max_workers=4, executor=None):
+        self.mde = mde
+        self.cnpj_cpf = cnpj_cpf
+        self.max_workers = max_workers
+        self.executor = executor
+        self.rejeitadas = {}
+        self.pendentes = {}
+
+    def processar(self, documentos):
+        """procNFe baixados para os resNFe de `documentos`"""
+        chaves = []
+        baixadas = set()
+        for documento in documentos:
+            resumo = documento.resumo
+            if resumo is None:
+                continue
+            if documento.schema.startswith("procNFe"):
+                baixadas.add(resumo.chNFe)
+            elif (
+                documento.schema.startswith("resNFe")
+                and resumo.cSitNFe == self.SITUACAO_AUTORIZADA
+            ):
+                chaves.append(resumo.chNFe)
+            if len(chaves) == LIMITE_EVENTOS_LOTE:
+                yield from self._processar_lote(chaves, baixadas)
+                chaves = []
+        if chaves:
+            yield from self._processar_lote(chaves, baixadas)
+
+    def _processar_lote(self, chaves, baixadas):
+        chaves = [chave for chave in dict.fromkeys(chaves) if chave not in baixadas]
+        if not chaves:
+            return
+        confirmadas = self._ciencia(chaves)
+        for chave, proc in self._baixar(confirmadas):
+            resposta = getattr(proc, "resposta", None)
+            documentos = [
+                documento
+                for documento in documentos_lote(self.cnpj_cpf, resposta, self.executor)
+                if documento.schema.startswith("procNFe")
+            ]
+            if not documentos:
+                self.pendentes[chave] = str(getattr(resposta, "cStat", ""))
+                continue
+            baixadas.add(chave)
+            yield from documentos
+
+    def _ciencia(self, chaves):
+        confirmadas = []
+        for proc in self.mde.ciencia_da_operacao_lote(chaves, self.cnpj_cpf):
+            resposta = getattr(proc, "resposta", None)
+            for retorno in getattr(resposta, "retEvento", None) or []:
+                info = retorno.infEvento
+                if str(info.cStat) in self.CSTAT_CIENCIA:
+                    confirmadas.append(info.chNFe)
+                else:
+                    self.rejeitadas[info.chNFe] = str(info.cStat)
+        return confirmadas
+
+    def _consultar_chave(self, chave):
+        return chave, self.mde._clonar().consultar_distribuicao(
+            self.cnpj_cpf, chave=chave
+        )
+
+    def _baixar(self, chaves):
+        if (
+            len(chaves) < 2
+            or self.max_workers < 2
+            or getattr(self.mde, "limitador", None) is None
+        ):
+            yield from map(self._consultar_chave, chaves)
+            return
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            yield from executor.map(self._consultar_chave, chaves)
@@ -2,14 +2,22 @@
 # License MIT
 
 import abc
+import copy
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
 from lxml import etree
 from lxml.etree import _Element
+from requests import RequestException
 
-from erpbrasil.assinatura.assinatura import Assinatura
+from erpbrasil.transmissao import TransmissaoSOAP
 
+from .assinador import _assina_em_processo, obter_assinador, pool_assinatura
+from .cache import CACHE_STATUS_SERVICO
+from .pool import POOL_CLIENTES
 from .resposta import analisar_retorno_raw
+from .webservices import REGISTRO
 
 # Fix Python 2.x.
 try:
@@ -25,6 +33,14 @@ except ImportError:
 ABC = abc.ABCMeta("ABC", (object,), {})
 
 
+def campo_raiz(raiz, campo):
+    """Valor de um campo da mensagem, montada pelo generateDS ou como
+    elemento (ver erpbrasil.edoc.esqueletos)"""
+    if isinstance(raiz, _Element):
+        return raiz.findtext("{*}" + campo)
+    return getattr(raiz, campo, None)
+
+
 class DocumentoEletronico(ABC):
     """
     Classe abstrata responsavel por definir os metodos e logica das classes
@@ -34,6 +50,35 @@ class DocumentoEletronico(ABC):
     _consulta_servico_ao_enviar = False
     _consulta_documento_antes_de_enviar = False
 
+    # webservices.RegistroWebservices consultado para obter as URLs
+    registro_webservices = REGISTRO
+
+    # Pool de clientes SOAP compartilhado; None desativa o reaproveitamento
+    _pool_clientes = POOL_CLIENTES
+
+    # Cache do status_servico usado pelo processar_documento; None consulta o
+    # webservice a cada envio
+    _cache_status_servico = CACHE_STATUS_SERVICO
+
+    # disjuntor.Disjuntores compartilhado, alimentado por todas as requisições;
+    # None desativa o acompanhamento das falhas dos webservices
+    disjuntores = None
+
+    # limitador.LimitadorConsultas compartilhado; None não limita as consultas
+    limitador = None
+
+    # estimador.EstimadorTempoProcessamento compartilhado; None usa o tempo
+    # médio informado pelo webservice
+    estimador = None
+
+    # Assinatura dos lotes em processos. Com True, usa o pool do certificado
+    # (assinador.pool_assinatura) ou o `executor_assinatura` informado, criado
+    # com assinador.criar_pool_assinatura. Threads não trazem ganho, pois a
+    # assinatura segura o GIL
+    assinatura_paralela = False
+    executor_assinatura = None
+    max_workers_assinatura = None
+
     def __init__(self, transmissao, envio_sincrono=False):
         self._transmissao = transmissao
         self.envio_sincrono = bool(envio_sincrono)
@@ -46,6 +91,20 @@ class DocumentoEletronico(ABC):
         # if isinstance(ds, unicode):
         #     return ds, etree.fromstring(ds)
 
+        contents = self._exportar(ds, pretty_print)
+        return contents, etree.fromstring(contents)
+
+    def _generateds_to_etree(self, ds):
+        """Semelhante ao `_generateds_to_string_etree`, mas retorna apenas o
+        elemento. O XML exportado é descartado logo após a análise; quem
+        precisar da string pode obtê-la com `etree.tostring` sob demanda."""
+        if isinstance(ds, _Element):
+            return ds
+        if isinstance(ds, str):
+            return etree.fromstring(ds)
+        return etree.fromstring(self._exportar(ds))
+
+    def _exportar(self, ds, pretty_print=False):
         output = StringIO()
         namespace = False
         if self._namespace:
@@ -61,15 +120,73 @@ class DocumentoEletronico(ABC):
             )
         contents = output.getvalue()
         output.close()
-        return contents, etree.fromstring(contents)
+        return contents
+
+    def _clonar(self):
+        """Cópia rasa do documento com uma transmissão própria, para uso em
+        outra thread sem disputar o cliente SOAP ativo da transmissão."""
+        documento = copy.copy(self)
+        documento._transmissao = copy.copy(self._transmissao)
+        return documento
+
+    @contextmanager
+    def _cliente(self, url):
+        """Equivalente ao `transmissao.cliente(url)`, mas reaproveitando
+        clientes já construídos do pool quando a transmissão é SOAP."""
+        if self._pool_clientes is None or not isinstance(
+            self._transmissao, TransmissaoSOAP
+        ):
+            with self._transmissao.cliente(url) as cliente:
+                yield cliente
+            return
 
-    def _post(self, raiz, url, operacao, classe):
-        xml_string, xml_etree = self._generateds_to_string_etree(raiz)
-        with self._transmissao.cliente(url):
-            retorno = self._transmissao.enviar(operacao, xml_etree)
-            return analisar_retorno_raw(operacao, raiz, xml_string, retorno, classe)
+        with self._pool_clientes.cliente(self._transmissao, url) as cliente:
+            self._transmissao._cliente = cliente
+            try:
+                yield cliente
+            finally:
+                self._transmissao._cliente = False
+
+    def _chave_limitador(self, raiz, operacao):
+        """(CNPJ, UF, serviço) usados pelo limitador de consultas"""
+        cnpj = campo_raiz(raiz, "CNPJ") or campo_raiz(raiz, "CPF")
+        if not cnpj:
+            certificado = getattr(self._transmissao, "certificado", None)
+            cnpj = certificado.cnpj_cpf if certificado else ""
+        return cnpj, getattr(self, "uf", None), operacao
 
-    def processar_documento(self, edoc, envio_sincrono=False):
+    def _aguarda_limitador(self, raiz, operacao):
+        if self.limitador is not None:
+            self.limitador.adquirir(*self._chave_limitador(raiz, operacao))
+
+    def _enviar(self, raiz, operacao, xml_etree):
+        return self._transmissao.enviar(operacao, xml_etree)
+
+    def _analisar_retorno(self, operacao, raiz, xml_etree, retorno, classe):
+        return analisar_retorno_raw(operacao, raiz, xml_etree, retorno, classe)
+
+    def _post(self, raiz, url, operacao, classe):
+        self._aguarda_limitador(raiz, operacao)
+        xml_etree = self._generateds_to_etree(raiz)
+        try:
+            with self._cliente(url):
+                retorno = self._enviar(raiz, operacao, xml_etree)
+                proc = self._analisar_retorno(
+                    operacao, raiz, xml_etree, retorno, classe
+                )
+        except RequestException as erro:
+            self._registra_disjuntor(url, erro=erro)
+            raise
+        self._registra_disjuntor(url, proc)
+        if proc is not None:
+            proc.url = url
+        return proc
+
+    def _registra_disjuntor(self, url, proc=None, erro=None):
+        if self.disjuntores is not None:
+            self.disjuntores.registrar(url, proc, erro)
+
+    def processar_documento(self, edoc, envio_sincrono=False, agendador=None):
         """Processar documento executa o envio do documento fiscal de forma
         completa ao serviço relacionado, esta é um método padrão que
         segue o seguinte workflow:
@@ -91,12 +208,16 @@ class DocumentoEletronico(ABC):
                     for p in nfe.processar_documento(edoc):
                         # seu código aqui
 
+        Informando um `agendador.AgendadorRecibos`, o passo 4 não bloqueia: o
+        recibo é agendado e o resultado entregue pelo próprio agendador.
+
         :param edoc:
+        :param agendador: AgendadorRecibos opcional
         :return: Esta função retorna um yield, portanto ela retorna um iterator
 
         """
         if self._consulta_servico_ao_enviar:
-            proc_servico = self.status_servico()
+            proc_servico = self._status_servico_em_cache()
             yield proc_servico
             #
             # Se o serviço não estiver em operação
@@ -148,6 +269,10 @@ class DocumentoEletronico(ABC):
         ):
             return
 
+        if agendador is not None:
+            agendador.agendar(self, edoc, proc_envio)
+            return
+
         #
         # Aguarda o tempo do processamento antes da consulta
         #
@@ -156,6 +281,7 @@ class DocumentoEletronico(ABC):
         # Consulta o recibo do lote, para ver o que aconteceu
         #
         proc_recibo = self.consulta_recibo(proc_envio=proc_envio)
+        self._observa_recibo(proc_envio, proc_recibo)
 
         if not proc_recibo.resposta:
             return
@@ -175,6 +301,7 @@ class DocumentoEletronico(ABC):
             # Consulta o recibo do lote, para ver o que aconteceu
             #
             proc_recibo = self.consulta_recibo(proc_envio=proc_envio)
+            self._observa_recibo(proc_envio, proc_recibo)
         self.monta_processo(edoc, proc_envio, proc_recibo)
         yield proc_recibo
 
@@ -213,12 +340,95 @@ class DocumentoEletronico(ABC):
     def _data_hoje(self):
         return datetime.strftime(datetime.now(), "%Y-%m-%d")
 
+    @property
+    def _assinador(self):
+        return obter_assinador(self._transmissao.certificado)
+
     def assina_raiz(self, raiz, id, getchildren=False):
-        xml_string, xml_etree = self._generateds_to_string_etree(raiz)
-        xml_assinado = Assinatura(self._transmissao.certificado).assina_xml2(
-            xml_etree, id, getchildren
+        return etree.tostring(
+            self.assina_raiz_etree(raiz, id, getchildren), encoding=str
+        )
+
+    def assina_raiz_etree(self, raiz, id, getchildren=False):
+        """Semelhante ao `assina_raiz`, mas retorna o elemento assinado para
+        ser anexado ao lote sem passar por texto."""
+        xml_etree = self._generateds_to_etree(raiz)
+        return self._assinador.assina_etree(xml_etree, id, getchildren)
+
+    def assina_lote_etree(self, raizes):
+        """Assina as raízes de um lote, de acordo com `assinatura_paralela`.
+
+        :param raizes: lista de tuplas (raiz, id)
+        :return: lista dos elementos assinados, na ordem recebida
+        """
+        if not self.assinatura_paralela or len(raizes) < 2:
+            return [self.assina_raiz_etree(raiz, id) for raiz, id in raizes]
+
+        executor = self.executor_assinatura or pool_assinatura(
+            self._transmissao.certificado, self.max_workers_assinatura
+        )
+        xmls = [self._generateds_to_string_etree(raiz)[0] for raiz, id in raizes]
+        assinados = executor.map(_assina_em_processo, xmls, [id for raiz, id in raizes])
+        return [etree.fromstring(xml) for xml in assinados]
+
+    def _tempo_espera(self, proc_envio):
+        """Segundos a aguardar antes de consultar o recibo do envio"""
+        return 0
+
+    def _chave_status_servico(self):
+        return (
+            getattr(self, "uf", None),
+            getattr(self, "mod", None),
+            getattr(self, "ambiente", None),
+            getattr(self, "contingencia", False),
+        )
+
+    def _status_servico_em_cache(self):
+        """status_servico respondido pelo cache enquanto o último retorno
+        for válido"""
+        cache = self._cache_status_servico
+        if cache is None:
+            return self.status_servico()
+        chave = self._chave_status_servico()
+        proc_servico = cache.obter(chave)
+        if proc_servico is None:
+            proc_servico = self.status_servico()
+            cache.guardar(chave, proc_servico)
+        return proc_servico
+
+    def _chave_estimador(self):
+        return (
+            getattr(self, "uf", None),
+            getattr(self, "mod", None),
+            getattr(self, "ambiente", None),
         )
-        return xml_assinado.replace("\n", "").replace("\r", "")
+
+    def _tempo_espera_estimado(self, proc_envio, padrao):
+        if self.estimador is None:
+            return padrao
+        return self.estimador.tempo_espera(
+            self._chave_estimador(),
+            padrao,
+            time.monotonic() - proc_envio.recebido_em,
+            getattr(proc_envio, "em_processamento", 0),
+            getattr(proc_envio, "em_processamento_ate", 0.0),
+        )
+
+    def _observa_recibo(self, proc_envio, proc_recibo):
+        """Alimenta o estimador com o resultado de uma consulta de recibo"""
+        if self.estimador is None or not proc_recibo or not proc_recibo.resposta:
+            return
+        decorrido = proc_recibo.recebido_em - proc_envio.recebido_em
+        if self._edoc_situacao_em_processamento(proc_recibo):
+            proc_envio.em_processamento = getattr(proc_envio, "em_processamento", 0) + 1
+            proc_envio.em_processamento_ate = decorrido
+            self.estimador.registrar_em_processamento(self._chave_estimador())
+        else:
+            self.estimador.registrar(
+                self._chave_estimador(),
+                decorrido,
+                getattr(proc_envio, "em_processamento_ate", None),
+            )
 
     def _verifica_servico_em_operacao(self, proc_servico):
         return True
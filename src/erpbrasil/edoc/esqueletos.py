@@ -0,0 +1,105 @@
+# License MIT
+
+"""Mensagens de formato fixo montadas a partir de elementos pré-analisados.
+
+Em vez de instanciar o binding do generateDS, exportá-lo e analisar o XML
+exportado, cada envio copia o esqueleto (``copy.deepcopy``) e preenche os
+poucos campos variáveis.
+
+Uso opcional, ativado por ``NFe.esqueletos_xml = True``: nesse caso o
+``envio_raiz`` dos retornos é o ``ElementoEsqueleto`` enviado, e não o
+binding do generateDS.
+"""
+
+import copy
+
+from lxml import etree
+
+NAMESPACE_NFE = "http://www.portalfiscal.inf.br/nfe"
+
+
+class ElementoEsqueleto(etree.ElementBase):
+    """Elemento montado a partir de um esqueleto. Assim como o dos bindings
+    do generateDS, seu ``RetornoSoap.envio_xml`` é uma str."""
+
+
+_PARSER = etree.XMLParser()
+_PARSER.set_element_class_lookup(
+    etree.ElementDefaultClassLookup(element=ElementoEsqueleto)
+)
+
+
+class Esqueleto:
+    """Elemento modelo de uma mensagem.
+
+    Os campos são os elementos sem texto do modelo, preenchidos pelo nome
+    local da tag; o atributo versao da raiz é informado em `versao`.
+    """
+
+    def __init__(self, xml):
+        self._modelo = etree.fromstring(xml, _PARSER)
+        # Caminho (índices dos filhos) de cada campo, para não buscar as tags
+        # a cada preenchimento
+        self._campos = {}
+        pilha = [(self._modelo, ())]
+        while pilha:
+            elemento, caminho = pilha.pop()
+            if len(elemento):
+                pilha.extend(
+                    (filho, caminho + (indice,))
+                    for indice, filho in enumerate(elemento)
+                )
+            elif elemento.text is None:
+                self._campos[etree.QName(elemento).localname] = caminho
+
+    @property
+    def campos(self):
+        return tuple(self._campos)
+
+    def preencher(self, versao, **valores):
+        elemento = copy.deepcopy(self._modelo)
+        elemento.set("versao", str(versao))
+        for campo, valor in valores.items():
+            destino = elemento
+            for indice in self._campos[campo]:
+                destino = destino[indice]
+            destino.text = str(valor)
+        return elemento
+
+
+def _esqueleto(corpo, **partes):
+    return Esqueleto(corpo.format(ns=NAMESPACE_NFE, **partes))
+
+
+CONS_STAT_SERV = _esqueleto(
+    '<consStatServ xmlns="{ns}" versao="">'
+    "<tpAmb/><cUF/><xServ>STATUS</xServ></consStatServ>"
+)
+
+CONS_SIT_NFE = _esqueleto(
+    '<consSitNFe xmlns="{ns}" versao="">'
+    "<tpAmb/><xServ>CONSULTAR</xServ><chNFe/></consSitNFe>"
+)
+
+CONS_RECI_NFE = _esqueleto(
+    '<consReciNFe xmlns="{ns}" versao=""><tpAmb/><nRec/></consReciNFe>'
+)
+
+# Grupo de cada tipo de consulta do distDFeInt, pelo campo que o identifica
+_CONSULTAS_DISTRIBUICAO = {
+    "ultNSU": "<distNSU><ultNSU/></distNSU>",
+    "NSU": "<consNSU><NSU/></consNSU>",
+    "chNFe": "<consChNFe><chNFe/></consChNFe>",
+}
+
+# distDFeInt por (CNPJ ou CPF, campo da consulta)
+DIST_DFE_INT = {
+    (documento, campo): _esqueleto(
+        '<distDFeInt xmlns="{ns}" versao=""><tpAmb/><cUFAutor/>'
+        "<{documento}/>{consulta}</distDFeInt>",
+        documento=documento,
+        consulta=consulta,
+    )
+    for documento in ("CNPJ", "CPF")
+    for campo, consulta in _CONSULTAS_DISTRIBUICAO.items()
+}
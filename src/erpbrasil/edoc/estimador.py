@@ -0,0 +1,91 @@
+# License MIT
+
+import threading
+
+
+class EstimadorTempoProcessamento:
+    """Média móvel exponencial (EWMA) do tempo real de processamento dos
+    lotes, por chave (UF, modelo, ambiente).
+
+    Cada lote contribui com uma amostra quando a consulta do recibo retorna
+    o resultado final. Se antes houve uma resposta "em processamento", o
+    tempo real está entre as duas consultas e a amostra é o ponto médio;
+    se a primeira consulta já trouxe o resultado, o tempo real pode ser
+    menor e a amostra é reduzida em `sondagem`, para que a estimativa possa
+    diminuir.
+
+    Apenas a primeira consulta desconta o tempo já decorrido desde o envio.
+    Depois de um "em processamento" a estimativa falhou para o lote, e as
+    consultas seguintes aguardam ao menos o tempo padrão, com espera dobrada
+    a cada nova resposta "em processamento".
+    """
+
+    def __init__(self, alfa=0.2, margem=1.1, minimo=1.0, maximo=60.0, sondagem=0.1):
+        self.alfa = alfa
+        self.margem = margem
+        self.minimo = minimo
+        self.maximo = maximo
+        self.sondagem = sondagem
+        self._trava = threading.Lock()
+        self._estatisticas = {}
+
+    def _registro(self, chave):
+        return self._estatisticas.setdefault(
+            chave,
+            {"media": None, "amostras": 0, "em_processamento": 0, "ultima": None},
+        )
+
+    def tempo_espera(
+        self, chave, padrao, decorrido=0.0, em_processamento=0, em_processamento_ate=0.0
+    ):
+        """Segundos a aguardar antes da próxima consulta do recibo.
+
+        :param padrao: tempo usado enquanto não há amostras, como o tMed
+        :param decorrido: segundos desde o recebimento do lote
+        :param em_processamento: respostas "em processamento" já recebidas
+        para o lote
+        :param em_processamento_ate: segundos decorridos na última delas
+        """
+        with self._trava:
+            registro = self._estatisticas.get(chave)
+            media = registro["media"] if registro and registro["amostras"] else None
+        if media is None:
+            media = padrao
+        if em_processamento:
+            espera = max(
+                padrao,
+                media * self.margem - em_processamento_ate,
+                self.minimo * 2**em_processamento,
+            )
+        else:
+            espera = media * self.margem - decorrido
+        return min(max(espera, self.minimo), self.maximo)
+
+    def registrar(self, chave, decorrido, em_processamento_ate=None):
+        """Registra o tempo até o resultado final de um lote
+
+        :param em_processamento_ate: segundos decorridos na última consulta
+        que retornou "em processamento", se houve
+        """
+        if em_processamento_ate is not None:
+            amostra = (em_processamento_ate + decorrido) / 2
+        else:
+            amostra = decorrido * (1 - self.sondagem)
+        with self._trava:
+            registro = self._registro(chave)
+            if registro["media"] is None:
+                registro["media"] = amostra
+            else:
+                registro["media"] += self.alfa * (amostra - registro["media"])
+            registro["amostras"] += 1
+            registro["ultima"] = amostra
+
+    def registrar_em_processamento(self, chave):
+        with self._trava:
+            self._registro(chave)["em_processamento"] += 1
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                chave: dict(registro) for chave, registro in self._estatisticas.items()
+            }
@@ -0,0 +1,168 @@
+# License MIT
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+# Consultas sujeitas ao bloqueio por consumo indevido (cStat 656) e a taxa
+# padrão de cada uma: (capacidade do balde, segundos para recompô-lo)
+TAXAS_PADRAO = {
+    "nfeStatusServicoNF": (10, 600),
+    "nfeConsultaNF": (20, 60),
+    "nfeDistDFeInteresse": (20, 3600),
+}
+
+
+class LimiteConsultaExcedido(Exception):
+    """A consulta excederia a taxa configurada no limitador"""
+
+    def __init__(self, chave, espera):
+        super().__init__(
+            f"Limite de consultas excedido para {chave}; aguarde {espera:.1f}s"
+        )
+        self.chave = chave
+        self.espera = espera
+
+
+class BackendMemoria:
+    """Baldes mantidos em memória, compartilhados apenas pelas threads do
+    processo."""
+
+    def __init__(self):
+        self._baldes = {}
+        self._trava = threading.Lock()
+
+    def consumir(self, chave, capacidade, periodo, agora):
+        with self._trava:
+            fichas, atualizado = self._baldes.get(chave, (capacidade, agora))
+            fichas, espera = _consumir(fichas, atualizado, capacidade, periodo, agora)
+            self._baldes[chave] = (fichas, agora)
+            return espera
+
+
+class BackendSQLite:
+    """Baldes gravados em um banco SQLite local, compartilhados por todos os
+    processos que usarem o mesmo arquivo. Cada consumo é feito em uma
+    transação ``BEGIN IMMEDIATE``, que serializa os acessos concorrentes."""
+
+    def __init__(self, caminho, timeout=30):
+        self.caminho = caminho
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._conexao() as conexao:
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS baldes ("
+                "chave TEXT PRIMARY KEY, fichas REAL, atualizado REAL)"
+            )
+
+    def _conexao(self):
+        # Conexões do sqlite3 não podem ser compartilhadas entre threads
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = self._local.conexao = sqlite3.connect(
+                self.caminho, timeout=self.timeout, isolation_level=None
+            )
+        return conexao
+
+    def consumir(self, chave, capacidade, periodo, agora):
+        conexao = self._conexao()
+        chave = "|".join(str(parte) for parte in chave)
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            registro = conexao.execute(
+                "SELECT fichas, atualizado FROM baldes WHERE chave = ?", (chave,)
+            ).fetchone()
+            fichas, atualizado = registro or (capacidade, agora)
+            fichas, espera = _consumir(fichas, atualizado, capacidade, periodo, agora)
+            conexao.execute(
+                "INSERT OR REPLACE INTO baldes (chave, fichas, atualizado) "
+                "VALUES (?, ?, ?)",
+                (chave, fichas, agora),
+            )
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+        conexao.execute("COMMIT")
+        return espera
+
+
+def _consumir(fichas, atualizado, capacidade, periodo, agora):
+    """Recompõe o balde pelo tempo decorrido e tenta retirar uma ficha.
+
+    :return: tupla (fichas restantes, segundos até haver uma ficha; 0 se a
+    ficha foi retirada)
+    """
+    taxa = capacidade / periodo
+    fichas = min(capacidade, fichas + max(agora - atualizado, 0) * taxa)
+    if fichas >= 1:
+        return fichas - 1, 0
+    return fichas, (1 - fichas) / taxa
+
+
+class LimitadorConsultas:
+    """Token bucket por (CNPJ, UF, serviço) para evitar o bloqueio da SEFAZ
+    por consumo indevido.
+
+    Cada serviço listado em `taxas` tem um balde com `capacidade` fichas,
+    recomposto ao longo de `periodo` segundos; serviços fora da lista não são
+    limitados. Com `bloquear`, a consulta aguarda a próxima ficha (até
+    `timeout` segundos, se informado); caso contrário, é levantada a exceção
+    LimiteConsultaExcedido.
+
+    Para compartilhar o limite entre processos use o BackendSQLite::
+
+        DocumentoEletronico.limitador = LimitadorConsultas(
+            backend=BackendSQLite("/var/tmp/edoc-limites.sqlite")
+        )
+    """
+
+    def __init__(self, taxas=None, backend=None, bloquear=True, timeout=None):
+        self.taxas = dict(TAXAS_PADRAO if taxas is None else taxas)
+        self.backend = backend or BackendMemoria()
+        self.bloquear = bloquear
+        self.timeout = timeout
+
+    def tentar(self, cnpj, uf, servico):
+        """Retira uma ficha sem aguardar.
+
+        :return: 0 se a consulta pode ser feita ou os segundos até a próxima
+        ficha
+        """
+        taxa = self.taxas.get(servico)
+        if not taxa:
+            return 0
+        capacidade, periodo = taxa
+        return self.backend.consumir(
+            (cnpj, uf, servico), capacidade, periodo, time.time()
+        )
+
+    def _espera(self, chave, espera, inicio):
+        if not self.bloquear or (
+            self.timeout is not None
+            and time.monotonic() + espera - inicio > self.timeout
+        ):
+            raise LimiteConsultaExcedido(chave, espera)
+        return espera
+
+    def adquirir(self, cnpj, uf, servico):
+        """Retira uma ficha, aguardando ou levantando LimiteConsultaExcedido
+        conforme o modo configurado"""
+        inicio = time.monotonic()
+        while True:
+            espera = self.tentar(cnpj, uf, servico)
+            if not espera:
+                return
+            time.sleep(self._espera((cnpj, uf, servico), espera, inicio))
+
+    async def adquirir_assincrono(self, cnpj, uf, servico):
+        """Versão de `adquirir` que aguarda sem bloquear o event loop; a
+        ficha é retirada em uma thread, pois o backend pode aguardar a trava
+        do banco"""
+        loop = asyncio.get_running_loop()
+        inicio = time.monotonic()
+        while True:
+            espera = await loop.run_in_executor(None, self.tentar, cnpj, uf, servico)
+            if not espera:
+                return
+            await asyncio.sleep(self._espera((cnpj, uf, servico), espera, inicio))
@@ -1,12 +1,13 @@
 # Copyright (C) 2020 - KMEE
 
-
-import re
+import copy
 
 from lxml import etree
 
-from erpbrasil.edoc.nfe import NFe, localizar_url
-from erpbrasil.edoc.resposta import RetornoSoap
+from erpbrasil.edoc.edoc import campo_raiz
+from erpbrasil.edoc.nfe import NFe
+from erpbrasil.edoc.resposta import RetornoSoap, construir_binding, corpo_soap
+from erpbrasil.edoc.webservices import SIGLA_ESTADO, WS_NFE_RECEPCAO_EVENTO
 from erpbrasil.transmissao import TransmissaoSOAP
 
 try:
@@ -20,38 +21,25 @@ try:
 except ImportError:
     pass
 
-WS_NFE_RECEPCAO_EVENTO = "RecepcaoEvento"
-
-SIGLA_ESTADO = {
-    "12": "AC",
-    "27": "AL",
-    "13": "AM",
-    "16": "AP",
-    "29": "BA",
-    "23": "CE",
-    "53": "DF",
-    "32": "ES",
-    "52": "GO",
-    "21": "MA",
-    "31": "MG",
-    "50": "MS",
-    "51": "MT",
-    "15": "PA",
-    "25": "PB",
-    "26": "PE",
-    "22": "PI",
-    "41": "PR",
-    "33": "RJ",
-    "24": "RN",
-    "11": "RO",
-    "14": "RR",
-    "43": "RS",
-    "42": "SC",
-    "28": "SE",
-    "35": "SP",
-    "17": "TO",
-    "91": "AN",
-}
+# Máximo de eventos em um envEvento
+LIMITE_EVENTOS_LOTE = 20
+
+# Modelos do nfeCabecMsg por (xmlns, cUF, versaoDados)
+_CABECALHOS = {}
+
+
+def _cabecalho(xmlns, uf, versao):
+    """Cópia do nfeCabecMsg, montado apenas na primeira vez para cada
+    combinação; a cópia é necessária porque o zeep anexa o elemento ao
+    envelope."""
+    chave = (xmlns, uf, versao)
+    modelo = _CABECALHOS.get(chave)
+    if modelo is None:
+        modelo = etree.Element(f"{{{xmlns}}}nfeCabecMsg", nsmap={None: xmlns})
+        etree.SubElement(modelo, f"{{{xmlns}}}cUF").text = str(uf)
+        etree.SubElement(modelo, f"{{{xmlns}}}versaoDados").text = versao
+        _CABECALHOS[chave] = modelo
+    return copy.deepcopy(modelo)
 
 
 class MDe(NFe):
@@ -71,21 +59,16 @@ class MDe(NFe):
         eventos = []
         raiz = TEnvEventoManifestacao(versao="1.00", idLote=numero_lote, evento=eventos)
         raiz.original_tagname_ = "envEvento"
-        xml_envio_string, xml_envio_etree = self._generateds_to_string_etree(raiz)
+        xml_envio_etree = self._generateds_to_etree(raiz)
 
+        assinar = []
         for raiz_evento in lista_eventos:
             evento = TEventoManifestacao(
                 versao="1.00",
                 infEvento=raiz_evento,
             )
             evento.original_tagname_ = "evento"
-
-            # Recupera o evento do XML assinado
-            xml_assinado = (
-                self.assina_raiz(evento, evento.infEvento.Id).replace("\n", "").encode()
-            )
-
-            xml_envio_etree.append(etree.fromstring(xml_assinado))
+            assinar.append((evento, evento.infEvento.Id))
 
             # FIXME: Essa forma de geração foi removida no ultimo refactor
 
@@ -98,10 +81,12 @@ class MDe(NFe):
             # de eventos terá um evento assinado corretamente
             # eventos.append(xml_object)
 
+        xml_envio_etree.extend(self.assina_lote_etree(assinar))
+
         return self._post(
             xml_envio_etree,
-            localizar_url(
-                WS_NFE_RECEPCAO_EVENTO, str(91), self.mod, int(self.ambiente)
+            self.registro_webservices.url(
+                WS_NFE_RECEPCAO_EVENTO, "91", self.mod, self.ambiente
             ),
             "nfeRecepcaoEventoNF",
             retEnvConfRecebto,
@@ -182,6 +167,36 @@ class MDe(NFe):
             lista_eventos=[evento], numero_lote="1"
         )
 
+    def nfe_recepcao_evento_lote(
+        self, chaves, cnpj_cpf, tpEvento, descEvento, xJust=None
+    ):
+        """
+        Envia a mesma manifestação para várias chaves, em lotes de até
+        LIMITE_EVENTOS_LOTE eventos assinados juntos, cada um com o seu
+        próprio número de lote
+        :return: lista com a resposta do envio de cada lote
+        """
+        chaves = list(chaves)
+        dhEvento = self._hora_agora()
+        retornos = []
+        for inicio in range(0, len(chaves), LIMITE_EVENTOS_LOTE):
+            eventos = [
+                self.nfe_recepcao_monta_evento(
+                    chave, cnpj_cpf, tpEvento, descEvento, dhEvento, xJust
+                )
+                for chave in chaves[inicio : inicio + LIMITE_EVENTOS_LOTE]
+            ]
+            retornos.append(self.nfe_recepcao_envia_lote_evento(eventos))
+        return retornos
+
+    def ciencia_da_operacao_lote(self, chaves, cnpj_cpf):
+        return self.nfe_recepcao_evento_lote(
+            chaves,
+            cnpj_cpf,
+            eventoManifestacao._2_10210,
+            descEventoManifestacao.CIENCIADA_OPERACAO,
+        )
+
     def confirmacao_da_operacao(self, chave, cnpj_cpf):
         return self.nfe_recepcao_evento(
             chave,
@@ -221,35 +236,22 @@ class MDe(NFe):
         do XML da resposta.
         """
         retorno.raise_for_status()
-        match = re.search(
-            "<soap:Body>(.*?)</soap:Body>", retorno.text.replace("\n", "")
-        )
-        if match:
-            xml_resposta = match.group(1)
-            xml = etree.fromstring(xml_resposta)[0]
-            if "nfeDistDFeInteresseResult" in xml.tag:
-                xml = xml[0]  # unwrapp retDistDFeInt
-            resultado = etree.tostring(xml)
-            classe.Validate_simpletypes_ = False
-            resposta = classe.parseString(resultado, silence=True)
+        corpo = corpo_soap(retorno)
+        if corpo is not None:
+            resultado = corpo[0]
+            if "nfeDistDFeInteresseResult" in resultado.tag:
+                resultado = resultado[0]  # unwrapp retDistDFeInt
+            resposta = construir_binding(resultado, classe)
             return RetornoSoap(operacao, raiz, xml, retorno, resposta)
 
-    def _post(self, raiz, url, operacao, classe):
-        from .nfe import SIGLA_ESTADO
+    def _enviar(self, raiz, operacao, xml_etree):
+        # Recupera a sigla do estado
+        uf = SIGLA_ESTADO.get(str(campo_raiz(raiz, "cUFAutor")))
+        kwargs = {"uf": uf} if uf else {}
+        return self._transmissao.enviar(operacao, xml_etree, **kwargs)
 
-        xml_string, xml_etree = self._generateds_to_string_etree(raiz)
-        with self._transmissao.cliente(url):
-            # Recupera a sigla do estado
-            uf_list = [
-                uf
-                for nUF, uf in SIGLA_ESTADO.items()
-                if nUF == str(getattr(raiz, "cUFAutor", ""))
-            ]
-            kwargs = {"uf": uf_list[0]} if uf_list else {}
-            retorno = self._transmissao.enviar(operacao, xml_etree, **kwargs)
-            return self.analisar_retorno_raw(
-                operacao, raiz, xml_string, retorno, classe
-            )
+    def _analisar_retorno(self, operacao, raiz, xml_etree, retorno, classe):
+        return self.analisar_retorno_raw(operacao, raiz, xml_etree, retorno, classe)
 
 
 class TransmissaoMDE(TransmissaoSOAP):
@@ -277,14 +279,9 @@ class TransmissaoMDE(TransmissaoSOAP):
                 mensagem = {"mensagem": mensagem}
 
             if isinstance(mensagem, dict):
-                header_str = (
-                    '<nfeCabecMsg xmlns="{}">'
-                    "<cUF>{}</cUF>"
-                    "<versaoDados>{}</versaoDados>"
-                    "</nfeCabecMsg>".format(xmlns, uf, mensagem.get("versao", "1.00"))
+                _soapheaders.append(
+                    _cabecalho(xmlns, uf, mensagem.get("versao", "1.00"))
                 )
-
-                _soapheaders.append(etree.fromstring(header_str))
                 mensagem["_soapheaders"] = _soapheaders
 
         return mensagem
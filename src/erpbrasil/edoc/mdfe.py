@@ -8,7 +8,24 @@ from contextlib import suppress
 
 from lxml import etree
 
+from erpbrasil.edoc import webservices
 from erpbrasil.edoc.edoc import DocumentoEletronico
+from erpbrasil.edoc.webservices import (  # noqa: F401
+    AMBIENTE_HOMOLOGACAO,
+    AMBIENTE_PRODUCAO,
+    CODIGO_UF,
+    MDFE_MODELO,
+    QR_CODE_URL,
+    REGISTRO,
+    WS_MDFE_CONSULTA,
+    WS_MDFE_CONSULTA_NAO_ENCERRADOS,
+    WS_MDFE_DISTRIBUICAO,
+    WS_MDFE_RECEPCAO,
+    WS_MDFE_RECEPCAO_EVENTO,
+    WS_MDFE_RECEPCAO_SINC,
+    WS_MDFE_RET_RECEPCAO,
+    WS_MDFE_STATUS_SERVICO,
+)
 from erpbrasil.transmissao import TransmissaoSOAP
 
 with suppress(ImportError):
@@ -24,122 +41,21 @@ with suppress(ImportError):
         RetMdfe,
     )
 
-AMBIENTE_PRODUCAO = 1
-AMBIENTE_HOMOLOGACAO = 2
-
-WS_MDFE_CONSULTA = "MDFeConsulta"
-WS_MDFE_STATUS_SERVICO = "MDFeStatusServicoMDF"
-WS_MDFE_CONSULTA_NAO_ENCERRADOS = "MDFeConsNaoEnc"
-WS_MDFE_DISTRIBUICAO = "MDFeDistribuicaoDFe"
-
-WS_MDFE_RECEPCAO = "MDFeRecepcao"
-WS_MDFE_RECEPCAO_SINC = "MDFeRecepcaoSinc"
-WS_MDFE_RET_RECEPCAO = "MDFeRetRecepcao"
-WS_MDFE_RECEPCAO_EVENTO = "MDFeRecepcaoEvento"
-
-QR_CODE_URL = "QRCode"
-
-MDFE_MODELO = "58"
-
-SIGLA_ESTADO = {
-    "AC": 12,
-    "AL": 27,
-    "AM": 13,
-    "AP": 16,
-    "BA": 29,
-    "CE": 23,
-    "DF": 53,
-    "ES": 32,
-    "GO": 52,
-    "MA": 21,
-    "MG": 31,
-    "MS": 50,
-    "MT": 51,
-    "PA": 15,
-    "PB": 25,
-    "PE": 26,
-    "PI": 22,
-    "PR": 41,
-    "RJ": 33,
-    "RN": 24,
-    "RO": 11,
-    "RR": 14,
-    "RS": 43,
-    "SC": 42,
-    "SE": 28,
-    "SP": 35,
-    "TO": 17,
-    "AN": 91,
-}
-
-SVRS_STATES = [
-    "AC",
-    "AL",
-    "AM",
-    "BA",
-    "CE",
-    "DF",
-    "ES",
-    "GO",
-    "MA",
-    "PA",
-    "PB",
-    "PI",
-    "RJ",
-    "RN",
-    "RO",
-    "SC",
-    "SE",
-    "TO",
-    "AP",
-    "PE",
-    "RR",
-    "RS",
-    "SP",
-]
-
-SVRS = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "mdfe.svrs.rs.gov.br",
-        WS_MDFE_RET_RECEPCAO: "ws/MDFeRetRecepcao/MDFeRetRecepcao.asmx?wsdl",
-        WS_MDFE_RECEPCAO_EVENTO: "ws/MDFeRecepcaoEvento/MDFeRecepcaoEvento.asmx?wsdl",
-        WS_MDFE_CONSULTA: "ws/MDFeConsulta/MDFeConsulta.asmx?wsdl",
-        WS_MDFE_STATUS_SERVICO: "ws/MDFeStatusServico/MDFeStatusServico.asmx?wsdl",
-        WS_MDFE_CONSULTA_NAO_ENCERRADOS: "ws/MDFeConsNaoEnc/MDFeConsNaoEnc.asmx?wsdl",
-        WS_MDFE_DISTRIBUICAO: "ws/MDFeDistribuicaoDFe/MDFeDistribuicaoDFe.asmx?wsdl",
-        WS_MDFE_RECEPCAO_SINC: "ws/MDFeRecepcaoSinc/MDFeRecepcaoSinc.asmx?wsdl",
-        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/mdfe/qrCode",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "mdfe-homologacao.svrs.rs.gov.br",
-        WS_MDFE_RET_RECEPCAO: "ws/MDFeRetRecepcao/MDFeRetRecepcao.asmx?wsdl",
-        WS_MDFE_RECEPCAO_EVENTO: "ws/MDFeRecepcaoEvento/MDFeRecepcaoEvento.asmx?wsdl",
-        WS_MDFE_CONSULTA: "ws/MDFeConsulta/MDFeConsulta.asmx?wsdl",
-        WS_MDFE_STATUS_SERVICO: "ws/MDFeStatusServico/MDFeStatusServico.asmx?wsdl",
-        WS_MDFE_CONSULTA_NAO_ENCERRADOS: "ws/MDFeConsNaoEnc/MDFeConsNaoEnc.asmx?wsdl",
-        WS_MDFE_DISTRIBUICAO: "ws/MDFeDistribuicaoDFe/MDFeDistribuicaoDFe.asmx?wsdl",
-        WS_MDFE_RECEPCAO_SINC: "ws/MDFeRecepcaoSinc/MDFeRecepcaoSinc.asmx?wsdl",
-        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/mdfe/qrCode",
-    },
-}
+# Tabelas de webservices com os nomes usados anteriormente neste módulo
+SVRS = webservices.MDFE_SVRS
+SVRS_STATES = webservices.MDFE_SVRS_STATES
+
+# Código IBGE da UF por sigla
+SIGLA_ESTADO = {sigla: int(codigo) for sigla, codigo in CODIGO_UF.items()}
 
 
 def get_service_url(sigla_estado, service, ambiente):
-    if sigla_estado in SVRS_STATES:
-        state_config = SVRS
-    else:
+    try:
+        return REGISTRO.url(service, CODIGO_UF[sigla_estado], MDFE_MODELO, ambiente)
+    except KeyError as erro:
         raise ValueError(
             f"Estado {sigla_estado} não suportado ou configuração ausente."
-        )
-
-    environment = AMBIENTE_PRODUCAO if ambiente == 1 else AMBIENTE_HOMOLOGACAO
-
-    if service == "QRCode":
-        return state_config[environment][QR_CODE_URL]
-
-    server = state_config[environment]["servidor"]
-    service_path = state_config[environment][service]
-    return f"https://{server}/{service_path}"
+        ) from erro
 
 
 class MDFe(DocumentoEletronico):
@@ -160,16 +76,14 @@ class MDFe(DocumentoEletronico):
         self.mod = str(mod)
 
     def _get_ws_endpoint(self, service):
-        sigla = None
-        for uf_code, ibge_code in SIGLA_ESTADO.items():
-            if ibge_code == self.uf:
-                sigla = uf_code
-                break
-
-        if not sigla:
-            raise ValueError(f"UF {self.uf} não suportado ou configuração ausente.")
-
-        return get_service_url(sigla, service, self.ambiente)
+        try:
+            return self.registro_webservices.url(
+                service, self.uf, self.mod, self.ambiente
+            )
+        except KeyError as erro:
+            raise ValueError(
+                f"UF {self.uf} não suportado ou configuração ausente."
+            ) from erro
 
     def _verifica_resposta_envio_sucesso(self, proc_envio):
         return (
@@ -248,7 +162,7 @@ class MDFe(DocumentoEletronico):
             ),
         )
         raiz = EventoMdfe(versao="3.00", infEvento=inf_evento)
-        xml_assinado = etree.fromstring(self.assina_raiz(raiz, raiz.infEvento.Id))
+        xml_assinado = self.assina_raiz_etree(raiz, raiz.infEvento.Id)
 
         return self._post(
             xml_assinado,
@@ -2,13 +2,54 @@
 
 
 import collections
+import copy
 import datetime
+import itertools
+import os
+import secrets
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import suppress
 
 from lxml import etree
 
+from erpbrasil.edoc import esqueletos
 from erpbrasil.edoc.edoc import DocumentoEletronico
+from erpbrasil.edoc.webservices import (  # noqa: F401
+    AMBIENTE_HOMOLOGACAO,
+    AMBIENTE_PRODUCAO,
+    AN,
+    ESTADO_WS,
+    NFCE_MODELO,
+    NFE_MODELO,
+    SIGLA_ESTADO,
+    SVAN,
+    SVC_AN,
+    SVC_RS,
+    SVRS,
+    UFAM,
+    UFBA,
+    UFGO,
+    UFMG,
+    UFMS,
+    UFMT,
+    UFPE,
+    UFPR,
+    UFRS,
+    UFSP,
+    WS_DFE_DISTRIBUICAO,
+    WS_DOWNLOAD_NFE,
+    WS_NFCE_CONSULTA_DESTINADAS,
+    WS_NFCE_QR_CODE,
+    WS_NFE_AUTORIZACAO,
+    WS_NFE_CADASTRO,
+    WS_NFE_CONSULTA,
+    WS_NFE_INUTILIZACAO,
+    WS_NFE_RECEPCAO_EVENTO,
+    WS_NFE_RET_AUTORIZACAO,
+    WS_NFE_SITUACAO,
+    localizar_url,
+)
 
 with suppress(ImportError):
     # nfelib imports
@@ -44,647 +85,6 @@ a correcao de dados cadastrais que implique mudanca do \
 remetente ou do destinatario; III - a data de emissao \
 ou de saida."""
 
-WS_DFE_DISTRIBUICAO = "NFeDistribuicaoDFe"
-WS_DOWNLOAD_NFE = "nfeDistDFeInteresse"
-WS_NFCE_CONSULTA_DESTINADAS = "NfeConsultaDest"
-WS_NFCE_QR_CODE = "NfeQRCode"
-WS_NFE_AUTORIZACAO = "NfeAutorizacao"
-WS_NFE_CADASTRO = "NfeConsultaCadastro"
-
-WS_NFE_CONSULTA = "NfeConsultaProtocolo"
-WS_NFE_INUTILIZACAO = "NfeInutilizacao"
-WS_NFE_RECEPCAO_EVENTO = "RecepcaoEvento"
-WS_NFE_RET_AUTORIZACAO = "NfeRetAutorizacao"
-
-WS_NFE_SITUACAO = "NfeStatusServico"
-
-AMBIENTE_PRODUCAO = 1
-AMBIENTE_HOMOLOGACAO = 2
-
-NFE_MODELO = "55"
-NFCE_MODELO = "65"
-
-SIGLA_ESTADO = {
-    "12": "AC",
-    "27": "AL",
-    "13": "AM",
-    "16": "AP",
-    "29": "BA",
-    "23": "CE",
-    "53": "DF",
-    "32": "ES",
-    "52": "GO",
-    "21": "MA",
-    "31": "MG",
-    "50": "MS",
-    "51": "MT",
-    "15": "PA",
-    "25": "PB",
-    "26": "PE",
-    "22": "PI",
-    "41": "PR",
-    "33": "RJ",
-    "24": "RN",
-    "11": "RO",
-    "14": "RR",
-    "43": "RS",
-    "42": "SC",
-    "28": "SE",
-    "35": "SP",
-    "17": "TO",
-    "91": "AN",
-}
-
-SVRS = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.svrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "nfe-homologacao.svrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.svrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "nfce-homologacao.svrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
-        },
-    },
-}
-
-SVAN = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "www.sefazvirtual.fazenda.gov.br",
-        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
-        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
-        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "hom.sefazvirtual.fazenda.gov.br",
-        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
-        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
-        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-    },
-}
-
-SVC_AN = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "www.svc.fazenda.gov.br",
-        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
-        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
-        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "hom.sefazvirtual.fazenda.gov.br",
-        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
-        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
-        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-    },
-}
-
-SVC_RS = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "nfe.svrs.rs.gov.br",
-        WS_NFE_RECEPCAO_EVENTO: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-        WS_NFE_AUTORIZACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
-        WS_NFE_CONSULTA: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-        WS_NFE_SITUACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "nfe-homologacao.svrs.rs.gov.br",
-        WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-        WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
-        WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-    },
-}
-
-AN = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "www1.nfe.fazenda.gov.br",
-        WS_DFE_DISTRIBUICAO: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
-        WS_DOWNLOAD_NFE: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "hom1.nfe.fazenda.gov.br",
-        WS_DFE_DISTRIBUICAO: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
-        WS_DOWNLOAD_NFE: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?Wsdl",  # noqa
-    },
-}
-
-UFAM = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.sefaz.am.gov.br",
-            WS_NFE_INUTILIZACAO: "services2/services/NfeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "services2/services/NfeConsulta4?wsdl",
-            WS_NFE_SITUACAO: "services2/services/NfeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "services2/services/RecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "services2/services/NfeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "services2/services/NfeRetAutorizacao4?wsdl",  # noqa
-            WS_NFE_CADASTRO: "services2/services/cadconsultacadastro2?wsdl",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homnfe.sefaz.am.gov.br",
-            WS_NFE_INUTILIZACAO: "services2/services/NfeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "services2/services/NfeConsulta4?wsdl",
-            WS_NFE_SITUACAO: "services2/services/NfeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "services2/services/RecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "services2/services/NfeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "services2/services/NfeRetAutorizacao4?wsdl",  # noqa
-            WS_NFE_CADASTRO: "services2/services/cadconsultacadastro2?wsdl",
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.sefaz.am.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "nfce-services/services/RecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfce-services/services/NfeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfce-services/services/NfeRetAutorizacao4?wsdl",
-            WS_NFE_INUTILIZACAO: "nfce-services/services/NfeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfce-services/services/NfeConsulta4?wsdl",
-            WS_NFE_SITUACAO: "nfce-services/services/NfeStatusServico4?wsdl",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homnfce.sefaz.am.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "nfce-services/services/RecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfce-services/services/NfeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfce-services/services/NfeRetAutorizacao4?wsdl",
-            WS_NFE_INUTILIZACAO: "nfce-services/services/NfeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfce-services/services/NfeConsulta4?wsdl",
-            WS_NFE_SITUACAO: "nfce-services/services/NfeStatusServico4?wsdl",
-            WS_NFCE_QR_CODE: "http://homnfce.sefaz.am.gov.br/nfceweb/consultarNFCe.jsp",
-        },
-    },
-}
-
-UFBA = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.sefaz.ba.gov.br",
-            WS_NFE_INUTILIZACAO: "webservices/NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CONSULTA: "webservices/NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
-            WS_NFE_SITUACAO: "webservices/NFeStatusServico4/NFeStatusServico4.asmx?wsdl",  # noqa
-            WS_NFE_RECEPCAO_EVENTO: "webservices/NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-            WS_NFE_AUTORIZACAO: "webservices/NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_RET_AUTORIZACAO: "webservices/NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CADASTRO: "webservices/CadConsultaCadastro4/CadConsultaCadastro4.asmx?wsdl",  # noqa
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "hnfe.sefaz.ba.gov.br",
-            WS_NFE_INUTILIZACAO: "webservices/NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CONSULTA: "webservices/NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
-            WS_NFE_SITUACAO: "webservices/NFeStatusServico4/NFeStatusServico4.asmx?wsdl",  # noqa
-            WS_NFE_RECEPCAO_EVENTO: "webservices/NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
-            WS_NFE_AUTORIZACAO: "webservices/NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_RET_AUTORIZACAO: "webservices/NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CADASTRO: "webservices/CadConsultaCadastro4/CadConsultaCadastro4.asmx?wsdl",  # noqa
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.svrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "nfce-homologacao.svrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
-        },
-    },
-}
-
-UFGO = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "nfe.sefaz.go.gov.br",
-        WS_NFE_INUTILIZACAO: "nfe/services/NFeInutilizacao4?wsdl",
-        WS_NFE_CONSULTA: "nfe/services/NFeConsultaProtocolo4?wsdl",
-        WS_NFE_SITUACAO: "nfe/services/NFeStatusServico4?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "nfe/services/NFeRecepcaoEvento4?wsdl",
-        WS_NFE_AUTORIZACAO: "nfe/services/NFeAutorizacao4?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "nfe/services/NFeRetAutorizacao4?wsdl",
-        WS_NFE_CADASTRO: "nfe/services/CadConsultaCadastro4?wsdl",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "homolog.sefaz.go.gov.br",
-        WS_NFE_INUTILIZACAO: "nfe/services/NFeInutilizacao4?wsdl",
-        WS_NFE_CONSULTA: "nfe/services/NFeConsultaProtocolo4?wsdl",
-        WS_NFE_SITUACAO: "nfe/services/NFeStatusServico4?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "nfe/services/NFeRecepcaoEvento4?wsdl",
-        WS_NFE_AUTORIZACAO: "nfe/services/NFeAutorizacao4?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "nfe/services/NFeRetAutorizacao4?wsdl",
-        WS_NFE_CADASTRO: "nfe/services/CadConsultaCadastro4?wsdl",
-    },
-}
-
-UFMT = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.sefaz.mt.gov.br",
-            WS_NFE_INUTILIZACAO: "nfews/v2/services/NfeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfews/v2/services/NfeConsulta4?wsdl",
-            WS_NFE_SITUACAO: "nfews/v2/services/NfeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "nfews/v2/services/RecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfews/v2/services/NfeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfews/v2/services/NfeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "nfews/v2/services/CadConsultaCadastro4?wsdl",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homologacao.sefaz.mt.gov.br",
-            WS_NFE_INUTILIZACAO: "nfews/v2/services/NfeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfews/v2/services/NfeConsulta4?wsdl",
-            WS_NFE_SITUACAO: "nfews/v2/services/NfeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "nfews/v2/services/RecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfews/v2/services/NfeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfews/v2/services/NfeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "nfews/v2/services/CadConsultaCadastro4?wsdl",
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.sefaz.mt.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "nfcews/services/RecepcaoEvento4",
-            WS_NFE_AUTORIZACAO: "nfcews/services/NfeAutorizacao4",
-            WS_NFE_RET_AUTORIZACAO: "nfcews/services/NfeRetAutorizacao4",
-            WS_NFE_INUTILIZACAO: "nfcews/services/NfeInutilizacao4",
-            WS_NFE_CONSULTA: "nfcews/services/NfeConsulta4",
-            WS_NFE_SITUACAO: "nfcews/services/NfeStatusServico4",
-            WS_NFCE_QR_CODE: "http://www.sefaz.mt.gov.br/nfce/consultanfce",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homologacao.sefaz.mt.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "nfcews/services/RecepcaoEvento4",
-            WS_NFE_AUTORIZACAO: "nfcews/services/NfeAutorizacao4",
-            WS_NFE_RET_AUTORIZACAO: "nfcews/services/NfeRetAutorizacao4",
-            WS_NFE_INUTILIZACAO: "nfcews/services/NfeInutilizacao4",
-            WS_NFE_CONSULTA: "nfcews/services/NfeConsulta4",
-            WS_NFE_SITUACAO: "nfcews/services/NfeStatusServico4",
-            WS_NFCE_QR_CODE: "http://www.sefaz.mt.gov.br/nfce/consultanfce",
-        },
-    },
-}
-
-UFMS = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.sefaz.ms.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4?wsdl",
-            WS_NFE_SITUACAO: "ws/NFeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "ws/CadConsultaCadastro4?wsdl",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "hom.nfe.sefaz.ms.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4?wsdl",
-            WS_NFE_SITUACAO: "ws/NFeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "ws/CadConsultaCadastro4?wsdl",
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.sefaz.ms.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4",
-            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4",
-            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4",
-            WS_NFE_CADASTRO: "CadConsultaCadastro4",
-            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4",
-            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4",
-            WS_NFE_SITUACAO: "ws/NFeStatusServico4",
-            WS_NFCE_QR_CODE: "www.dfe.ms.gov.br/nfce/qrcode?",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "hom.nfce.sefaz.ms.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4",
-            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4",
-            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4",
-            WS_NFE_CADASTRO: "ws/CadConsultaCadastro4",
-            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4",
-            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4",
-            WS_NFE_SITUACAO: "ws/NFeStatusServico4",
-            WS_NFCE_QR_CODE: "www.dfe.ms.gov.br/nfce/qrcode?",
-        },
-    },
-}
-
-UFMG = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "nfe.fazenda.mg.gov.br",
-        WS_NFE_INUTILIZACAO: "nfe2/services/NFeInutilizacao4?wsdl",
-        WS_NFE_CONSULTA: "nfe2/services/NFeConsultaProtocolo4?wsdl",
-        WS_NFE_SITUACAO: "nfe2/services/NFeStatusServico4?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "nfe2/services/NFeRecepcaoEvento4?wsdl",
-        WS_NFE_AUTORIZACAO: "nfe2/services/NFeAutorizacao4?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "nfe2/services/NFeRetAutorizacao4?wsdl",
-        WS_NFE_CADASTRO: "nfe2/services/CadConsultaCadastro4?wsdl",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "hnfe.fazenda.mg.gov.br",
-        WS_NFE_INUTILIZACAO: "nfe2/services/NFeInutilizacao4?wsdl",
-        WS_NFE_CONSULTA: "nfe2/services/NFeConsultaProtocolo4?wsdl",
-        WS_NFE_SITUACAO: "nfe2/services/NFeStatusServico4?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "nfe2/services/NFeRecepcaoEvento4?wsdl",
-        WS_NFE_AUTORIZACAO: "nfe2/services/NFeAutorizacao4?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "nfe2/services/NFeRetAutorizacao4?wsdl",
-        WS_NFE_CADASTRO: "nfe2/services/CadConsultaCadastro4?wsdl",
-    },
-}
-
-UFPR = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.sefa.pr.gov.br",
-            WS_NFE_INUTILIZACAO: "nfe/NFeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfe/NFeConsultaProtocolo4?wsdl",
-            WS_NFE_SITUACAO: "nfe/NFeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "nfe/NFeRecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfe/NFeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfe/NFeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "nfe/CadConsultaCadastro4?wsdl",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homologacao.nfe.sefa.pr.gov.br",
-            WS_NFE_INUTILIZACAO: "nfe/NFeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfe/NFeConsultaProtocolo4?wsdl",
-            WS_NFE_SITUACAO: "nfe/NFeStatusServico4?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "nfe/NFeRecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfe/NFeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfe/NFeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "nfe/CadConsultaCadastro4?wsdl",
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.sefa.pr.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "nfce/NFeRecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfce/NFeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfce/NFeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "nfce/CadConsultaCadastro4?wsdl",
-            WS_NFE_INUTILIZACAO: "nfce/NFeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfce/NFeConsultaProtocolo4?wsdl",
-            WS_NFE_SITUACAO: "nfce/NFeStatusServico4?wsdl",
-            WS_NFCE_QR_CODE: "www.fazenda.pr.gov.br/nfce/qrcode?",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homologacao.nfce.sefa.pr.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "nfce/NFeRecepcaoEvento4?wsdl",
-            WS_NFE_AUTORIZACAO: "nfce/NFeAutorizacao4?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "nfce/NFeRetAutorizacao4?wsdl",
-            WS_NFE_CADASTRO: "nfce/CadConsultaCadastro4?wsdl",
-            WS_NFE_INUTILIZACAO: "nfce/NFeInutilizacao4?wsdl",
-            WS_NFE_CONSULTA: "nfce/NFeConsultaProtocolo4?wsdl",
-            WS_NFE_SITUACAO: "nfce/NFeStatusServico4?wsdl",
-            WS_NFCE_QR_CODE: "www.fazenda.pr.gov.br/nfce/qrcode?",
-        },
-    },
-}
-
-UFPE = {
-    AMBIENTE_PRODUCAO: {
-        "servidor": "nfe.sefaz.pe.gov.br",
-        WS_NFE_INUTILIZACAO: "nfe-service/services/NFeInutilizacao4?wsdl",
-        WS_NFE_CONSULTA: "nfe-service/services/NFeConsultaProtocolo4?wsdl",
-        WS_NFE_SITUACAO: "nfe-service/services/NFeStatusServico4?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "nfe-service/services/NFeRecepcaoEvento4?wsdl",
-        WS_NFE_AUTORIZACAO: "nfe-service/services/NFeAutorizacao4?Wsdl",
-        WS_NFE_RET_AUTORIZACAO: "nfe-service/services/NFeRetAutorizacao4?wsdl",
-        WS_NFE_CADASTRO: "nfe-service/services/CadConsultaCadastro2?wsdl",
-    },
-    AMBIENTE_HOMOLOGACAO: {
-        "servidor": "nfehomolog.sefaz.pe.gov.br",
-        WS_NFE_INUTILIZACAO: "nfe-service/services/NFeInutilizacao4?wsdl",
-        WS_NFE_CONSULTA: "nfe-service/services/NFeConsultaProtocolo4?wsdl",
-        WS_NFE_SITUACAO: "nfe-service/services/NFeStatusServico4?wsdl",
-        WS_NFE_RECEPCAO_EVENTO: "nfe-service/services/NFeRecepcaoEvento4?wsdl",
-        WS_NFE_AUTORIZACAO: "nfe-service/services/NFeAutorizacao4?wsdl",
-        WS_NFE_RET_AUTORIZACAO: "nfe-service/services/NFeRetAutorizacao4?wsdl",
-        WS_NFE_CADASTRO: "nfe-service/services/CadConsultaCadastro2?wsdl",
-    },
-}
-
-UFRS = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.sefazrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "nfe-homologacao.sefazrs.rs.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.sefazrs.rs.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento.asmx",
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao.asmx",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao.asmx",  # noqa
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro2.asmx",  # noqa
-            WS_NFE_INUTILIZACAO: "ws/NfeInutilizacao/NfeInutilizacao2.asmx",
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta2.asmx",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico2.asmx",
-            WS_NFCE_QR_CODE: "https://www.sefaz.rs.gov.br/NFCE/NFCE-COM.aspx",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "nfce-homologacao.sefazrs.rs.gov.br",
-            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento.asmx",
-            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao.asmx",
-            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao.asmx",  # noqa
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro2.asmx",  # noqa
-            WS_NFE_INUTILIZACAO: "ws/NfeInutilizacao/NfeInutilizacao2.asmx",
-            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta2.asmx",
-            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico2.asmx",
-            WS_NFCE_QR_CODE: "https://www.sefaz.rs.gov.br/NFCE/NFCE-COM.aspx",
-        },
-    },
-}
-
-UFSP = {
-    NFE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfe.fazenda.sp.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/nfeconsultaprotocolo4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/nfestatusservico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/nferecepcaoevento4.asmx?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/nfeautorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/nferetautorizacao4.asmx?wsdl",
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro4.asmx?wsdl",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homologacao.nfe.fazenda.sp.gov.br",
-            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/nfeconsultaprotocolo4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/nfestatusservico4.asmx?wsdl",
-            WS_NFE_RECEPCAO_EVENTO: "ws/nferecepcaoevento4.asmx?wsdl",
-            WS_NFE_AUTORIZACAO: "ws/nfeautorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/nferetautorizacao4.asmx?wsdl",
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro4.asmx?wsdl",
-        },
-    },
-    NFCE_MODELO: {
-        AMBIENTE_PRODUCAO: {
-            "servidor": "nfce.fazenda.sp.gov.br",
-            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4.asmx?wsdl",
-            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NFeStatusServico4.asmx?wsdl",
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro2.asmx",
-            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4.asmx?wsdl",
-            WS_NFCE_QR_CODE: "",
-        },
-        AMBIENTE_HOMOLOGACAO: {
-            "servidor": "homologacao.nfce.fazenda.sp.gov.br",
-            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4.asmx?wsdl",
-            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4.asmx?wsdl",
-            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4.asmx?wsdl",
-            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4.asmx?wsdl",
-            WS_NFE_SITUACAO: "ws/NFeStatusServico4.asmx?wsdl",
-            WS_NFE_CADASTRO: "ws/cadconsultacadastro2.asmx",
-            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4.asmx?wsdl",
-            WS_NFCE_QR_CODE: "https://homologacao.nfce.fazenda.sp.gov.br/NFCEConsultaPublica/Paginas/ConstultaQRCode.aspx",
-        },
-    },
-}
-
-
-# Dicionário `ESTADO_WS` mapeia unidade federativa (UF) para uma tupla contendo
-# o serviço de webservices (WS) normal e o serviço de contingência.
-# Cada chave é uma sigla de UF e cada valor é uma tupla (servico_normal,
-# servico_contingencia). Exceção para a chave `AN` que representa o órgão de
-# Ambiente Nacional e não uma UF.
-ESTADO_WS = {
-    "AC": (SVRS, SVC_AN),
-    "AL": (SVRS, SVC_AN),
-    "AM": (UFAM, SVC_RS),
-    "AP": (SVRS, SVC_AN),
-    "BA": (UFBA, SVC_RS),
-    "CE": (SVRS, SVC_AN),
-    "DF": (SVRS, SVC_AN),
-    "ES": (SVRS, SVC_AN),
-    "GO": (UFGO, SVC_RS),
-    "MA": (SVAN, SVC_RS),
-    "MG": (UFMG, SVC_AN),
-    "MS": (UFMS, SVC_RS),
-    "MT": (UFMT, SVC_RS),
-    "PA": (SVRS, SVC_AN),
-    "PB": (SVRS, SVC_AN),
-    "PE": (UFPE, SVC_RS),
-    "PI": (SVRS, SVC_RS),
-    "PR": (UFPR, SVC_RS),
-    "RJ": (SVRS, SVC_AN),
-    "RN": (SVRS, SVC_AN),
-    "RO": (SVRS, SVC_AN),
-    "RR": (SVRS, SVC_AN),
-    "RS": (UFRS, SVC_AN),
-    "SC": (SVRS, SVC_AN),
-    "SE": (SVRS, SVC_AN),
-    "SP": (UFSP, SVC_AN),
-    "TO": (SVRS, SVC_AN),
-    "AN": (AN, AN),
-}
-
-
-def localizar_url(servico, estado, mod="55", ambiente=2, contingencia=False):
-    sigla = SIGLA_ESTADO[estado]
-
-    ws_normal, ws_contingencia = ESTADO_WS[sigla]
-    ws = ws_contingencia if contingencia else ws_normal
-
-    if servico in (WS_DFE_DISTRIBUICAO, WS_DOWNLOAD_NFE):
-        ws = AN
-
-    if mod in ws:
-        dominio = ws[mod][ambiente]["servidor"]
-        complemento = ws[mod][ambiente][servico]
-    else:
-        dominio = ws[ambiente]["servidor"]
-        complemento = ws[ambiente][servico]
-
-    if sigla == "RS" and servico == WS_NFE_CADASTRO:
-        dominio = "cad.sefazrs.rs.gov.br"
-    if sigla in ("AC", "RN", "PB", "SC", "RJ") and servico == WS_NFE_CADASTRO:
-        dominio = "cad.svrs.rs.gov.br"
-
-    return f"https://{dominio}/{complemento}"
-
-
 Metodo = collections.namedtuple("Metodo", ["webservice", "metodo"])
 
 METODO_WS = {
@@ -699,6 +99,31 @@ METODO_WS = {
 }
 
 
+# tpEmis das NF-e emitidas na SVC-AN e na SVC-RS
+TIPOS_EMISSAO_SVC = ("6", "7")
+
+
+def _reiniciar_sequencia_lote():
+    global _sequencia_lote
+    _sequencia_lote = itertools.count(secrets.randbelow(10**6))
+
+
+_reiniciar_sequencia_lote()
+if hasattr(os, "register_at_fork"):
+    # Processos filhos não devem repetir a sequência do processo pai
+    os.register_at_fork(after_in_child=_reiniciar_sequencia_lote)
+
+
+def gera_id_lote():
+    """idLote de 15 dígitos: 9 do horário em segundos e 6 de um contador
+    iniciado em um valor aleatório em cada processo, evitando a colisão de
+    lotes gerados no mesmo segundo, inclusive por processos diferentes"""
+    return "%09d%06d" % (
+        int(time.time()) % 10**9,
+        next(_sequencia_lote) % 10**6,
+    )
+
+
 class NFe(DocumentoEletronico):
     _namespace = "http://www.portalfiscal.inf.br/nfe"
     _edoc_situacao_arquivo_recebido_com_sucesso = "103"
@@ -711,6 +136,15 @@ class NFe(DocumentoEletronico):
 
     _maximo_tentativas_consulta_recibo = 5
 
+    # Limites do lote de envio (enviNFe)
+    _lote_maximo_documentos = 50
+    _lote_maximo_bytes = 500 * 1024
+
+    # Com True, consStatServ, consSitNFe, consReciNFe e distDFeInt são
+    # montados a partir dos esqueletos de erpbrasil.edoc.esqueletos em vez dos
+    # bindings do generateDS; o envio_raiz dos retornos passa a ser o elemento
+    esqueletos_xml = False
+
     def __init__(
         self,
         transmissao,
@@ -741,7 +175,7 @@ class NFe(DocumentoEletronico):
         utilizando atributos da instância como a unidade federativa (UF),
         o modelo (mod), o ambiente e a contingência.
         """
-        endpoint = localizar_url(
+        endpoint = self.registro_webservices.url(
             service,
             str(self.uf),
             self.mod,
@@ -750,17 +184,106 @@ class NFe(DocumentoEletronico):
         )
         return endpoint
 
+    def _url_autorizacao(self, contingencia):
+        return self.registro_webservices.url(
+            WS_NFE_AUTORIZACAO,
+            str(self.uf),
+            self.mod,
+            int(self.ambiente),
+            contingencia,
+        )
+
+    def em_contingencia(self):
+        """Indica se as emissões devem ser enviadas à SVC: contingência
+        informada na criação ou disjuntor do autorizador normal não fechado.
+
+        Apenas lê o estado do disjuntor; use `sondar_autorizador` para
+        verificar se o autorizador normal voltou. Enquanto for verdadeiro, as
+        NF-e devem ser geradas com o tpEmis retornado por `tipo_emissao`.
+        """
+        if self.contingencia:
+            return True
+        if self.disjuntores is None or self.mod != "55":
+            return False
+        return not self.disjuntores.obter(self._url_autorizacao(False)).fechado
+
+    def _disjuntor_sondagem(self):
+        """Disjuntor do autorizador normal, se uma sondagem estiver liberada"""
+        if self.contingencia or self.disjuntores is None or self.mod != "55":
+            return None
+        disjuntor = self.disjuntores.obter(self._url_autorizacao(False))
+        if disjuntor.fechado or not disjuntor.permite():
+            return None
+        return disjuntor
+
+    def sondar_autorizador(self):
+        """Consulta o status do autorizador normal quando o disjuntor estiver
+        aberto e o intervalo de sondagem tiver passado; o resultado é
+        registrado no disjuntor pelo `_post`.
+
+        :return: True se as NF-e puderem voltar a ser emitidas com tpEmis 1
+        """
+        disjuntor = self._disjuntor_sondagem()
+        if disjuntor is not None:
+            try:
+                self.status_servico()
+            except Exception:
+                disjuntor.registrar_falha()
+        return not self.em_contingencia()
+
+    def tipo_emissao(self):
+        """tpEmis das NF-e: 1 (normal), 6 (SVC-AN) ou 7 (SVC-RS)"""
+        if not self.em_contingencia():
+            return "1"
+        _, ws_contingencia = ESTADO_WS[SIGLA_ESTADO[str(self.uf)]]
+        return "6" if ws_contingencia is SVC_AN else "7"
+
+    def _contingencia_lote(self, xmls_assinados):
+        """Indica se o lote deve ser enviado à SVC, pelo tpEmis das NF-e.
+
+        Todas as NF-e do lote devem ter o mesmo tpEmis e, na contingência,
+        o tpEmis retornado por `tipo_emissao`.
+        """
+        if self.mod != "55":
+            return self.contingencia
+        tipos = {xml.findtext("{*}infNFe/{*}ide/{*}tpEmis") for xml in xmls_assinados}
+        if len(tipos) > 1:
+            raise ValueError(
+                "Lote com NF-e de tpEmis diferentes: "
+                + ", ".join(sorted(str(tipo) for tipo in tipos))
+            )
+        (tipo,) = tipos
+        esperado = self.tipo_emissao()
+        if (tipo in TIPOS_EMISSAO_SVC or esperado != "1") and tipo != esperado:
+            raise ValueError(
+                f"NF-e com tpEmis {tipo} não pode ser enviada: "
+                f"as emissões devem ser geradas com tpEmis {esperado}"
+            )
+        return tipo in TIPOS_EMISSAO_SVC
+
+    def _contingencia_envio(self, proc_envio):
+        """Indica se o lote foi enviado à SVC, onde o recibo é consultado"""
+        url = getattr(proc_envio, "url", None)
+        if not url or self.contingencia:
+            return self.contingencia
+        return url == self._url_autorizacao(True)
+
     def get_documento_id(self, edoc):
         return edoc.infNFe.Id[:3], edoc.infNFe.Id[3:]
 
     def status_servico(self):
-        raiz = retConsStatServ.TConsStatServ(
-            versao=self.versao,
-            tpAmb=self.ambiente,
-            cUF=self.uf,
-            xServ="STATUS",
-        )
-        raiz.original_tagname_ = "consStatServ"
+        if self.esqueletos_xml:
+            raiz = esqueletos.CONS_STAT_SERV.preencher(
+                self.versao, tpAmb=self.ambiente, cUF=self.uf
+            )
+        else:
+            raiz = retConsStatServ.TConsStatServ(
+                versao=self.versao,
+                tpAmb=self.ambiente,
+                cUF=self.uf,
+                xServ="STATUS",
+            )
+            raiz.original_tagname_ = "consStatServ"
         return self._post(
             raiz,
             # 'https://hom.sefazvirtual.fazenda.gov.br/NFeStatusServico4/NFeStatusServico4.asmx?wsdl',
@@ -770,22 +293,83 @@ class NFe(DocumentoEletronico):
         )
 
     def consulta_documento(self, chave):
+        return self._consulta_documento(chave, self._get_ws_endpoint(WS_NFE_CONSULTA))
+
+    def _consulta_documento(self, chave, url):
         # NfeConsultaProtocolo
-        raiz = retConsSitNFe.TConsSitNFe(
-            versao=self.versao,
-            tpAmb=self.ambiente,
-            xServ="CONSULTAR",
-            chNFe=chave,
-        )
-        raiz.original_tagname_ = "consSitNFe"
+        if self.esqueletos_xml:
+            raiz = esqueletos.CONS_SIT_NFE.preencher(
+                self.versao, tpAmb=self.ambiente, chNFe=chave
+            )
+        else:
+            raiz = retConsSitNFe.TConsSitNFe(
+                versao=self.versao,
+                tpAmb=self.ambiente,
+                xServ="CONSULTAR",
+                chNFe=chave,
+            )
+            raiz.original_tagname_ = "consSitNFe"
         return self._post(
             raiz,
             # 'https://hom.sefazvirtual.fazenda.gov.br/NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl',
-            self._get_ws_endpoint(WS_NFE_CONSULTA),
+            url,
             "nfeConsultaNF",
             retConsSitNFe,
         )
 
+    def _get_ws_endpoint_chave(self, service, chave):
+        """Endpoint do serviço para a UF e o modelo codificados na chave"""
+        return self.registro_webservices.url(
+            service, chave[:2], chave[20:22], int(self.ambiente), self.contingencia
+        )
+
+    def consulta_documentos(self, chaves, max_workers=8, max_por_endpoint=2):
+        """Consulta várias chaves em paralelo.
+
+        As chaves são agrupadas pelo endpoint de consulta da UF/modelo de
+        cada uma e distribuídas entre até `max_workers` threads, sem
+        ultrapassar `max_por_endpoint` consultas simultâneas no mesmo
+        webservice.
+
+        Uma consulta que falhar não interrompe as demais: no lugar do
+        RetornoSoap é entregue a exceção levantada.
+
+        :return: iterator de tuplas (chave, RetornoSoap ou exceção) na ordem
+        em que as consultas terminam
+        """
+        filas = collections.OrderedDict()
+        for chave in chaves:
+            url = self._get_ws_endpoint_chave(WS_NFE_CONSULTA, chave)
+            filas.setdefault(url, collections.deque()).append(chave)
+
+        em_andamento = {}
+        por_endpoint = collections.Counter()
+
+        def submeter(executor):
+            for url, fila in filas.items():
+                while (
+                    fila
+                    and por_endpoint[url] < max_por_endpoint
+                    and len(em_andamento) < max_workers
+                ):
+                    chave = fila.popleft()
+                    futuro = executor.submit(
+                        self._clonar()._consulta_documento, chave, url
+                    )
+                    em_andamento[futuro] = (chave, url)
+                    por_endpoint[url] += 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            submeter(executor)
+            while em_andamento:
+                concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    chave, url = em_andamento.pop(futuro)
+                    por_endpoint[url] -= 1
+                    erro = futuro.exception()
+                    yield chave, futuro.result() if erro is None else erro
+                submeter(executor)
+
     def envia_documento(self, edoc):
         """
 
@@ -796,20 +380,55 @@ class NFe(DocumentoEletronico):
         :param edoc:
         :return:
         """
-        xml_assinado = self.assina_raiz(edoc, edoc.infNFe.Id)
+        xml_assinado = self.assina_raiz_etree(edoc, edoc.infNFe.Id)
+        return self._envia_lote([xml_assinado])
+
+    def envia_lote(self, edocs):
+        """Assina e envia vários documentos, agrupados em lotes de no máximo
+        `_lote_maximo_documentos` NF-e e `_lote_maximo_bytes` bytes.
+
+        Lotes com mais de uma NF-e são sempre assíncronos. Use
+        `consulta_recibo` e `monta_processo(None, proc_envio, proc_recibo)`
+        para obter os processos de cada lote em `proc_recibo.processos`.
 
+        :return: iterator com o RetornoSoap de cada lote enviado
+        """
+        xmls_assinados = self.assina_lote_etree(
+            [(edoc, edoc.infNFe.Id) for edoc in edocs]
+        )
+        for lote in self._divide_lote(xmls_assinados):
+            yield self._envia_lote(lote)
+
+    def _divide_lote(self, xmls_assinados):
+        # Reserva para o enviNFe e o envelope SOAP
+        limite = self._lote_maximo_bytes - 2048
+        lote, tamanho = [], 0
+        for xml in xmls_assinados:
+            tamanho_xml = len(etree.tostring(xml))
+            if lote and (
+                len(lote) >= self._lote_maximo_documentos
+                or tamanho + tamanho_xml > limite
+            ):
+                yield lote
+                lote, tamanho = [], 0
+            lote.append(xml)
+            tamanho += tamanho_xml
+        if lote:
+            yield lote
+
+    def _envia_lote(self, xmls_assinados):
         raiz = retEnviNFe.TEnviNFe(
             versao=self.versao,
-            idLote=datetime.datetime.now().strftime("%Y%m%d%H%M%S"),
-            indSinc="1" if self.envio_sincrono else "0",
+            idLote=self._gera_numero_lote(),
+            indSinc="1" if self.envio_sincrono and len(xmls_assinados) == 1 else "0",
         )
         raiz.original_tagname_ = "enviNFe"
-        xml_envio_string, xml_envio_etree = self._generateds_to_string_etree(raiz)
-        xml_envio_etree.append(etree.fromstring(xml_assinado))
+        xml_envio_etree = self._generateds_to_etree(raiz)
+        xml_envio_etree.extend(xmls_assinados)
         return self._post(
             xml_envio_etree,
             # 'https://hom.sefazvirtual.fazenda.gov.br/NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl',
-            self._get_ws_endpoint(WS_NFE_AUTORIZACAO),
+            self._url_autorizacao(self._contingencia_lote(xmls_assinados)),
             "nfeAutorizacaoLote",
             retEnviNFe,
         )
@@ -818,9 +437,7 @@ class NFe(DocumentoEletronico):
         tinut = retInutNFe.TInutNFe(versao=self.versao, infInut=evento, Signature=None)
         tinut.original_tagname_ = "inutNFe"
 
-        xml_assinado = self.assina_raiz(tinut, tinut.infInut.Id)
-
-        xml_envio_etree = etree.fromstring(xml_assinado)
+        xml_envio_etree = self.assina_raiz_etree(tinut, tinut.infInut.Id)
 
         return self._post(
             xml_envio_etree,
@@ -836,15 +453,26 @@ class NFe(DocumentoEletronico):
         if not numero:
             return
 
-        raiz = retConsReciNFe.TConsReciNFe(
-            versao=self.versao,
-            tpAmb=self.ambiente,
-            nRec=numero,
-        )
-        raiz.original_tagname_ = "consReciNFe"
+        if self.esqueletos_xml:
+            raiz = esqueletos.CONS_RECI_NFE.preencher(
+                self.versao, tpAmb=self.ambiente, nRec=numero
+            )
+        else:
+            raiz = retConsReciNFe.TConsReciNFe(
+                versao=self.versao,
+                tpAmb=self.ambiente,
+                nRec=numero,
+            )
+            raiz.original_tagname_ = "consReciNFe"
         return self._post(
             raiz,
-            self._get_ws_endpoint(WS_NFE_RET_AUTORIZACAO),
+            self.registro_webservices.url(
+                WS_NFE_RET_AUTORIZACAO,
+                str(self.uf),
+                self.mod,
+                int(self.ambiente),
+                self._contingencia_envio(proc_envio),
+            ),
             # 'ws/nferetautorizacao4.asmx'
             "nfeRetAutorizacaoLote",
             retConsReciNFe,
@@ -856,16 +484,17 @@ class NFe(DocumentoEletronico):
 
         raiz = retEnvEvento.TEnvEvento(versao="1.00", idLote=numero_lote)
         raiz.original_tagname_ = "envEvento"
-        xml_envio_string, xml_envio_etree = self._generateds_to_string_etree(raiz)
+        xml_envio_etree = self._generateds_to_etree(raiz)
 
+        eventos = []
         for raiz_evento in lista_eventos:
             evento = retEnvEventoCancNFe.TEvento(
                 versao="1.00",
                 infEvento=raiz_evento,
             )
             evento.original_tagname_ = "evento"
-            xml_assinado = self.assina_raiz(evento, evento.infEvento.Id)
-            xml_envio_etree.append(etree.fromstring(xml_assinado))
+            eventos.append((evento, evento.infEvento.Id))
+        xml_envio_etree.extend(self.assina_lote_etree(eventos))
 
         return self._post(
             xml_envio_etree,
@@ -969,8 +598,13 @@ class NFe(DocumentoEletronico):
             self._edoc_situacao_arquivo_processado_com_sucesso,
         ]
 
+    def _tempo_espera(self, proc_envio):
+        return self._tempo_espera_estimado(
+            proc_envio, float(proc_envio.resposta.infRec.tMed)
+        )
+
     def _aguarda_tempo_medio(self, proc_envio):
-        time.sleep(float(proc_envio.resposta.infRec.tMed))
+        time.sleep(self._tempo_espera(proc_envio))
 
     def _edoc_situacao_em_processamento(self, proc_recibo):
         if proc_recibo.resposta.cStat == "105":
@@ -994,28 +628,47 @@ class NFe(DocumentoEletronico):
         if not ultimo_nsu and not nsu_especifico and not chave:
             return
 
-        distNSU = consNSU = consChNFe = None
-        if ultimo_nsu:
-            distNSU = distDFeInt.distNSUType(ultNSU=ultimo_nsu)
-        if nsu_especifico:
-            consNSU = distDFeInt.consNSUType(NSU=nsu_especifico)
-        if chave:
-            consChNFe = distDFeInt.consChNFeType(chNFe=chave)
-
-        if distNSU and consNSU or distNSU and consChNFe or consNSU and consChNFe:
+        consultas = [
+            (campo, valor)
+            for campo, valor in (
+                ("ultNSU", ultimo_nsu),
+                ("NSU", nsu_especifico),
+                ("chNFe", chave),
+            )
+            if valor
+        ]
+        if len(consultas) > 1:
             # TODO: Raise?
             return
 
-        raiz = distDFeInt.distDFeInt(
-            versao=self.versao,
-            tpAmb=self.ambiente,
-            cUFAutor=self.uf,
-            CNPJ=cnpj_cpf if len(cnpj_cpf) > 11 else None,
-            CPF=cnpj_cpf if len(cnpj_cpf) <= 11 else None,
-            distNSU=distNSU,
-            consNSU=consNSU,
-            consChNFe=consChNFe,
-        )
+        if self.esqueletos_xml:
+            documento = "CNPJ" if len(cnpj_cpf) > 11 else "CPF"
+            campo, valor = consultas[0]
+            raiz = esqueletos.DIST_DFE_INT[documento, campo].preencher(
+                self.versao,
+                tpAmb=self.ambiente,
+                cUFAutor=self.uf,
+                **{documento: cnpj_cpf, campo: valor},
+            )
+        else:
+            distNSU = consNSU = consChNFe = None
+            if ultimo_nsu:
+                distNSU = distDFeInt.distNSUType(ultNSU=ultimo_nsu)
+            if nsu_especifico:
+                consNSU = distDFeInt.consNSUType(NSU=nsu_especifico)
+            if chave:
+                consChNFe = distDFeInt.consChNFeType(chNFe=chave)
+
+            raiz = distDFeInt.distDFeInt(
+                versao=self.versao,
+                tpAmb=self.ambiente,
+                cUFAutor=self.uf,
+                CNPJ=cnpj_cpf if len(cnpj_cpf) > 11 else None,
+                CPF=cnpj_cpf if len(cnpj_cpf) <= 11 else None,
+                distNSU=distNSU,
+                consNSU=consNSU,
+                consChNFe=consChNFe,
+            )
 
         return self._post(
             raiz,
@@ -1025,34 +678,52 @@ class NFe(DocumentoEletronico):
         )
 
     def monta_processo(self, edoc, proc_envio, proc_recibo=None):
-        nfe = proc_envio.envio_raiz.find(
-            "{" + self._namespace + "}NFe"
-        )  # Se proc_envio for 'None', debugar o método 'analisar_retorno_raw'
+        """Monta o nfeProc de cada NF-e do lote com o protocolo de mesma chave.
+
+        Os processos ficam em `proc.processos`, indexados pela chave; para o
+        envio de um único documento também são preenchidos `proc.processo`,
+        `proc.processo_xml` e `proc.protocolo`.
+        """
+        # Se proc_envio for 'None', debugar o método 'analisar_retorno_raw'
+        documentos = {
+            nfe.find("{" + self._namespace + "}infNFe").get("Id")[3:]: nfe
+            for nfe in proc_envio.envio_raiz.iterfind("{" + self._namespace + "}NFe")
+        }
         if proc_recibo:
             protocolos = proc_recibo.resposta.protNFe
         else:
             # A falta do recibo indica envio no modo síncrono
             # o protocolo é recuperado diretamente da resposta do envio.
             protocolos = proc_envio.resposta.protNFe
-        if len(nfe) and protocolos:
+        if documentos and protocolos:
             if not isinstance(protocolos, list):
                 protocolos = [protocolos]
+            proc = proc_recibo if proc_recibo else proc_envio
+            proc.processos = {}
             for protocolo in protocolos:
+                nfe = documentos.get(protocolo.infProt.chNFe)
+                if nfe is None:
+                    continue
                 nfe_proc = retEnviNFe.TNfeProc(
                     versao=self.versao,
                     protNFe=protocolo,
                 )
                 nfe_proc.original_tagname_ = "nfeProc"
-                xml_file, nfe_proc = self._generateds_to_string_etree(nfe_proc)
+                nfe_proc = self._generateds_to_etree(nfe_proc)
                 prot_nfe = nfe_proc.find("{" + self._namespace + "}protNFe")
-                prot_nfe.addprevious(nfe)
-
-                proc = proc_recibo if proc_recibo else proc_envio
-                proc.processo = nfe_proc
-                proc.processo_xml = self._generateds_to_string_etree(nfe_proc)[0]
-                proc.protocolo = protocolo
+                # Copia para manter o XML enviado intacto
+                prot_nfe.addprevious(copy.deepcopy(nfe))
+
+                proc.processos[protocolo.infProt.chNFe] = nfe_proc
+                if len(documentos) == 1:
+                    proc.processo = nfe_proc
+                    proc.processo_xml = etree.tostring(nfe_proc)
+                    proc.protocolo = protocolo
             return True
 
+    def _gera_numero_lote(self):
+        return gera_id_lote()
+
     def monta_nfe_proc(self, nfe, prot_nfe):
         """
         Constrói e retorna o XML do processo da NF-e,
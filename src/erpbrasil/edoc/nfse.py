@@ -52,17 +52,13 @@ class NFSe(DocumentoEletronico):
             header_string = header.attrib.get("Versao")
 
         if header_string:
-            with self._transmissao.cliente(
-                urljoin(self._url, servico.endpoint)
-            ) as cliente:
+            with self._cliente(urljoin(self._url, servico.endpoint)) as cliente:
                 resposta = cliente.service[servico.operacao](
                     header_string,
                     body_string,
                 )
         else:
-            with self._transmissao.cliente(
-                urljoin(self._url, servico.endpoint)
-            ) as cliente:
+            with self._cliente(urljoin(self._url, servico.endpoint)) as cliente:
                 resposta = cliente.service[servico.operacao](
                     body_string,
                 )
@@ -71,8 +67,14 @@ class NFSe(DocumentoEletronico):
             servico.operacao, body, body_string, resposta, servico.classe_retorno
         )
 
+    def _tempo_espera(self, proc_envio):
+        return self._tempo_espera_estimado(proc_envio, self._tempo_medio)
+
+    def _chave_estimador(self):
+        return (self.cidade, "nfse", self.ambiente)
+
     def _aguarda_tempo_medio(self, proc_envio):
-        time.sleep(self._tempo_medio)
+        time.sleep(self._tempo_espera(proc_envio))
 
     def envia_documento(self, edoc):
         return self._post(
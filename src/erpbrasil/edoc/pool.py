@@ -0,0 +1,189 @@
+# License MIT
+
+import hashlib
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from zeep import Client
+
+from erpbrasil.assinatura.certificado import ArquivoCertificado
+
+from .wsdl import CACHE_WSDL, TransportCacheWSDL
+
+
+def contexto_ssl(certificado):
+    """SSLContext com o certificado cliente carregado.
+
+    Os arquivos temporários exigidos pelo ``load_cert_chain`` são apagados
+    logo após a leitura, de forma que a chave privada fique apenas em
+    memória. A verificação do servidor é definida por quem usa o contexto.
+    """
+    contexto = ssl.create_default_context()
+    contexto.check_hostname = False
+    contexto.verify_mode = ssl.CERT_NONE
+    with ArquivoCertificado(certificado, "w") as (cert, key):
+        contexto.load_cert_chain(cert, key)
+    return contexto
+
+
+class AdaptadorCertificado(HTTPAdapter):
+    """HTTPAdapter que autentica as conexões com um SSLContext já carregado,
+    dispensando o ``session.cert`` com caminhos de arquivos."""
+
+    def __init__(self, contexto, **kwargs):
+        self.contexto = contexto
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.contexto
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs["ssl_context"] = self.contexto
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+class EntradaPool:
+    """Cliente zeep mantido no pool."""
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+        self.criado_em = time.monotonic()
+        self.em_uso = 0
+        self.descartado = False
+
+    def fechar(self):
+        transport = getattr(self.cliente, "transport", None)
+        session = getattr(transport, "session", None)
+        if session is not None:
+            session.close()
+
+
+class PoolClientes:
+    """Pool LRU de clientes SOAP prontos, compartilhado pelo processo.
+
+    Os clientes são indexados pela URL do webservice e pela impressão digital
+    do certificado, evitando que o WSDL seja baixado e interpretado a cada
+    requisição; na criação, o WSDL já analisado é obtido do CacheWSDL.
+    Entradas mais antigas que ``ttl`` segundos são recriadas e, quando o pool
+    atinge ``tamanho_maximo``, a menos usada é descartada.
+    """
+
+    def __init__(self, tamanho_maximo=32, ttl=3600, cache_wsdl=CACHE_WSDL):
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self.cache_wsdl = cache_wsdl
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self._entradas = OrderedDict()
+        # SSLContext de cada certificado, compartilhado pelos clientes
+        self._contextos = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def impressao_digital(certificado):
+        return hashlib.sha256(certificado._cert).hexdigest()
+
+    def _expirado(self, entrada):
+        return bool(self.ttl) and time.monotonic() - entrada.criado_em > self.ttl
+
+    def _descartar(self, chave):
+        entrada = self._entradas.pop(chave)
+        entrada.descartado = True
+        self.descartes += 1
+        if not entrada.em_uso:
+            entrada.fechar()
+
+    def _criar_entrada(self, transmissao, url, verify):
+        transmissao.desativar_avisos()
+        session = Session()
+        session.mount(
+            "https://", AdaptadorCertificado(self._contexto(transmissao, verify))
+        )
+        session.verify = verify
+        transport = TransportCacheWSDL(
+            self.cache_wsdl,
+            session=session,
+            cache=getattr(transmissao, "_cache", None),
+        )
+        documento = self.cache_wsdl.documento(url, transport)
+        return EntradaPool(Client(documento, transport=transport))
+
+    def _contexto(self, transmissao, verify):
+        # O urllib3 ajusta o verify_mode do contexto a cada conexão, por isso
+        # ele só é compartilhado por sessões com o mesmo verify
+        chave = (self.impressao_digital(transmissao.certificado), verify)
+        with self._lock:
+            contexto = self._contextos.get(chave)
+        if contexto is None:
+            contexto = contexto_ssl(transmissao.certificado)
+            with self._lock:
+                contexto = self._contextos.setdefault(chave, contexto)
+        return contexto
+
+    def _obter(self, transmissao, url, verify):
+        chave = (url, self.impressao_digital(transmissao.certificado), verify)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and self._expirado(entrada):
+                self._descartar(chave)
+                entrada = None
+            if entrada is not None:
+                self.acertos += 1
+                self._entradas.move_to_end(chave)
+                entrada.em_uso += 1
+                return entrada
+            self.falhas += 1
+
+        # O download do WSDL acontece fora do lock para não bloquear
+        # requisições a outros webservices.
+        nova = self._criar_entrada(transmissao, url, verify)
+
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                # Outra thread criou o cliente enquanto aguardávamos.
+                nova.fechar()
+            else:
+                entrada = self._entradas[chave] = nova
+                while len(self._entradas) > self.tamanho_maximo:
+                    self._descartar(next(iter(self._entradas)))
+            entrada.em_uso += 1
+            return entrada
+
+    def _liberar(self, entrada):
+        with self._lock:
+            entrada.em_uso -= 1
+            if entrada.descartado and not entrada.em_uso:
+                entrada.fechar()
+
+    @contextmanager
+    def cliente(self, transmissao, url, verify=False):
+        entrada = self._obter(transmissao, url, verify)
+        try:
+            yield entrada.cliente
+        finally:
+            self._liberar(entrada)
+
+    def limpar(self):
+        with self._lock:
+            for chave in list(self._entradas):
+                self._descartar(chave)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes,
+                "tamanho": len(self._entradas),
+            }
+
+
+POOL_CLIENTES = PoolClientes()
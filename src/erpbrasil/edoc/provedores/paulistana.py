@@ -16,8 +16,6 @@ try:
         RetornoEnvioLoteRPS,
     )
 
-    from erpbrasil.assinatura.assinatura import Assinatura
-
     paulistana = True
 except ImportError:
     paulistana = False
@@ -69,7 +67,7 @@ class Paulistana(NFSe):
         )
 
     def _prepara_envia_documento(self, edoc):
-        assinador = Assinatura(self._transmissao.certificado)
+        assinador = self._assinador
         for rps in edoc.RPS:
             data = rps.Assinatura
             data_bytes = data.encode("ascii")
@@ -167,7 +165,7 @@ class Paulistana(NFSe):
             ],
         )
 
-        assinador = Assinatura(self._transmissao.certificado)
+        assinador = self._assinador
         for detalhe in raiz.Detalhe:
             data = detalhe.AssinaturaCancelamento
             data_bytes = data.encode("ascii")
@@ -186,6 +184,5 @@ class Paulistana(NFSe):
         return status, retorno_mensagem
 
     def assina_raiz(self, raiz, id, getchildren=False):
-        xml_string, xml_etree = self._generateds_to_string_etree(raiz)
-        xml_assinado = Assinatura(self._transmissao.certificado).assina_nfse(xml_etree)
-        return xml_assinado
+        xml_etree = self._generateds_to_etree(raiz)
+        return self._assinador.assina_nfse(xml_etree)
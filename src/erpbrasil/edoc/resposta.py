@@ -1,14 +1,18 @@
 # Copyright (C) 2018 - TODAY Luis Felipe Mileo - KMEE INFORMATICA LTDA
 # License MIT
 
+import copy
 import logging
-import re
+import time
+from contextlib import suppress
 
 from lxml import etree
 
-combined_pattern = re.compile(
-    r"<soap:Body>(.*?)</soap:Body>|<[a-zA-Z0-9:]*Body[^>]*>(.*?)</[a-zA-Z0-9:]*Body>"
-)
+from .esqueletos import ElementoEsqueleto
+
+with suppress(ImportError):
+    from xsdata.formats.dataclass.parsers import XmlParser
+    from xsdata.formats.dataclass.parsers.handlers import LxmlEventHandler
 
 
 class RetornoSoap:
@@ -18,28 +22,87 @@ class RetornoSoap:
         self.envio_xml = xml
         self.resposta = resposta
         self.retorno = retorno
+        self.recebido_em = time.monotonic()
+
+    @property
+    def envio_xml(self):
+        """XML enviado. Quando informado como elemento é serializado apenas
+        no primeiro acesso: em bytes se a raiz já era um elemento e em str se
+        era um objeto do generateDS ou um esqueleto, como no
+        `_generateds_to_string_etree`."""
+        if isinstance(self._envio_xml, etree._Element):
+            xml = self._envio_xml
+            if xml.getparent() is not None:
+                # Já anexado ao envelope SOAP; copia para não herdar os
+                # namespaces do envelope
+                xml = copy.deepcopy(xml)
+            if isinstance(self.envio_raiz, str):
+                self._envio_xml = self.envio_raiz
+            elif isinstance(self.envio_raiz, etree._Element) and not isinstance(
+                self.envio_raiz, ElementoEsqueleto
+            ):
+                self._envio_xml = etree.tostring(xml)
+            else:
+                self._envio_xml = etree.tostring(xml, encoding="unicode")
+        return self._envio_xml
+
+    @envio_xml.setter
+    def envio_xml(self, xml):
+        self._envio_xml = xml
+
+
+def _parser():
+    # Mesmo parser usado pelo parseString do generateDS, que ignora
+    # comentários e instruções de processamento; mantém os limites de
+    # tamanho do libxml2, como o generateDS
+    return etree.ETCompatXMLParser()
+
+
+def construir_binding(elemento, classe):
+    """Monta o binding da resposta diretamente a partir do elemento já
+    analisado, sem serializar e analisar o XML novamente.
+
+    :param classe: módulo gerado pelo generateDS ou classe do xsdata
+    """
+    if not hasattr(classe, "parseString"):
+        return XmlParser(handler=LxmlEventHandler).parse(elemento, classe)
+
+    classe.Validate_simpletypes_ = False
+    classe_raiz = None
+    if hasattr(classe, "GdsCollector_"):
+        _, classe_raiz = classe.get_root_tag(elemento)
+    if classe_raiz is None:
+        # Bindings de versões antigas do generateDS ou sem classe para a tag
+        return classe.parseString(etree.tostring(elemento), silence=True)
+    return classe_raiz.factory().build(elemento, gds_collector_=classe.GdsCollector_())
+
+
+def corpo_soap(retorno):
+    """Primeiro elemento do soap:Body da resposta, analisando os bytes
+    recebidos uma única vez. Retorna None quando não há Body."""
+    try:
+        envelope = etree.fromstring(retorno.content, parser=_parser())
+    except etree.XMLSyntaxError:
+        return None
+    body = next(envelope.iter("{*}Body"), None)
+    if body is None:
+        return None
+    return next(body.iterchildren(tag=etree.Element), None)
 
 
 def analisar_retorno_raw(operacao, raiz, xml, retorno, classe):
     retorno.raise_for_status()
-    match = re.search(combined_pattern, retorno.text.replace("\n", ""))
-    if match:
-        xml_resposta = match.group(1) or match.group(2)
-        xml_etree = etree.fromstring(xml_resposta)
+    xml_etree = corpo_soap(retorno)
+    if xml_etree is not None:
         resultado = xml_etree[0]
 
         nome_classe = classe.__name__.split(".")[-1]
-        xml_classe_tags = list(
-            filter(
-                lambda children: nome_classe in children.tag, xml_etree.findall(".//")
-            )
-        )
-        if xml_classe_tags:
-            resultado = xml_classe_tags[0]
+        for elemento in xml_etree.iterdescendants(tag=etree.Element):
+            if nome_classe in elemento.tag:
+                resultado = elemento
+                break
 
-        resultado = etree.tostring(resultado)
-        classe.Validate_simpletypes_ = False
-        resposta = classe.parseString(resultado, silence=True)
+        resposta = construir_binding(resultado, classe)
         return RetornoSoap(operacao, raiz, xml, retorno, resposta)
     else:
         logging.warning("'match' em 'analisar_retorno_raw' é None")
@@ -48,7 +111,7 @@ def analisar_retorno_raw(operacao, raiz, xml, retorno, classe):
 def analisar_retorno(operacao, raiz, xml, retorno, classe):
     resposta = False
     if retorno:
-        classe.Validate_simpletypes_ = False
-        resultado = etree.tostring(etree.fromstring(retorno.encode("utf-8")))
-        resposta = classe.parseString(resultado, silence=True)
+        resposta = construir_binding(
+            etree.fromstring(retorno.encode("utf-8"), parser=_parser()), classe
+        )
     return RetornoSoap(operacao, raiz, xml, retorno, resposta)
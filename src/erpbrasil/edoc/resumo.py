@@ -0,0 +1,161 @@
+# License MIT
+
+"""Registros compactos dos documentos recebidos pela distribuição de DF-e.
+
+Os campos usados na triagem são lidos diretamente do elemento lxml, que
+não é mantido no registro; o binding completo da nfelib só é montado, a
+partir do XML original, quando `binding()` for chamado.
+"""
+
+import abc
+from contextlib import suppress
+
+from lxml import etree
+
+from erpbrasil.edoc.resposta import _parser, construir_binding
+
+with suppress(ImportError):
+    from nfelib.nfe.bindings.v4_0 import NfeProc
+    from nfelib.nfe_dist_dfe.bindings.v1_0 import ResEvento, ResNfe
+
+NAMESPACE_NFE = "http://www.portalfiscal.inf.br/nfe"
+
+
+def _filhos(elemento, campos, destino):
+    """Copia para `destino` o texto dos filhos diretos listados em `campos`"""
+    for filho in elemento:
+        nome = filho.tag.rpartition("}")[2]
+        if nome in campos:
+            setattr(destino, nome, filho.text)
+
+
+class Resumo(abc.ABC):
+    __slots__ = ("nsu", "_xml")
+
+    campos = ()
+
+    def __init__(self, elemento, nsu=None, xml=None):
+        self.nsu = nsu
+        # Apenas os bytes do documento são guardados para o `binding`
+        self._xml = etree.tostring(elemento) if xml is None else xml
+        for campo in self.campos:
+            setattr(self, campo, None)
+        self._extrair(elemento)
+
+    def _extrair(self, elemento):
+        _filhos(elemento, self.campos, self)
+
+    @property
+    def cnpj_cpf(self):
+        return self.CNPJ or self.CPF
+
+    @abc.abstractmethod
+    def _classe_binding(self):
+        """Classe da nfelib do documento"""
+
+    def binding(self):
+        """Binding completo da nfelib, montado a partir do XML original"""
+        elemento = etree.fromstring(self._xml, _parser())
+        return construir_binding(elemento, self._classe_binding())
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.chNFe}>"
+
+
+class ResumoNFe(Resumo):
+    """resNFe: resumo de uma NF-e em que o CNPJ/CPF é destinatário"""
+
+    campos = (
+        "chNFe",
+        "CNPJ",
+        "CPF",
+        "xNome",
+        "IE",
+        "dhEmi",
+        "tpNF",
+        "vNF",
+        "digVal",
+        "dhRecbto",
+        "nProt",
+        "cSitNFe",
+    )
+    __slots__ = campos
+
+    def _classe_binding(self):
+        return ResNfe
+
+
+class ResumoEvento(Resumo):
+    """resEvento: resumo de um evento vinculado a uma NF-e de interesse"""
+
+    campos = (
+        "cOrgao",
+        "CNPJ",
+        "CPF",
+        "chNFe",
+        "dhEvento",
+        "tpEvento",
+        "nSeqEvento",
+        "xEvento",
+        "dhRecbto",
+        "nProt",
+    )
+    __slots__ = campos
+
+    def _classe_binding(self):
+        return ResEvento
+
+
+class ResumoProcNFe(Resumo):
+    """procNFe: NF-e completa com o protocolo de autorização"""
+
+    campos = (
+        "chNFe",
+        "CNPJ",
+        "CPF",
+        "xNome",
+        "IE",
+        "dhEmi",
+        "tpNF",
+        "vNF",
+        "dhRecbto",
+        "nProt",
+        "cStat",
+    )
+    __slots__ = campos
+
+    # Grupos do nfeProc que contém os campos, lidos com um único find cada
+    _grupos = (
+        ("{0}NFe/{0}infNFe/{0}ide", ("dhEmi", "tpNF")),
+        ("{0}NFe/{0}infNFe/{0}emit", ("CNPJ", "CPF", "xNome", "IE")),
+        ("{0}NFe/{0}infNFe/{0}total/{0}ICMSTot", ("vNF",)),
+        ("{0}protNFe/{0}infProt", ("chNFe", "dhRecbto", "nProt", "cStat")),
+    )
+
+    def _extrair(self, elemento):
+        prefixo = "{" + NAMESPACE_NFE + "}"
+        for caminho, campos in self._grupos:
+            grupo = elemento.find(caminho.format(prefixo))
+            if grupo is not None:
+                _filhos(grupo, campos, self)
+
+    def _classe_binding(self):
+        return NfeProc
+
+
+# Prefixo do atributo schema do docZip (ex.: resNFe_v1.01.xsd)
+RESUMOS = {
+    "resNFe": ResumoNFe,
+    "resEvento": ResumoEvento,
+    "procNFe": ResumoProcNFe,
+}
+
+
+def resumir(schema, elemento, nsu=None, xml=None):
+    """Registro do documento distribuído ou None para schemas sem resumo
+    (ex.: procEventoNFe). Informe em `xml` os bytes já disponíveis do
+    documento para que não seja serializado novamente."""
+    classe = RESUMOS.get(schema.partition("_")[0])
+    if classe is None:
+        return None
+    return classe(elemento, nsu, xml)
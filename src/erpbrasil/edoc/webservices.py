@@ -0,0 +1,1352 @@
+# Copyright (C) 2019  Luis Felipe Mileo - KMEE
+# License MIT
+
+"""Registro dos webservices da NF-e, NFC-e, CT-e, MDF-e e MD-e.
+
+Não depende dos bindings da nfelib, podendo ser importado isoladamente.
+"""
+
+import json
+import os
+from urllib.parse import urlsplit, urlunsplit
+
+WS_DFE_DISTRIBUICAO = "NFeDistribuicaoDFe"
+WS_DOWNLOAD_NFE = "nfeDistDFeInteresse"
+WS_NFCE_CONSULTA_DESTINADAS = "NfeConsultaDest"
+WS_NFCE_QR_CODE = "NfeQRCode"
+WS_NFCE_CONSULTA_PUBLICA = "NfceConsultaPublica"
+WS_NFE_AUTORIZACAO = "NfeAutorizacao"
+WS_NFE_CADASTRO = "NfeConsultaCadastro"
+
+WS_NFE_CONSULTA = "NfeConsultaProtocolo"
+WS_NFE_INUTILIZACAO = "NfeInutilizacao"
+WS_NFE_RECEPCAO_EVENTO = "RecepcaoEvento"
+WS_NFE_RET_AUTORIZACAO = "NfeRetAutorizacao"
+
+WS_NFE_SITUACAO = "NfeStatusServico"
+
+AMBIENTE_PRODUCAO = 1
+AMBIENTE_HOMOLOGACAO = 2
+
+NFE_MODELO = "55"
+NFCE_MODELO = "65"
+CTE_MODELOS = ("57", "67")
+MDFE_MODELO = "58"
+
+SIGLA_ESTADO = {
+    "12": "AC",
+    "27": "AL",
+    "13": "AM",
+    "16": "AP",
+    "29": "BA",
+    "23": "CE",
+    "53": "DF",
+    "32": "ES",
+    "52": "GO",
+    "21": "MA",
+    "31": "MG",
+    "50": "MS",
+    "51": "MT",
+    "15": "PA",
+    "25": "PB",
+    "26": "PE",
+    "22": "PI",
+    "41": "PR",
+    "33": "RJ",
+    "24": "RN",
+    "11": "RO",
+    "14": "RR",
+    "43": "RS",
+    "42": "SC",
+    "28": "SE",
+    "35": "SP",
+    "17": "TO",
+    "91": "AN",
+}
+
+# Sigla -> código IBGE da UF
+CODIGO_UF = {sigla: codigo for codigo, sigla in SIGLA_ESTADO.items()}
+
+SVRS = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.svrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "nfe-homologacao.svrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.svrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "nfce-homologacao.svrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
+        },
+    },
+}
+
+SVAN = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "www.sefazvirtual.fazenda.gov.br",
+        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
+        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
+        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "hom.sefazvirtual.fazenda.gov.br",
+        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
+        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
+        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+    },
+}
+
+SVC_AN = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "www.svc.fazenda.gov.br",
+        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
+        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
+        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "hom.sefazvirtual.fazenda.gov.br",
+        WS_NFE_INUTILIZACAO: "NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",
+        WS_NFE_CONSULTA: "NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
+        WS_NFE_SITUACAO: "NFeStatusServico4/NFeStatusServico4.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+        WS_NFE_AUTORIZACAO: "NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+    },
+}
+
+SVC_RS = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "nfe.svrs.rs.gov.br",
+        WS_NFE_RECEPCAO_EVENTO: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+        WS_NFE_AUTORIZACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
+        WS_NFE_CONSULTA: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+        WS_NFE_SITUACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "nfe-homologacao.svrs.rs.gov.br",
+        WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+        WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
+        WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+    },
+}
+
+AN = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "www1.nfe.fazenda.gov.br",
+        WS_DFE_DISTRIBUICAO: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
+        WS_DOWNLOAD_NFE: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "hom1.nfe.fazenda.gov.br",
+        WS_DFE_DISTRIBUICAO: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
+        WS_DOWNLOAD_NFE: "NFeDistribuicaoDFe/NFeDistribuicaoDFe.asmx?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?Wsdl",  # noqa
+    },
+}
+
+UFAM = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.sefaz.am.gov.br",
+            WS_NFE_INUTILIZACAO: "services2/services/NfeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "services2/services/NfeConsulta4?wsdl",
+            WS_NFE_SITUACAO: "services2/services/NfeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "services2/services/RecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "services2/services/NfeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "services2/services/NfeRetAutorizacao4?wsdl",  # noqa
+            WS_NFE_CADASTRO: "services2/services/cadconsultacadastro2?wsdl",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homnfe.sefaz.am.gov.br",
+            WS_NFE_INUTILIZACAO: "services2/services/NfeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "services2/services/NfeConsulta4?wsdl",
+            WS_NFE_SITUACAO: "services2/services/NfeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "services2/services/RecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "services2/services/NfeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "services2/services/NfeRetAutorizacao4?wsdl",  # noqa
+            WS_NFE_CADASTRO: "services2/services/cadconsultacadastro2?wsdl",
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.sefaz.am.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "nfce-services/services/RecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfce-services/services/NfeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfce-services/services/NfeRetAutorizacao4?wsdl",
+            WS_NFE_INUTILIZACAO: "nfce-services/services/NfeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfce-services/services/NfeConsulta4?wsdl",
+            WS_NFE_SITUACAO: "nfce-services/services/NfeStatusServico4?wsdl",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homnfce.sefaz.am.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "nfce-services/services/RecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfce-services/services/NfeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfce-services/services/NfeRetAutorizacao4?wsdl",
+            WS_NFE_INUTILIZACAO: "nfce-services/services/NfeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfce-services/services/NfeConsulta4?wsdl",
+            WS_NFE_SITUACAO: "nfce-services/services/NfeStatusServico4?wsdl",
+            WS_NFCE_QR_CODE: "http://homnfce.sefaz.am.gov.br/nfceweb/consultarNFCe.jsp",
+        },
+    },
+}
+
+UFBA = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.sefaz.ba.gov.br",
+            WS_NFE_INUTILIZACAO: "webservices/NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CONSULTA: "webservices/NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
+            WS_NFE_SITUACAO: "webservices/NFeStatusServico4/NFeStatusServico4.asmx?wsdl",  # noqa
+            WS_NFE_RECEPCAO_EVENTO: "webservices/NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+            WS_NFE_AUTORIZACAO: "webservices/NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_RET_AUTORIZACAO: "webservices/NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CADASTRO: "webservices/CadConsultaCadastro4/CadConsultaCadastro4.asmx?wsdl",  # noqa
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "hnfe.sefaz.ba.gov.br",
+            WS_NFE_INUTILIZACAO: "webservices/NFeInutilizacao4/NFeInutilizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CONSULTA: "webservices/NFeConsultaProtocolo4/NFeConsultaProtocolo4.asmx?wsdl",  # noqa
+            WS_NFE_SITUACAO: "webservices/NFeStatusServico4/NFeStatusServico4.asmx?wsdl",  # noqa
+            WS_NFE_RECEPCAO_EVENTO: "webservices/NFeRecepcaoEvento4/NFeRecepcaoEvento4.asmx?wsdl",  # noqa
+            WS_NFE_AUTORIZACAO: "webservices/NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_RET_AUTORIZACAO: "webservices/NFeRetAutorizacao4/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CADASTRO: "webservices/CadConsultaCadastro4/CadConsultaCadastro4.asmx?wsdl",  # noqa
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.svrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "nfce-homologacao.svrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFCE_QR_CODE: "http://dec.fazenda.df.gov.br/ConsultarNFCe.aspx?",
+        },
+    },
+}
+
+UFGO = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "nfe.sefaz.go.gov.br",
+        WS_NFE_INUTILIZACAO: "nfe/services/NFeInutilizacao4?wsdl",
+        WS_NFE_CONSULTA: "nfe/services/NFeConsultaProtocolo4?wsdl",
+        WS_NFE_SITUACAO: "nfe/services/NFeStatusServico4?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "nfe/services/NFeRecepcaoEvento4?wsdl",
+        WS_NFE_AUTORIZACAO: "nfe/services/NFeAutorizacao4?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "nfe/services/NFeRetAutorizacao4?wsdl",
+        WS_NFE_CADASTRO: "nfe/services/CadConsultaCadastro4?wsdl",
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "homolog.sefaz.go.gov.br",
+        WS_NFE_INUTILIZACAO: "nfe/services/NFeInutilizacao4?wsdl",
+        WS_NFE_CONSULTA: "nfe/services/NFeConsultaProtocolo4?wsdl",
+        WS_NFE_SITUACAO: "nfe/services/NFeStatusServico4?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "nfe/services/NFeRecepcaoEvento4?wsdl",
+        WS_NFE_AUTORIZACAO: "nfe/services/NFeAutorizacao4?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "nfe/services/NFeRetAutorizacao4?wsdl",
+        WS_NFE_CADASTRO: "nfe/services/CadConsultaCadastro4?wsdl",
+    },
+}
+
+UFMT = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.sefaz.mt.gov.br",
+            WS_NFE_INUTILIZACAO: "nfews/v2/services/NfeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfews/v2/services/NfeConsulta4?wsdl",
+            WS_NFE_SITUACAO: "nfews/v2/services/NfeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "nfews/v2/services/RecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfews/v2/services/NfeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfews/v2/services/NfeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "nfews/v2/services/CadConsultaCadastro4?wsdl",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homologacao.sefaz.mt.gov.br",
+            WS_NFE_INUTILIZACAO: "nfews/v2/services/NfeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfews/v2/services/NfeConsulta4?wsdl",
+            WS_NFE_SITUACAO: "nfews/v2/services/NfeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "nfews/v2/services/RecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfews/v2/services/NfeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfews/v2/services/NfeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "nfews/v2/services/CadConsultaCadastro4?wsdl",
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.sefaz.mt.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "nfcews/services/RecepcaoEvento4",
+            WS_NFE_AUTORIZACAO: "nfcews/services/NfeAutorizacao4",
+            WS_NFE_RET_AUTORIZACAO: "nfcews/services/NfeRetAutorizacao4",
+            WS_NFE_INUTILIZACAO: "nfcews/services/NfeInutilizacao4",
+            WS_NFE_CONSULTA: "nfcews/services/NfeConsulta4",
+            WS_NFE_SITUACAO: "nfcews/services/NfeStatusServico4",
+            WS_NFCE_QR_CODE: "http://www.sefaz.mt.gov.br/nfce/consultanfce",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homologacao.sefaz.mt.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "nfcews/services/RecepcaoEvento4",
+            WS_NFE_AUTORIZACAO: "nfcews/services/NfeAutorizacao4",
+            WS_NFE_RET_AUTORIZACAO: "nfcews/services/NfeRetAutorizacao4",
+            WS_NFE_INUTILIZACAO: "nfcews/services/NfeInutilizacao4",
+            WS_NFE_CONSULTA: "nfcews/services/NfeConsulta4",
+            WS_NFE_SITUACAO: "nfcews/services/NfeStatusServico4",
+            WS_NFCE_QR_CODE: "http://www.sefaz.mt.gov.br/nfce/consultanfce",
+        },
+    },
+}
+
+UFMS = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.sefaz.ms.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4?wsdl",
+            WS_NFE_SITUACAO: "ws/NFeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "ws/CadConsultaCadastro4?wsdl",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "hom.nfe.sefaz.ms.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4?wsdl",
+            WS_NFE_SITUACAO: "ws/NFeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "ws/CadConsultaCadastro4?wsdl",
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.sefaz.ms.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4",
+            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4",
+            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4",
+            WS_NFE_CADASTRO: "CadConsultaCadastro4",
+            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4",
+            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4",
+            WS_NFE_SITUACAO: "ws/NFeStatusServico4",
+            WS_NFCE_QR_CODE: "www.dfe.ms.gov.br/nfce/qrcode?",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "hom.nfce.sefaz.ms.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4",
+            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4",
+            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4",
+            WS_NFE_CADASTRO: "ws/CadConsultaCadastro4",
+            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4",
+            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4",
+            WS_NFE_SITUACAO: "ws/NFeStatusServico4",
+            WS_NFCE_QR_CODE: "www.dfe.ms.gov.br/nfce/qrcode?",
+        },
+    },
+}
+
+UFMG = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "nfe.fazenda.mg.gov.br",
+        WS_NFE_INUTILIZACAO: "nfe2/services/NFeInutilizacao4?wsdl",
+        WS_NFE_CONSULTA: "nfe2/services/NFeConsultaProtocolo4?wsdl",
+        WS_NFE_SITUACAO: "nfe2/services/NFeStatusServico4?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "nfe2/services/NFeRecepcaoEvento4?wsdl",
+        WS_NFE_AUTORIZACAO: "nfe2/services/NFeAutorizacao4?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "nfe2/services/NFeRetAutorizacao4?wsdl",
+        WS_NFE_CADASTRO: "nfe2/services/CadConsultaCadastro4?wsdl",
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "hnfe.fazenda.mg.gov.br",
+        WS_NFE_INUTILIZACAO: "nfe2/services/NFeInutilizacao4?wsdl",
+        WS_NFE_CONSULTA: "nfe2/services/NFeConsultaProtocolo4?wsdl",
+        WS_NFE_SITUACAO: "nfe2/services/NFeStatusServico4?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "nfe2/services/NFeRecepcaoEvento4?wsdl",
+        WS_NFE_AUTORIZACAO: "nfe2/services/NFeAutorizacao4?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "nfe2/services/NFeRetAutorizacao4?wsdl",
+        WS_NFE_CADASTRO: "nfe2/services/CadConsultaCadastro4?wsdl",
+    },
+}
+
+UFPR = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.sefa.pr.gov.br",
+            WS_NFE_INUTILIZACAO: "nfe/NFeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfe/NFeConsultaProtocolo4?wsdl",
+            WS_NFE_SITUACAO: "nfe/NFeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "nfe/NFeRecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfe/NFeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfe/NFeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "nfe/CadConsultaCadastro4?wsdl",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homologacao.nfe.sefa.pr.gov.br",
+            WS_NFE_INUTILIZACAO: "nfe/NFeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfe/NFeConsultaProtocolo4?wsdl",
+            WS_NFE_SITUACAO: "nfe/NFeStatusServico4?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "nfe/NFeRecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfe/NFeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfe/NFeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "nfe/CadConsultaCadastro4?wsdl",
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.sefa.pr.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "nfce/NFeRecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfce/NFeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfce/NFeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "nfce/CadConsultaCadastro4?wsdl",
+            WS_NFE_INUTILIZACAO: "nfce/NFeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfce/NFeConsultaProtocolo4?wsdl",
+            WS_NFE_SITUACAO: "nfce/NFeStatusServico4?wsdl",
+            WS_NFCE_QR_CODE: "www.fazenda.pr.gov.br/nfce/qrcode?",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homologacao.nfce.sefa.pr.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "nfce/NFeRecepcaoEvento4?wsdl",
+            WS_NFE_AUTORIZACAO: "nfce/NFeAutorizacao4?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "nfce/NFeRetAutorizacao4?wsdl",
+            WS_NFE_CADASTRO: "nfce/CadConsultaCadastro4?wsdl",
+            WS_NFE_INUTILIZACAO: "nfce/NFeInutilizacao4?wsdl",
+            WS_NFE_CONSULTA: "nfce/NFeConsultaProtocolo4?wsdl",
+            WS_NFE_SITUACAO: "nfce/NFeStatusServico4?wsdl",
+            WS_NFCE_QR_CODE: "www.fazenda.pr.gov.br/nfce/qrcode?",
+        },
+    },
+}
+
+UFPE = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "nfe.sefaz.pe.gov.br",
+        WS_NFE_INUTILIZACAO: "nfe-service/services/NFeInutilizacao4?wsdl",
+        WS_NFE_CONSULTA: "nfe-service/services/NFeConsultaProtocolo4?wsdl",
+        WS_NFE_SITUACAO: "nfe-service/services/NFeStatusServico4?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "nfe-service/services/NFeRecepcaoEvento4?wsdl",
+        WS_NFE_AUTORIZACAO: "nfe-service/services/NFeAutorizacao4?Wsdl",
+        WS_NFE_RET_AUTORIZACAO: "nfe-service/services/NFeRetAutorizacao4?wsdl",
+        WS_NFE_CADASTRO: "nfe-service/services/CadConsultaCadastro2?wsdl",
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "nfehomolog.sefaz.pe.gov.br",
+        WS_NFE_INUTILIZACAO: "nfe-service/services/NFeInutilizacao4?wsdl",
+        WS_NFE_CONSULTA: "nfe-service/services/NFeConsultaProtocolo4?wsdl",
+        WS_NFE_SITUACAO: "nfe-service/services/NFeStatusServico4?wsdl",
+        WS_NFE_RECEPCAO_EVENTO: "nfe-service/services/NFeRecepcaoEvento4?wsdl",
+        WS_NFE_AUTORIZACAO: "nfe-service/services/NFeAutorizacao4?wsdl",
+        WS_NFE_RET_AUTORIZACAO: "nfe-service/services/NFeRetAutorizacao4?wsdl",
+        WS_NFE_CADASTRO: "nfe-service/services/CadConsultaCadastro2?wsdl",
+    },
+}
+
+UFRS = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.sefazrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "nfe-homologacao.sefazrs.rs.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao/nfeinutilizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento4.asmx?wsdl",  # noqa
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao4.asmx?wsdl",  # noqa
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro4.asmx?wsdl",  # noqa
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.sefazrs.rs.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento.asmx",
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao.asmx",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao.asmx",  # noqa
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro2.asmx",  # noqa
+            WS_NFE_INUTILIZACAO: "ws/NfeInutilizacao/NfeInutilizacao2.asmx",
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta2.asmx",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico2.asmx",
+            WS_NFCE_QR_CODE: "https://www.sefaz.rs.gov.br/NFCE/NFCE-COM.aspx",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "nfce-homologacao.sefazrs.rs.gov.br",
+            WS_NFE_RECEPCAO_EVENTO: "ws/recepcaoevento/recepcaoevento.asmx",
+            WS_NFE_AUTORIZACAO: "ws/NfeAutorizacao/NFeAutorizacao.asmx",
+            WS_NFE_RET_AUTORIZACAO: "ws/NfeRetAutorizacao/NFeRetAutorizacao.asmx",  # noqa
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro/cadconsultacadastro2.asmx",  # noqa
+            WS_NFE_INUTILIZACAO: "ws/NfeInutilizacao/NfeInutilizacao2.asmx",
+            WS_NFE_CONSULTA: "ws/NfeConsulta/NfeConsulta2.asmx",
+            WS_NFE_SITUACAO: "ws/NfeStatusServico/NfeStatusServico2.asmx",
+            WS_NFCE_QR_CODE: "https://www.sefaz.rs.gov.br/NFCE/NFCE-COM.aspx",
+        },
+    },
+}
+
+UFSP = {
+    NFE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfe.fazenda.sp.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/nfeconsultaprotocolo4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/nfestatusservico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/nferecepcaoevento4.asmx?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/nfeautorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/nferetautorizacao4.asmx?wsdl",
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro4.asmx?wsdl",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homologacao.nfe.fazenda.sp.gov.br",
+            WS_NFE_INUTILIZACAO: "ws/nfeinutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/nfeconsultaprotocolo4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/nfestatusservico4.asmx?wsdl",
+            WS_NFE_RECEPCAO_EVENTO: "ws/nferecepcaoevento4.asmx?wsdl",
+            WS_NFE_AUTORIZACAO: "ws/nfeautorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/nferetautorizacao4.asmx?wsdl",
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro4.asmx?wsdl",
+        },
+    },
+    NFCE_MODELO: {
+        AMBIENTE_PRODUCAO: {
+            "servidor": "nfce.fazenda.sp.gov.br",
+            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4.asmx?wsdl",
+            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NFeStatusServico4.asmx?wsdl",
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro2.asmx",
+            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4.asmx?wsdl",
+            WS_NFCE_QR_CODE: "",
+        },
+        AMBIENTE_HOMOLOGACAO: {
+            "servidor": "homologacao.nfce.fazenda.sp.gov.br",
+            WS_NFE_AUTORIZACAO: "ws/NFeAutorizacao4.asmx?wsdl",
+            WS_NFE_RET_AUTORIZACAO: "ws/NFeRetAutorizacao4.asmx?wsdl",
+            WS_NFE_INUTILIZACAO: "ws/NFeInutilizacao4.asmx?wsdl",
+            WS_NFE_CONSULTA: "ws/NFeConsultaProtocolo4.asmx?wsdl",
+            WS_NFE_SITUACAO: "ws/NFeStatusServico4.asmx?wsdl",
+            WS_NFE_CADASTRO: "ws/cadconsultacadastro2.asmx",
+            WS_NFE_RECEPCAO_EVENTO: "ws/NFeRecepcaoEvento4.asmx?wsdl",
+            WS_NFCE_QR_CODE: "https://homologacao.nfce.fazenda.sp.gov.br/NFCEConsultaPublica/Paginas/ConstultaQRCode.aspx",
+        },
+    },
+}
+
+
+# Dicionário `ESTADO_WS` mapeia unidade federativa (UF) para uma tupla contendo
+# o serviço de webservices (WS) normal e o serviço de contingência.
+# Cada chave é uma sigla de UF e cada valor é uma tupla (servico_normal,
+# servico_contingencia). Exceção para a chave `AN` que representa o órgão de
+# Ambiente Nacional e não uma UF.
+ESTADO_WS = {
+    "AC": (SVRS, SVC_AN),
+    "AL": (SVRS, SVC_AN),
+    "AM": (UFAM, SVC_RS),
+    "AP": (SVRS, SVC_AN),
+    "BA": (UFBA, SVC_RS),
+    "CE": (SVRS, SVC_AN),
+    "DF": (SVRS, SVC_AN),
+    "ES": (SVRS, SVC_AN),
+    "GO": (UFGO, SVC_RS),
+    "MA": (SVAN, SVC_RS),
+    "MG": (UFMG, SVC_AN),
+    "MS": (UFMS, SVC_RS),
+    "MT": (UFMT, SVC_RS),
+    "PA": (SVRS, SVC_AN),
+    "PB": (SVRS, SVC_AN),
+    "PE": (UFPE, SVC_RS),
+    "PI": (SVRS, SVC_RS),
+    "PR": (UFPR, SVC_RS),
+    "RJ": (SVRS, SVC_AN),
+    "RN": (SVRS, SVC_AN),
+    "RO": (SVRS, SVC_AN),
+    "RR": (SVRS, SVC_AN),
+    "RS": (UFRS, SVC_AN),
+    "SC": (SVRS, SVC_AN),
+    "SE": (SVRS, SVC_AN),
+    "SP": (UFSP, SVC_AN),
+    "TO": (SVRS, SVC_AN),
+    "AN": (AN, AN),
+}
+
+
+def _resolver_url(servico, estado, mod="55", ambiente=2, contingencia=False):
+    sigla = SIGLA_ESTADO[estado]
+
+    ws_normal, ws_contingencia = ESTADO_WS[sigla]
+    ws = ws_contingencia if contingencia else ws_normal
+
+    if servico in (WS_DFE_DISTRIBUICAO, WS_DOWNLOAD_NFE):
+        ws = AN
+
+    if mod in ws:
+        dominio = ws[mod][ambiente]["servidor"]
+        complemento = ws[mod][ambiente][servico]
+    else:
+        dominio = ws[ambiente]["servidor"]
+        complemento = ws[ambiente][servico]
+
+    if sigla == "RS" and servico == WS_NFE_CADASTRO:
+        dominio = "cad.sefazrs.rs.gov.br"
+    if sigla in ("AC", "RN", "PB", "SC", "RJ") and servico == WS_NFE_CADASTRO:
+        dominio = "cad.svrs.rs.gov.br"
+
+    return f"https://{dominio}/{complemento}"
+
+
+# NFC-e
+
+NFCE_AMBIENTE_PRODUCAO = "1"
+NFCE_AMBIENTE_HOMOLOGACAO = "2"
+
+ESTADO_QRCODE = {
+    "AC": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.sefaznet.ac.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.hml.sefaznet.ac.gov.br/nfce/qrcode?p=",
+    },
+    "AL": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfce.sefaz.al.gov.br/QRCode/consultarNFCe.jsp?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://nfce.sefaz.al.gov.br/QRCode/consultarNFCe.jsp?p=",
+    },
+    "AM": {
+        NFCE_AMBIENTE_PRODUCAO: "http://sistemas.sefaz.am.gov.br/nfceweb/consultarNFCe.jsp?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homnfce.sefaz.am.gov.br/nfceweb/consultarNFCe.jsp?p=",
+    },
+    "AP": {
+        NFCE_AMBIENTE_PRODUCAO: "https://www.sefaz.ap.gov.br/nfce/nfcep.php?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://www.sefaz.ap.gov.br/nfcehml/nfce.php?p=",
+    },
+    "BA": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfe.sefaz.ba.gov.br/servicos/nfce/qrcode.aspx?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://hnfe.sefaz.ba.gov.br/servicos/nfce/qrcode.aspx?p=",
+    },
+    "CE": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfce.sefaz.ce.gov.br/pages/ShowNFCe.html?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://nfceh.sefaz.ce.gov.br/pages/ShowNFCe.html?p=",
+    },
+    "DF": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.fazenda.df.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.fazenda.df.gov.br/nfce/qrcode?p=",
+    },
+    "ES": {
+        NFCE_AMBIENTE_PRODUCAO: "http://app.sefaz.es.gov.br/ConsultaNFCe?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homologacao.sefaz.es.gov.br/ConsultaNFCe?p=",
+    },
+    "GO": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfe.sefaz.go.gov.br/nfeweb/sites/nfce/danfeNFCe?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homolog.sefaz.go.gov.br/nfeweb/sites/nfce/danfeNFCe?p=",
+    },
+    "MA": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfce.sefaz.ma.gov.br/portal/consultarNFCe.jsp?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homologacao.sefaz.ma.gov.br/portal/consultarNFCe.jsp?p=",
+    },
+    "MG": {
+        NFCE_AMBIENTE_PRODUCAO: "https://portalsped.fazenda.mg.gov.br/portalnfce/sistema/qrcode.xhtml?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://portalsped.fazenda.mg.gov.br/portalnfce/sistema/qrcode.xhtml?p=",
+    },
+    "MS": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.dfe.ms.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.dfe.ms.gov.br/nfce/qrcode?p=",
+    },
+    "MT": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.sefaz.mt.gov.br/nfce/consultanfce?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homologacao.sefaz.mt.gov.br/nfce/consultanfce?p=",
+    },
+    "PA": {
+        NFCE_AMBIENTE_PRODUCAO: "https://appnfc.sefa.pa.gov.br/portal/view/consultas/nfce/nfceForm.seam?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://appnfc.sefa.pa.gov.br/portal-homologacao/view/consultas/nfce/nfceForm.seam?p=",
+    },
+    "PB": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.sefaz.pb.gov.br/nfce?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.sefaz.pb.gov.br/nfcehom?p=",
+    },
+    "PE": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfce.sefaz.pe.gov.br/nfce/consulta?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://nfcehomolog.sefaz.pe.gov.br/nfce/consulta?p=",
+    },
+    "PI": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.sefaz.pi.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.sefaz.pi.gov.br/nfce/qrcode?p=",
+    },
+    "PR": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.fazenda.pr.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.fazenda.pr.gov.br/nfce/qrcode?p=",
+    },
+    "RJ": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www4.fazenda.rj.gov.br/consultaNFCe/QRCode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www4.fazenda.rj.gov.br/consultaNFCe/QRCode?p=",
+    },
+    "RN": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfce.set.rn.gov.br/consultarNFCe.aspx?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://hom.nfce.set.rn.gov.br/consultarNFCe.aspx?p=",
+    },
+    "RO": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.nfce.sefin.ro.gov.br/consultanfce/consulta.jsp?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.nfce.sefin.ro.gov.br/consultanfce/consulta.jsp?p=",
+    },
+    "RR": {
+        NFCE_AMBIENTE_PRODUCAO: "https://www.sefaz.rr.gov.br/nfce/servlet/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://200.174.88.103:8080/nfce/servlet/qrcode?p=",
+    },
+    "RS": {
+        NFCE_AMBIENTE_PRODUCAO: "https://www.sefaz.rs.gov.br/NFCE/NFCE-COM.aspx?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://www.sefaz.rs.gov.br/NFCE/NFCE-COM.aspx?p=",
+    },
+    "SC": {
+        NFCE_AMBIENTE_PRODUCAO: "https://sat.sef.sc.gov.br/nfce/consulta?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://hom.sat.sef.sc.gov.br/nfce/consulta?p=",
+    },
+    "SE": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.nfce.se.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.hom.nfe.se.gov.br/nfce/qrcode?p=",
+    },
+    "SP": {
+        NFCE_AMBIENTE_PRODUCAO: "https://www.nfce.fazenda.sp.gov.br/NFCeConsultaPublica/Paginas/ConsultaQRCode.aspx?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://www.homologacao.nfce.fazenda.sp.gov.br/NFCeConsultaPublica/Paginas/ConsultaQRCode.aspx?p=",
+    },
+    "TO": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.sefaz.to.gov.br/nfce/qrcode?p=",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homologacao.sefaz.to.gov.br/nfce/qrcode?p=",
+    },
+}
+
+ESTADO_CONSULTA_NFCE = {
+    "AC": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaznet.ac.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaznet.ac.gov.br/nfce/consulta",
+    },
+    "AL": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.al.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.al.gov.br/nfce/consulta",
+    },
+    "AM": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.am.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.am.gov.br/nfce/consulta",
+    },
+    "AP": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.ap.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.ap.gov.br/nfce/consulta",
+    },
+    "BA": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.ba.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://hinternet.sefaz.ba.gov.br/nfce/consulta",
+    },
+    "CE": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.ce.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.ce.gov.br/nfce/consulta",
+    },
+    "DF": {
+        NFCE_AMBIENTE_PRODUCAO: "www.fazenda.df.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.fazenda.df.gov.br/nfce/consulta",
+    },
+    "ES": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.es.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.es.gov.br/nfce/consulta",
+    },
+    "GO": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.go.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.go.gov.br/nfce/consulta",
+    },
+    "MA": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.ma.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.ma.gov.br/nfce/consulta",
+    },
+    "MG": {
+        NFCE_AMBIENTE_PRODUCAO: "https://portalsped.fazenda.mg.gov.br/portalnfce",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://hportalsped.fazenda.mg.gov.br/portalnfce",
+    },
+    "MS": {
+        NFCE_AMBIENTE_PRODUCAO: "www.dfe.ms.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.dfe.ms.gov.br/nfce/consulta",
+    },
+    "MT": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.sefaz.mt.gov.br/nfce/consultanfce",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homologacao.sefaz.mt.gov.br/nfce/consultanfce",
+    },
+    "PA": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefa.pa.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefa.pa.gov.br/nfce/consulta",
+    },
+    "PB": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.pb.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.pb.gov.br/nfcehom",
+    },
+    "PE": {
+        NFCE_AMBIENTE_PRODUCAO: "http://nfce.sefaz.pe.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://nfce.sefaz.pe.gov.br/nfce/consulta",
+    },
+    "PI": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.pi.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.pi.gov.br/nfce/consulta",
+    },
+    "PR": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.fazenda.pr.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.fazenda.pr.gov.br/nfce/consulta",
+    },
+    "RJ": {
+        NFCE_AMBIENTE_PRODUCAO: "www.fazenda.rj.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.fazenda.rj.gov.br/nfce/consulta",
+    },
+    "RN": {
+        NFCE_AMBIENTE_PRODUCAO: "www.set.rn.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.set.rn.gov.br/nfce/consulta",
+    },
+    "RO": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefin.ro.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefin.ro.gov.br/nfce/consulta",
+    },
+    "RR": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.rr.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.rr.gov.br/nfce/consulta",
+    },
+    "RS": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.rs.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "www.sefaz.rs.gov.br/nfce/consulta",
+    },
+    "SC": {
+        NFCE_AMBIENTE_PRODUCAO: "https://sat.sef.sc.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://hom.sat.sef.sc.gov.br/nfce/consulta",
+    },
+    "SE": {
+        NFCE_AMBIENTE_PRODUCAO: "http://www.nfce.se.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://www.hom.nfe.se.gov.br/nfce/consulta",
+    },
+    "SP": {
+        NFCE_AMBIENTE_PRODUCAO: "https://www.nfce.fazenda.sp.gov.br/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "https://www.homologacao.nfce.fazenda.sp.gov.br/consulta",
+    },
+    "TO": {
+        NFCE_AMBIENTE_PRODUCAO: "www.sefaz.to.gov.br/nfce/consulta",
+        NFCE_AMBIENTE_HOMOLOGACAO: "http://homologacao.sefaz.to.gov.br/nfce/consulta.jsf",
+    },
+}
+
+
+# CT-e
+
+CTE_AMBIENTE_PRODUCAO = "producao"
+CTE_AMBIENTE_HOMOLOGACAO = "homologacao"
+
+WS_CTE_CONSULTA = "CTeConsultaV4"
+WS_CTE_RECEPCAO_EVENTO = "CTeRecepcaoEventoV4"
+WS_CTE_RECEPCAO_GT = "CTeRecepcaoGTVeV4"
+WS_CTE_RECEPCAO_OS = "CTeRecepcaoOSV4"
+WS_CTE_RECEPCAO_SINC = "CTeRecepcaoSincV4"
+WS_CTE_STATUS_SERVICO = "CTeStatusServicoV4"
+QR_CODE_URL = "QRCode"
+
+CTE_SVSP_STATES = ["AP", "PE", "RR", "SP"]
+CTE_SVRS_STATES = [
+    "AC",
+    "AL",
+    "AM",
+    "BA",
+    "CE",
+    "DF",
+    "ES",
+    "GO",
+    "MA",
+    "PA",
+    "PB",
+    "PI",
+    "RJ",
+    "RN",
+    "RO",
+    "SC",
+    "SE",
+    "TO",
+]
+
+CTE_SVSP = {
+    CTE_AMBIENTE_PRODUCAO: {
+        "servidor": "nfe.fazenda.sp.gov.br",
+        WS_CTE_CONSULTA: "CTeWS/WS/CTeConsultaV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "CTeWS/WS/CTeRecepcaoEventoV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_GT: "CTeWS/WS/CTeRecepcaoGTVeV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_OS: "CTeWS/WS/CTeRecepcaoOSV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_SINC: "CTeWS/WS/CTeRecepcaoSincV4.asmx?wsdl",
+        WS_CTE_STATUS_SERVICO: "CTeWS/WS/CTeStatusServicoV4.asmx?wsdl",
+        QR_CODE_URL: "https://nfe.fazenda.sp.gov.br/CTeConsulta/qrCode",
+    },
+    CTE_AMBIENTE_HOMOLOGACAO: {
+        "servidor": "homologacao.nfe.fazenda.sp.gov.br",
+        WS_CTE_CONSULTA: "CTeWS/WS/CTeConsultaV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "CTeWS/WS/CTeRecepcaoEventoV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_GT: "CTeWS/WS/CTeRecepcaoGTVeV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_OS: "CTeWS/WS/CTeRecepcaoOSV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_SINC: "CTeWS/WS/CTeRecepcaoSincV4.asmx?wsdl",
+        WS_CTE_STATUS_SERVICO: "CTeWS/WS/CTeStatusServicoV4.asmx?wsdl",
+        QR_CODE_URL: "https://homologacao.nfe.fazenda.sp.gov.br/CTeConsulta/qrCode",
+    },
+}
+
+CTE_SVRS = {
+    CTE_AMBIENTE_PRODUCAO: {
+        "servidor": "cte.svrs.rs.gov.br",
+        WS_CTE_CONSULTA: "ws/CTeConsultaV4/CTeConsultaV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4/CTeRecepcaoEventoV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4/CTeRecepcaoGTVeV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4/CTeRecepcaoOSV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4/CTeRecepcaoSincV4.asmx?wsdl",
+        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4/CTeStatusServicoV4.asmx?wsdl",
+        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/cte/qrCode",
+    },
+    CTE_AMBIENTE_HOMOLOGACAO: {
+        "servidor": "cte-homologacao.svrs.rs.gov.br",
+        WS_CTE_CONSULTA: "ws/CTeConsultaV4/CTeConsultaV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4/CTeRecepcaoEventoV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4/CTeRecepcaoGTVeV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4/CTeRecepcaoOSV4.asmx?wsdl",
+        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4/CTeRecepcaoSincV4.asmx?wsdl",
+        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4/CTeStatusServicoV4.asmx?wsdl",
+        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/cte/qrCode",
+    },
+}
+
+CTE_MT = {
+    CTE_AMBIENTE_PRODUCAO: {
+        "servidor": "cte.sefaz.mt.gov.br",
+        WS_CTE_CONSULTA: "ctews2/services/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "ctews2/services/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "ctews2/services/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "ctews/services/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "ctews2/services/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "ctews2/services/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "https://www.sefaz.mt.gov.br/cte/qrcode",
+    },
+    CTE_AMBIENTE_HOMOLOGACAO: {
+        "servidor": "homologacao.sefaz.mt.gov.br",
+        WS_CTE_CONSULTA: "ctews2/services/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "ctews2/services/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "ctews2/services/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "ctews/services/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "ctews2/services/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "ctews2/services/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "https://homologacao.sefaz.mt.gov.br/cte/qrcode",
+    },
+}
+
+CTE_MS = {
+    CTE_AMBIENTE_PRODUCAO: {
+        "servidor": "producao.cte.ms.gov.br",
+        WS_CTE_CONSULTA: "ws/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "http://www.dfe.ms.gov.br/cte/qrcode",
+    },
+    CTE_AMBIENTE_HOMOLOGACAO: {
+        "servidor": "homologacao.cte.ms.gov.br",
+        WS_CTE_CONSULTA: "ws/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "ws/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "ws/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "ws/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "ws/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "ws/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "http://www.dfe.ms.gov.br/cte/qrcode",
+    },
+}
+
+CTE_MG = {
+    CTE_AMBIENTE_PRODUCAO: {
+        "servidor": "cte.fazenda.mg.gov.br",
+        WS_CTE_CONSULTA: "cte/services/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "cte/services/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "cte/services/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "cte/services/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "cte/services/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "cte/services/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "https://cte.fazenda.mg.gov.br/portalcte/sistema/qrcode.xhtml",
+    },
+    CTE_AMBIENTE_HOMOLOGACAO: {
+        "servidor": "hcte.fazenda.mg.gov.br",
+        WS_CTE_CONSULTA: "cte/services/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "cte/services/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "cte/services/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "cte/services/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "cte/services/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "cte/services/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "https://cte.fazenda.mg.gov.br/portalcte/sistema/qrcode.xhtml",
+    },
+}
+
+CTE_PR = {
+    CTE_AMBIENTE_PRODUCAO: {
+        "servidor": "cte.fazenda.pr.gov.br",
+        WS_CTE_CONSULTA: "cte4/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "cte4/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "cte4/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "cte4/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "cte4/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "cte4/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "http://www.fazenda.pr.gov.br/cte/qrcode",
+    },
+    CTE_AMBIENTE_HOMOLOGACAO: {
+        "servidor": "homologacao.cte.fazenda.pr.gov.br",
+        WS_CTE_CONSULTA: "cte4/CTeConsultaV4?wsdl",
+        WS_CTE_RECEPCAO_EVENTO: "cte4/CTeRecepcaoEventoV4?wsdl",
+        WS_CTE_RECEPCAO_GT: "cte4/CTeRecepcaoGTVeV4?wsdl",
+        WS_CTE_RECEPCAO_OS: "cte4/CTeRecepcaoOSV4?wsdl",
+        WS_CTE_RECEPCAO_SINC: "cte4/CTeRecepcaoSincV4?wsdl",
+        WS_CTE_STATUS_SERVICO: "cte4/CTeStatusServicoV4?wsdl",
+        QR_CODE_URL: "http://www.fazenda.pr.gov.br/cte/qrcode",
+    },
+}
+
+CTE_ESTADO_WS = dict(
+    [(sigla, CTE_SVSP) for sigla in CTE_SVSP_STATES]
+    + [(sigla, CTE_SVRS) for sigla in CTE_SVRS_STATES]
+    + [("MT", CTE_MT), ("MS", CTE_MS), ("MG", CTE_MG), ("PR", CTE_PR)]
+)
+
+
+# MDF-e
+
+WS_MDFE_CONSULTA = "MDFeConsulta"
+WS_MDFE_STATUS_SERVICO = "MDFeStatusServicoMDF"
+WS_MDFE_CONSULTA_NAO_ENCERRADOS = "MDFeConsNaoEnc"
+WS_MDFE_DISTRIBUICAO = "MDFeDistribuicaoDFe"
+
+WS_MDFE_RECEPCAO = "MDFeRecepcao"
+WS_MDFE_RECEPCAO_SINC = "MDFeRecepcaoSinc"
+WS_MDFE_RET_RECEPCAO = "MDFeRetRecepcao"
+WS_MDFE_RECEPCAO_EVENTO = "MDFeRecepcaoEvento"
+
+MDFE_SVRS_STATES = [
+    "AC",
+    "AL",
+    "AM",
+    "BA",
+    "CE",
+    "DF",
+    "ES",
+    "GO",
+    "MA",
+    "PA",
+    "PB",
+    "PI",
+    "RJ",
+    "RN",
+    "RO",
+    "SC",
+    "SE",
+    "TO",
+    "AP",
+    "PE",
+    "RR",
+    "RS",
+    "SP",
+]
+
+MDFE_SVRS = {
+    AMBIENTE_PRODUCAO: {
+        "servidor": "mdfe.svrs.rs.gov.br",
+        WS_MDFE_RET_RECEPCAO: "ws/MDFeRetRecepcao/MDFeRetRecepcao.asmx?wsdl",
+        WS_MDFE_RECEPCAO_EVENTO: "ws/MDFeRecepcaoEvento/MDFeRecepcaoEvento.asmx?wsdl",
+        WS_MDFE_CONSULTA: "ws/MDFeConsulta/MDFeConsulta.asmx?wsdl",
+        WS_MDFE_STATUS_SERVICO: "ws/MDFeStatusServico/MDFeStatusServico.asmx?wsdl",
+        WS_MDFE_CONSULTA_NAO_ENCERRADOS: "ws/MDFeConsNaoEnc/MDFeConsNaoEnc.asmx?wsdl",
+        WS_MDFE_DISTRIBUICAO: "ws/MDFeDistribuicaoDFe/MDFeDistribuicaoDFe.asmx?wsdl",
+        WS_MDFE_RECEPCAO_SINC: "ws/MDFeRecepcaoSinc/MDFeRecepcaoSinc.asmx?wsdl",
+        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/mdfe/qrCode",
+    },
+    AMBIENTE_HOMOLOGACAO: {
+        "servidor": "mdfe-homologacao.svrs.rs.gov.br",
+        WS_MDFE_RET_RECEPCAO: "ws/MDFeRetRecepcao/MDFeRetRecepcao.asmx?wsdl",
+        WS_MDFE_RECEPCAO_EVENTO: "ws/MDFeRecepcaoEvento/MDFeRecepcaoEvento.asmx?wsdl",
+        WS_MDFE_CONSULTA: "ws/MDFeConsulta/MDFeConsulta.asmx?wsdl",
+        WS_MDFE_STATUS_SERVICO: "ws/MDFeStatusServico/MDFeStatusServico.asmx?wsdl",
+        WS_MDFE_CONSULTA_NAO_ENCERRADOS: "ws/MDFeConsNaoEnc/MDFeConsNaoEnc.asmx?wsdl",
+        WS_MDFE_DISTRIBUICAO: "ws/MDFeDistribuicaoDFe/MDFeDistribuicaoDFe.asmx?wsdl",
+        WS_MDFE_RECEPCAO_SINC: "ws/MDFeRecepcaoSinc/MDFeRecepcaoSinc.asmx?wsdl",
+        QR_CODE_URL: "https://dfe-portal.svrs.rs.gov.br/mdfe/qrCode",
+    },
+}
+
+MDFE_ESTADO_WS = {sigla: MDFE_SVRS for sigla in MDFE_SVRS_STATES}
+
+
+# Serviços resolvidos pelas tabelas da NF-e; o QR Code e a consulta pública
+# da NFC-e vêm das tabelas próprias
+SERVICOS_NFE = (
+    WS_NFE_AUTORIZACAO,
+    WS_NFE_RET_AUTORIZACAO,
+    WS_NFE_CONSULTA,
+    WS_NFE_SITUACAO,
+    WS_NFE_INUTILIZACAO,
+    WS_NFE_RECEPCAO_EVENTO,
+    WS_NFE_CADASTRO,
+    WS_DFE_DISTRIBUICAO,
+    WS_DOWNLOAD_NFE,
+)
+SERVICOS_CTE = (
+    WS_CTE_CONSULTA,
+    WS_CTE_RECEPCAO_EVENTO,
+    WS_CTE_RECEPCAO_GT,
+    WS_CTE_RECEPCAO_OS,
+    WS_CTE_RECEPCAO_SINC,
+    WS_CTE_STATUS_SERVICO,
+    QR_CODE_URL,
+)
+SERVICOS_MDFE = (
+    WS_MDFE_CONSULTA,
+    WS_MDFE_STATUS_SERVICO,
+    WS_MDFE_CONSULTA_NAO_ENCERRADOS,
+    WS_MDFE_DISTRIBUICAO,
+    WS_MDFE_RECEPCAO_SINC,
+    WS_MDFE_RET_RECEPCAO,
+    WS_MDFE_RECEPCAO_EVENTO,
+    QR_CODE_URL,
+)
+AMBIENTES = (AMBIENTE_PRODUCAO, AMBIENTE_HOMOLOGACAO)
+
+# Arquivo JSON com as alterações aplicadas ao registro padrão na importação
+VARIAVEL_AMBIENTE = "ERPBRASIL_EDOC_WEBSERVICES"
+
+
+def _resolver_url_tabela(tabelas, servico, ambiente):
+    # Tabelas do CT-e/MDF-e: {ambiente: {"servidor": ..., servico: caminho}}
+    tabela = tabelas[ambiente]
+    if servico == QR_CODE_URL:
+        return tabela[QR_CODE_URL]
+    return f"https://{tabela['servidor']}/{tabela[servico]}"
+
+
+def _combinacoes():
+    """Combinações (serviço, cUF, modelo, ambiente, contingência) esperadas
+    no registro"""
+    for estado in SIGLA_ESTADO:
+        for ambiente in AMBIENTES:
+            for contingencia in (False, True):
+                for servico in SERVICOS_NFE:
+                    for mod in (NFE_MODELO, NFCE_MODELO):
+                        yield servico, estado, mod, ambiente, contingencia
+            if estado == "91":
+                continue
+            for servico in SERVICOS_CTE:
+                for mod in CTE_MODELOS:
+                    yield servico, estado, mod, ambiente, False
+            for servico in SERVICOS_MDFE:
+                yield servico, estado, MDFE_MODELO, ambiente, False
+
+
+def _resolver(servico, estado, mod, ambiente, contingencia):
+    sigla = SIGLA_ESTADO[estado]
+    if mod in CTE_MODELOS:
+        tabelas = CTE_ESTADO_WS[sigla]
+        cte_ambiente = (
+            CTE_AMBIENTE_PRODUCAO
+            if ambiente == AMBIENTE_PRODUCAO
+            else CTE_AMBIENTE_HOMOLOGACAO
+        )
+        return _resolver_url_tabela(tabelas, servico, cte_ambiente)
+    if mod == MDFE_MODELO:
+        return _resolver_url_tabela(MDFE_ESTADO_WS[sigla], servico, ambiente)
+    return _resolver_url(servico, estado, mod, ambiente, contingencia)
+
+
+def _urls_nfce():
+    for tabela, servico in (
+        (ESTADO_QRCODE, WS_NFCE_QR_CODE),
+        (ESTADO_CONSULTA_NFCE, WS_NFCE_CONSULTA_PUBLICA),
+    ):
+        for sigla, urls in tabela.items():
+            for ambiente, url in urls.items():
+                for contingencia in (False, True):
+                    yield (
+                        (servico, CODIGO_UF[sigla], NFCE_MODELO, int(ambiente)),
+                        contingencia,
+                        url,
+                    )
+
+
+class RegistroWebservices:
+    """URLs de todos os webservices indexadas por (serviço, cUF, modelo,
+    ambiente, contingência).
+
+    O registro padrão (`REGISTRO`) é montado uma única vez a partir das
+    tabelas deste módulo e, se a variável de ambiente
+    ``ERPBRASIL_EDOC_WEBSERVICES`` indicar um arquivo JSON, recebe as
+    alterações nele descritas (veja `aplicar`).
+    """
+
+    def __init__(self, urls=None):
+        self._urls = dict(urls or {})
+
+    @classmethod
+    def padrao(cls):
+        registro = cls()
+        for chave in _combinacoes():
+            try:
+                registro._urls[chave] = _resolver(*chave)
+            except KeyError:
+                continue
+        for (servico, estado, mod, ambiente), contingencia, url in _urls_nfce():
+            registro.registrar(servico, estado, mod, ambiente, url, contingencia)
+        return registro
+
+    @staticmethod
+    def chave(servico, estado, mod, ambiente, contingencia=False):
+        return servico, str(estado), str(mod), int(ambiente), bool(contingencia)
+
+    def url(self, servico, estado, mod, ambiente, contingencia=False):
+        return self._urls[self.chave(servico, estado, mod, ambiente, contingencia)]
+
+    def registrar(self, servico, estado, mod, ambiente, url, contingencia=False):
+        self._urls[self.chave(servico, estado, mod, ambiente, contingencia)] = url
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __iter__(self):
+        return iter(self._urls.items())
+
+    def aplicar(self, alteracoes):
+        """Aplica alterações no formato::
+
+            {
+                "servidores": {"nfe.fazenda.sp.gov.br": "http://localhost:8080"},
+                "urls": [
+                    {"servico": "NfeAutorizacao", "uf": "35", "modelo": "55",
+                     "ambiente": 2, "contingencia": false,
+                     "url": "https://..."}
+                ]
+            }
+
+        Em `servidores`, o servidor (e opcionalmente o esquema) de todas as
+        URLs é trocado. Em `urls`, os campos omitidos valem para todas as
+        combinações já registradas; com todos os campos, a URL é incluída
+        mesmo que a combinação não exista.
+        """
+        servidores = alteracoes.get("servidores") or {}
+        if servidores:
+            for chave, url in self._urls.items():
+                self._urls[chave] = _trocar_servidor(url, servidores)
+
+        campos = ("servico", "uf", "modelo", "ambiente", "contingencia")
+        for item in alteracoes.get("urls") or []:
+            if all(campo in item for campo in campos[:4]):
+                self.registrar(
+                    item["servico"],
+                    item["uf"],
+                    item["modelo"],
+                    item["ambiente"],
+                    item["url"],
+                    item.get("contingencia", False),
+                )
+                continue
+            filtro = {
+                indice: normalizar(item[campo])
+                for indice, (campo, normalizar) in enumerate(
+                    zip(campos, (str, str, str, int, bool))
+                )
+                if campo in item
+            }
+            for chave in self._urls:
+                if all(chave[indice] == valor for indice, valor in filtro.items()):
+                    self._urls[chave] = item["url"]
+
+    def carregar(self, caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            self.aplicar(json.load(arquivo))
+
+    def validar(self):
+        """Lista as combinações esperadas sem URL no registro"""
+        return [chave for chave in _combinacoes() if chave not in self._urls]
+
+
+def _trocar_servidor(url, servidores):
+    partes = urlsplit(url)
+    destino = servidores.get(partes.netloc)
+    if destino is None:
+        return url
+    if "://" in destino:
+        esquema, servidor = destino.split("://", 1)
+    else:
+        esquema, servidor = partes.scheme, destino
+    return urlunsplit(partes._replace(scheme=esquema, netloc=servidor))
+
+
+def _registro_inicial():
+    registro = RegistroWebservices.padrao()
+    caminho = os.environ.get(VARIAVEL_AMBIENTE)
+    if caminho:
+        registro.carregar(caminho)
+    return registro
+
+
+REGISTRO = _registro_inicial()
+
+
+def localizar_url(servico, estado, mod="55", ambiente=2, contingencia=False):
+    """URL do webservice no registro padrão"""
+    return REGISTRO.url(servico, estado, mod, ambiente, contingencia)
+
+
+def validar_indice():
+    return REGISTRO.validar()
@@ -0,0 +1,158 @@
+# License MIT
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from zeep.transports import Transport
+from zeep.wsdl import Document
+
+from .webservices import REGISTRO
+
+_logger = logging.getLogger(__name__)
+
+DIRETORIO_PADRAO = os.environ.get("ERPBRASIL_EDOC_WSDL") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "erpbrasil.edoc",
+    "wsdl",
+)
+ARQUIVO_INDICE = "indice.json"
+
+
+class CacheWSDL:
+    """Cache em disco dos WSDL/XSD dos webservices.
+
+    Cada documento é gravado com o nome derivado da sua URL e registrado no
+    arquivo de índice junto com o seu sha256, conferido a cada leitura. O
+    diretório padrão fica no cache do usuário (``~/.cache/erpbrasil.edoc``)
+    e pode ser trocado pela variável de ambiente ``ERPBRASIL_EDOC_WSDL``.
+    Com `autogravar`, os documentos baixados são gravados no primeiro uso.
+
+    Os WSDL já analisados pelo zeep também são mantidos em memória
+    (`documento`), evitando uma nova análise a cada cliente criado.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, autogravar=True):
+        self.diretorio = diretorio
+        self.autogravar = autogravar
+        self._lock = threading.Lock()
+        self._indice = None
+        self._documentos = {}
+
+    @property
+    def indice(self):
+        if self._indice is None:
+            caminho = os.path.join(self.diretorio, ARQUIVO_INDICE)
+            try:
+                with open(caminho, encoding="utf-8") as arquivo:
+                    self._indice = json.load(arquivo)
+            except (OSError, ValueError):
+                self._indice = {}
+        return self._indice
+
+    @staticmethod
+    def nome_arquivo(url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest() + ".xml"
+
+    def obter(self, url):
+        registro = self.indice.get(url)
+        if not registro:
+            return None
+        try:
+            with open(os.path.join(self.diretorio, registro["arquivo"]), "rb") as arq:
+                conteudo = arq.read()
+        except OSError:
+            return None
+        if hashlib.sha256(conteudo).hexdigest() != registro["sha256"]:
+            _logger.warning("Checksum inválido no cache do WSDL %s", url)
+            return None
+        return conteudo
+
+    def gravar(self, url, conteudo):
+        with self._lock:
+            os.makedirs(self.diretorio, exist_ok=True)
+            nome = self.nome_arquivo(url)
+            with open(os.path.join(self.diretorio, nome), "wb") as arquivo:
+                arquivo.write(conteudo)
+            self.indice[url] = {
+                "arquivo": nome,
+                "sha256": hashlib.sha256(conteudo).hexdigest(),
+            }
+            self._salvar_indice()
+
+    def documento(self, url, transport):
+        """WSDL analisado pelo zeep, compartilhado pelos clientes do mesmo
+        webservice. O WSDL e os XSD importados são lidos pelo `transport`."""
+        with self._lock:
+            documento = self._documentos.get(url)
+        if documento is None:
+            documento = Document(url, transport)
+            with self._lock:
+                documento = self._documentos.setdefault(url, documento)
+        return documento
+
+    def _salvar_indice(self):
+        caminho = os.path.join(self.diretorio, ARQUIVO_INDICE)
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(self.indice, arquivo, indent=1, sort_keys=True)
+        os.replace(temporario, caminho)
+
+    def verificar(self):
+        """Retorna as URLs cujo arquivo está ausente ou corrompido"""
+        return [url for url in sorted(self.indice) if self.obter(url) is None]
+
+    def atualizar(self, session, urls):
+        """Baixa novamente os WSDL informados e todos os XSD importados.
+
+        :return: lista de tuplas (url, erro) das URLs que falharam
+        """
+        from zeep import Client
+
+        erros = []
+        for url in urls:
+            transport = TransportCacheWSDL(self, session=session, atualizar=True)
+            try:
+                Client(url, transport=transport)
+            except Exception as erro:
+                erros.append((url, erro))
+        with self._lock:
+            self._documentos.clear()
+        return erros
+
+
+class TransportCacheWSDL(Transport):
+    """Transport do zeep que serve os WSDL/XSD a partir do CacheWSDL,
+    recorrendo à rede apenas quando o documento não está no cache."""
+
+    def __init__(self, cache_wsdl, atualizar=False, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_wsdl = cache_wsdl
+        self.atualizar = atualizar
+
+    def load(self, url):
+        if not self.atualizar:
+            conteudo = self.cache_wsdl.obter(url)
+            if conteudo is not None:
+                return conteudo
+
+        conteudo = super().load(url)
+        if self.atualizar:
+            self.cache_wsdl.gravar(url, conteudo)
+        elif self.cache_wsdl.autogravar:
+            try:
+                self.cache_wsdl.gravar(url, conteudo)
+            except OSError:
+                _logger.warning("Não foi possível gravar o WSDL %s no cache", url)
+        return conteudo
+
+
+def urls_wsdl():
+    """Lista as URLs de WSDL de todos os webservices do registro"""
+    urls = {url for _, url in REGISTRO}
+    return sorted(url for url in urls if url.lower().endswith("?wsdl"))
+
+
+CACHE_WSDL = CacheWSDL()
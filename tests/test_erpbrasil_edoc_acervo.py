@@ -0,0 +1,93 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from erpbrasil.edoc.acervo import Acervo
+from erpbrasil.edoc.distribuicao import DocumentoDistribuido
+from lxml import etree
+
+from .test_erpbrasil_edoc_resumo import CHAVE, PROC_NFE, RES_EVENTO, RES_NFE
+
+
+class AcervoTests(TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.acervo = Acervo(self.diretorio.name)
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def test_guardar_processo(self):
+        registro = self.acervo.guardar(PROC_NFE)
+        self.assertEqual(
+            (registro.chave, registro.cnpj, registro.modelo, registro.data),
+            (CHAVE, "59594315000157", "55", "2020-01-10"),
+        )
+        # O mesmo conteúdo é gravado e indexado uma única vez
+        self.acervo.guardar(PROC_NFE.encode())
+        self.assertEqual(len(self.acervo), 1)
+        self.assertEqual(self.acervo.obter_xml(chave=CHAVE), PROC_NFE.encode("utf-8"))
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    self.diretorio.name,
+                    "objetos",
+                    registro.hash[:2],
+                    registro.hash[2:] + ".xml.gz",
+                )
+            )
+        )
+
+    def test_guardar_distribuidos(self):
+        documentos = [
+            DocumentoDistribuido(
+                "00000000000191",
+                str(nsu).zfill(15),
+                schema,
+                xml.encode(),
+                etree.fromstring(xml),
+            )
+            for nsu, schema, xml in (
+                (1, "resNFe_v1.01.xsd", RES_NFE),
+                (2, "resEvento_v1.01.xsd", RES_EVENTO),
+            )
+        ]
+        self.acervo.guardar_distribuidos(documentos)
+
+        self.assertEqual(
+            [r.schema for r in self.acervo.buscar(chave=CHAVE)],
+            ["resNFe_v1.01.xsd", "resEvento_v1.01.xsd"],
+        )
+        self.assertEqual(
+            self.acervo.obter_xml(interessado="00000000000191", nsu="000000000000002"),
+            RES_EVENTO.encode(),
+        )
+        self.assertEqual(self.acervo.ultimo_nsu("00000000000191"), "000000000000002")
+        self.assertEqual(
+            len(
+                self.acervo.buscar(
+                    cnpj="59594315000157",
+                    data_inicial="2020-01-10",
+                    data_final="2020-01-10",
+                )
+            ),
+            1,
+        )
+        self.assertEqual(len(self.acervo.buscar(modelo="55", limite=1)), 1)
+        with self.assertRaises(TypeError):
+            self.acervo.buscar(valor="150.00")
+
+    def test_formato_da_data(self):
+        xml = f'<NFe><infNFe Id="NFe{CHAVE}"/></NFe>'
+        self.assertEqual(self.acervo.guardar(xml).data, "2020-01-01")
+        self.assertEqual(
+            self.acervo.guardar(
+                xml.replace("<NFe>", "<NFe><!-- cópia -->"),
+                data="2020-01-10T10:00:00-03:00",
+            ).data,
+            "2020-01-10",
+        )
+        self.assertEqual(
+            len(self.acervo.buscar(data_inicial="2020-01-01", data_final="2020-01-10")),
+            2,
+        )
@@ -0,0 +1,71 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.agendador import AgendadorRecibos
+
+
+class DocumentoFalso:
+    _maximo_tentativas_consulta_recibo = 5
+
+    def __init__(self, espera=0.01):
+        self.espera = espera
+        self.consultas = {}
+        self.processos = []
+        self.trava = threading.Lock()
+
+    def _clonar(self):
+        return self
+
+    def _tempo_espera(self, proc_envio):
+        return self.espera
+
+    def consulta_recibo(self, proc_envio):
+        with self.trava:
+            consultas = self.consultas[proc_envio] = (
+                self.consultas.get(proc_envio, 0) + 1
+            )
+        cStat = "105" if consultas < 3 else "104"
+        return SimpleNamespace(resposta=SimpleNamespace(cStat=cStat))
+
+    def _edoc_situacao_em_processamento(self, proc_recibo):
+        return proc_recibo.resposta.cStat == "105"
+
+    def _observa_recibo(self, proc_envio, proc_recibo):
+        pass
+
+    def monta_processo(self, edoc, proc_envio, proc_recibo):
+        with self.trava:
+            self.processos.append(edoc)
+
+
+class AgendadorRecibosTests(TestCase):
+    def test_muitos_lotes_com_poucas_threads(self):
+        documento = DocumentoFalso()
+        agendador = AgendadorRecibos(workers=2)
+        inicio = time.monotonic()
+        for numero in range(100):
+            agendador.agendar(documento, numero, "recibo%d" % numero)
+
+        concluidos = list(agendador.concluidos())
+        agendador.fechar()
+
+        self.assertLess(time.monotonic() - inicio, 5)
+        self.assertEqual(len(concluidos), 100)
+        self.assertEqual(sorted(documento.processos), list(range(100)))
+        self.assertTrue(all(p.tentativas == 2 for p in concluidos))
+        self.assertTrue(all(p.proc_recibo.resposta.cStat == "104" for p in concluidos))
+
+    def test_callback_e_erro(self):
+        documento = DocumentoFalso()
+        documento.consulta_recibo = None
+        entregues = []
+        agendador = AgendadorRecibos(workers=1, callback=entregues.append)
+        with mock.patch("erpbrasil.edoc.agendador._logger") as logger:
+            agendador.agendar(documento, "edoc", "recibo")
+            self.assertTrue(agendador.aguardar(timeout=5))
+        agendador.fechar()
+        logger.exception.assert_called_once()
+        self.assertEqual(len(entregues), 1)
+        self.assertIsInstance(entregues[0].erro, TypeError)
@@ -0,0 +1,77 @@
+import copy
+from unittest import TestCase
+
+from erpbrasil.assinatura.assinatura import Assinatura
+from erpbrasil.edoc.assinador import criar_pool_assinatura, pool_assinatura
+from erpbrasil.edoc.nfe import NFe
+from erpbrasil.transmissao import TransmissaoSOAP
+from lxml import etree
+
+from .test_certificate_mixin import TestCertificateMixin
+
+EVENTO = """<evento xmlns="http://www.portalfiscal.inf.br/nfe" versao="1.00">
+    <infEvento Id="ID1101113524011234567800019555001000000001100000000101">
+        <cOrgao>35</cOrgao>
+        <tpAmb>2</tpAmb>
+        <CNPJ>12345678000195</CNPJ>
+        <chNFe>35240112345678000195550010000000011000000001</chNFe>
+        <dhEvento>2024-01-16T14:00:00-03:00</dhEvento>
+        <tpEvento>110111</tpEvento>
+        <nSeqEvento>1</nSeqEvento>
+        <verEvento>1.00</verEvento>
+    </infEvento>
+</evento>"""
+
+ID = "ID1101113524011234567800019555001000000001100000000101"
+
+
+class AssinadorTests(TestCertificateMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.nfe = NFe(TransmissaoSOAP(self.certificate), "35", ambiente="2")
+
+    def test_mesmo_resultado_do_assina_raiz(self):
+        texto = (
+            Assinatura(self.certificate)
+            .assina_xml2(etree.fromstring(EVENTO), ID)
+            .replace("\n", "")
+            .replace("\r", "")
+        )
+        self.assertEqual(self.nfe.assina_raiz(etree.fromstring(EVENTO), ID), texto)
+        elemento = self.nfe.assina_raiz_etree(etree.fromstring(EVENTO), ID)
+
+        self.assertEqual(etree.tostring(elemento, encoding=str), texto)
+        self.assertEqual(
+            elemento[-1].tag, "{http://www.w3.org/2000/09/xmldsig#}Signature"
+        )
+        self.assertNotIn("\n", etree.tostring(elemento, encoding=str))
+
+    def test_assinador_reaproveitado(self):
+        outra = NFe(TransmissaoSOAP(self.certificate), "43", ambiente="2")
+        self.assertIs(self.nfe._assinador, outra._assinador)
+
+    def test_assina_nfse(self):
+        esperado = Assinatura(self.certificate).assina_nfse(etree.fromstring(EVENTO))
+        self.assertEqual(
+            self.nfe._assinador.assina_nfse(etree.fromstring(EVENTO)), esperado
+        )
+
+    def test_assina_lote_paralelo(self):
+        ids = [ID[:-1] + str(sequencia) for sequencia in range(1, 6)]
+        raizes = [(etree.fromstring(EVENTO.replace(ID, id)), id) for id in ids]
+        esperado = [
+            etree.tostring(self.nfe.assina_raiz_etree(copy.deepcopy(raiz), id))
+            for raiz, id in raizes
+        ]
+
+        self.nfe.assinatura_paralela = True
+        with criar_pool_assinatura(self.certificate, 2) as proprio:
+            for executor in (None, proprio):
+                self.nfe.executor_assinatura = executor
+                assinados = self.nfe.assina_lote_etree(copy.deepcopy(raizes))
+                self.assertEqual([etree.tostring(el) for el in assinados], esperado)
+
+        # O pool do certificado é reaproveitado pelos próximos lotes
+        self.assertIs(
+            pool_assinatura(self.certificate), pool_assinatura(self.certificate)
+        )
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase, mock, skipUnless
+
+import yaml
+from erpbrasil.edoc.assincrono import AsyncNFe, TransmissaoAssincrona
+from erpbrasil.edoc.wsdl import CacheWSDL
+from erpbrasil.transmissao import TransmissaoSOAP
+from requests import Response
+
+from .test_certificate_mixin import TestCertificateMixin
+
+try:
+    import httpx
+except ImportError:  # extra "async" não instalado
+    httpx = None
+
+RETORNO_STATUS = b"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope">
+<soap:Body>
+<nfeResultMsg xmlns="http://www.portalfiscal.inf.br/nfe/wsdl/NFeStatusServico4">
+<retConsStatServ xmlns="http://www.portalfiscal.inf.br/nfe" versao="4.00">
+<tpAmb>1</tpAmb><verAplic>SP_NFE_PL009_V4</verAplic><cStat>107</cStat>
+<xMotivo>Servico em Operacao</xMotivo><cUF>35</cUF>
+<dhRecbto>2026-10-18T10:00:00-03:00</dhRecbto><tMed>1</tMed>
+</retConsStatServ>
+</nfeResultMsg>
+</soap:Body>
+</soap:Envelope>"""
+
+
+def resposta_http(conteudo):
+    resposta = Response()
+    resposta.status_code = 200
+    resposta._content = conteudo
+    resposta.encoding = "utf-8"
+    return resposta
+
+
+@skipUnless(httpx, "requer o extra async (httpx)")
+class AsyncNFeTests(TestCertificateMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.nfe = AsyncNFe(
+            TransmissaoSOAP(self.certificate), "35", versao="4.00", ambiente="1"
+        )
+
+    def test_status_servico(self):
+        enviar = mock.AsyncMock(return_value=resposta_http(RETORNO_STATUS))
+        with mock.patch.object(TransmissaoAssincrona, "enviar", enviar):
+            ret = asyncio.run(self.nfe.status_servico())
+
+        self.assertEqual(ret.resposta.cStat, "107")
+        url, operacao, mensagem = enviar.call_args[0]
+        self.assertEqual(operacao, "nfeStatusServicoNF")
+        self.assertTrue(url.startswith("https://nfe.fazenda.sp.gov.br/"))
+        self.assertEqual(mensagem.findtext("{*}xServ"), "STATUS")
+
+    def test_consultas_concorrentes(self):
+        enviar = mock.AsyncMock(return_value=resposta_http(RETORNO_STATUS))
+
+        async def consultar():
+            return await asyncio.gather(*[self.nfe.status_servico() for _ in range(20)])
+
+        with mock.patch.object(TransmissaoAssincrona, "enviar", enviar):
+            retornos = asyncio.run(consultar())
+
+        self.assertEqual(len(retornos), 20)
+        self.assertEqual(enviar.await_count, 20)
+
+    def test_post_pelo_httpx(self):
+        cassete = os.path.join(
+            os.path.dirname(__file__), "fixtures/vcr_cassettes/test_status_servico.yaml"
+        )
+        with open(cassete) as arquivo:
+            interacoes = yaml.safe_load(arquivo)["interactions"]
+        wsdl = interacoes[0]["response"]["body"]["string"]
+        requisicoes = []
+
+        def responder(requisicao):
+            requisicoes.append(requisicao)
+            if requisicao.method == "GET":
+                return httpx.Response(200, text=wsdl)
+            return httpx.Response(200, content=RETORNO_STATUS)
+
+        transmissao = self.nfe._transmissao_assincrona
+        transmissao._http = httpx.AsyncClient(transport=httpx.MockTransport(responder))
+        transmissao._http_wsdl = httpx.Client(transport=httpx.MockTransport(responder))
+
+        async def consultar():
+            try:
+                return await self.nfe.status_servico()
+            finally:
+                await self.nfe.fechar()
+
+        with tempfile.TemporaryDirectory() as diretorio, mock.patch(
+            "erpbrasil.edoc.assincrono.CACHE_WSDL", CacheWSDL(diretorio)
+        ):
+            ret = asyncio.run(consultar())
+
+        self.assertEqual(ret.resposta.cStat, "107")
+        self.assertTrue(ret.url.endswith("nfestatusservico4.asmx?wsdl"))
+        # O WSDL pode vir do cache do zeep da transmissão
+        self.assertEqual(requisicoes[-1].method, "POST")
+        self.assertIn(b"<xServ>STATUS</xServ>", requisicoes[-1].content)
+        self.assertIsNone(transmissao._http_wsdl)
+
+    def test_processar_sem_recibo(self):
+        envio = mock.Mock(resposta=mock.Mock(infRec=mock.Mock(nRec="")))
+        self.nfe._verifica_resposta_envio_sucesso = mock.Mock(return_value=True)
+
+        async def processar():
+            return [proc async for proc in self.nfe.processar_documento(None)]
+
+        with mock.patch.object(
+            AsyncNFe, "envia_documento", mock.AsyncMock(return_value=envio)
+        ), mock.patch.object(AsyncNFe, "_tempo_espera", return_value=0):
+            self.assertEqual(asyncio.run(processar()), [envio])
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.cache import CacheStatusServico
+from erpbrasil.edoc.nfe import NFe
+
+
+def retorno(cStat):
+    return SimpleNamespace(resposta=SimpleNamespace(cStat=cStat))
+
+
+class CacheStatusServicoTests(TestCase):
+    def setUp(self):
+        self.cache = CacheStatusServico(ttl=300, ttl_paralisado=60)
+
+    def test_validade(self):
+        em_operacao, paralisado = retorno("107"), retorno("108")
+        with mock.patch("erpbrasil.edoc.cache.time") as relogio:
+            relogio.monotonic.return_value = 0
+            self.cache.guardar("a", em_operacao)
+            self.cache.guardar("b", paralisado)
+            self.cache.guardar("c", retorno("999"))
+
+            relogio.monotonic.return_value = 59
+            self.assertIs(self.cache.obter("a"), em_operacao)
+            self.assertIs(self.cache.obter("b"), paralisado)
+            self.assertIsNone(self.cache.obter("c"))
+
+            relogio.monotonic.return_value = 61
+            self.assertIs(self.cache.obter("a"), em_operacao)
+            self.assertIsNone(self.cache.obter("b"))
+
+            relogio.monotonic.return_value = 301
+            self.assertIsNone(self.cache.obter("a"))
+
+        self.assertEqual(self.cache.estatisticas()["acertos"], 3)
+
+    def test_processar_documento(self):
+        nfe = NFe(None, "35", versao="4.00", ambiente="1")
+        nfe._consulta_servico_ao_enviar = True
+        nfe._cache_status_servico = self.cache
+        with mock.patch.object(
+            NFe, "status_servico", return_value=retorno("107")
+        ) as status_servico:
+            for _ in range(5):
+                next(nfe.processar_documento(None))
+            # Outro ambiente tem a sua própria entrada
+            nfe.ambiente = "2"
+            next(nfe.processar_documento(None))
+        self.assertEqual(status_servico.call_count, 2)
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.disjuntor import ABERTO, Disjuntor, Disjuntores
+from erpbrasil.edoc.esqueletos import NAMESPACE_NFE
+from erpbrasil.edoc.nfe import NFe
+from lxml import etree
+from requests import Timeout
+
+
+class DisjuntorTests(TestCase):
+    def test_abre_e_sonda(self):
+        disjuntor = Disjuntor(limite_falhas=3, tempo_aberto=60)
+        with mock.patch("erpbrasil.edoc.disjuntor.time") as relogio:
+            relogio.monotonic.return_value = 0
+            for _ in range(3):
+                self.assertTrue(disjuntor.permite())
+                disjuntor.registrar_falha()
+            self.assertEqual(disjuntor.estado, ABERTO)
+            self.assertFalse(disjuntor.permite())
+
+            # Apenas uma sondagem por intervalo
+            relogio.monotonic.return_value = 60
+            self.assertTrue(disjuntor.permite())
+            self.assertFalse(disjuntor.permite())
+            disjuntor.registrar_falha()
+            self.assertFalse(disjuntor.permite())
+
+            relogio.monotonic.return_value = 120
+            self.assertTrue(disjuntor.permite())
+            disjuntor.registrar_sucesso()
+        self.assertTrue(disjuntor.fechado)
+
+    def test_paralisado_conta_como_falha(self):
+        disjuntores = Disjuntores(limite_falhas=1)
+        url = "https://nfe.fazenda.sp.gov.br/ws/nfestatusservico4.asmx?wsdl"
+        disjuntores.registrar(
+            url, SimpleNamespace(resposta=SimpleNamespace(cStat="108"))
+        )
+        self.assertEqual(disjuntores.estados(), {"nfe.fazenda.sp.gov.br": ABERTO})
+
+
+class ContingenciaTests(TestCase):
+    def setUp(self):
+        self.nfe = NFe(mock.MagicMock(), "35", versao="4.00", ambiente="1")
+        self.nfe.disjuntores = Disjuntores(limite_falhas=2, tempo_aberto=60)
+
+    def test_failover_svc(self):
+        self.nfe._transmissao.enviar.side_effect = Timeout
+        with mock.patch.object(NFe, "_cliente"), mock.patch(
+            "erpbrasil.edoc.disjuntor.time"
+        ) as relogio:
+            relogio.monotonic.return_value = 0
+            self.assertEqual(self.nfe.tipo_emissao(), "1")
+            for _ in range(2):
+                with self.assertRaises(Timeout):
+                    self.nfe.status_servico()
+            self.assertTrue(self.nfe.em_contingencia())
+            self.assertEqual(self.nfe.tipo_emissao(), "6")
+            self.assertIn("svc.fazenda.gov.br", self.nfe._url_autorizacao(True))
+
+            # Recibos de lotes enviados à SVC são consultados na SVC
+            proc_envio = SimpleNamespace(url=self.nfe._url_autorizacao(True))
+            self.assertTrue(self.nfe._contingencia_envio(proc_envio))
+
+            # Consultar o estado não sonda o autorizador normal
+            relogio.monotonic.return_value = 60
+            self.nfe._transmissao.enviar.side_effect = None
+            enviados = self.nfe._transmissao.enviar.call_count
+            self.assertTrue(self.nfe.em_contingencia())
+            self.assertEqual(self.nfe._transmissao.enviar.call_count, enviados)
+
+            # A sondagem explícita fecha o disjuntor
+            with mock.patch(
+                "erpbrasil.edoc.edoc.analisar_retorno_raw",
+                return_value=SimpleNamespace(resposta=SimpleNamespace(cStat="107")),
+            ):
+                self.assertTrue(self.nfe.sondar_autorizador())
+            self.assertFalse(self.nfe.em_contingencia())
+
+    def test_lote_enviado_pelo_tpemis(self):
+        def nfe(tipo):
+            return etree.fromstring(
+                f'<NFe xmlns="{NAMESPACE_NFE}"><infNFe><ide>'
+                f"<tpEmis>{tipo}</tpEmis></ide></infNFe></NFe>"
+            )
+
+        with mock.patch.object(NFe, "_post") as post:
+            self.nfe._envia_lote([nfe("1"), nfe("1")])
+            self.assertEqual(post.call_args[0][1], self.nfe._url_autorizacao(False))
+            with self.assertRaises(ValueError):
+                self.nfe._envia_lote([nfe("1"), nfe("6")])
+            with self.assertRaises(ValueError):
+                self.nfe._envia_lote([nfe("6")])
+
+            disjuntor = self.nfe.disjuntores.obter(self.nfe._url_autorizacao(False))
+            for _ in range(2):
+                disjuntor.registrar_falha()
+            self.nfe._envia_lote([nfe("6")])
+            self.assertEqual(post.call_args[0][1], self.nfe._url_autorizacao(True))
+            with self.assertRaises(ValueError):
+                self.nfe._envia_lote([nfe("1")])
@@ -0,0 +1,264 @@
+import base64
+import gzip
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.distribuicao import (
+    CursoresSQLite,
+    DocumentoDistribuido,
+    EntradaDocumentos,
+    ErroDistribuicao,
+    SincronizadorDistribuicao,
+    decodificar_lote,
+)
+from erpbrasil.edoc.mde import MDe
+from lxml import etree
+from requests import ConnectTimeout
+
+from .test_erpbrasil_edoc_resumo import CHAVE, PROC_NFE, RES_NFE
+
+
+def doc_zip(nsu):
+    xml = f"<resNFe><NSU>{nsu}</NSU></resNFe>".encode()
+    return SimpleNamespace(
+        NSU=nsu,
+        schema="resNFe_v1.01.xsd",
+        valueOf_=base64.b64encode(gzip.compress(xml)).decode(),
+    )
+
+
+class DistribuicaoFalsa:
+    """Distribui os NSU de 1 a `max_nsu` em lotes de `tamanho` documentos"""
+
+    ambiente = "1"
+
+    def __init__(self, max_nsu, tamanho=2):
+        self.max_nsu = max_nsu
+        self.tamanho = tamanho
+        self.consultas = []
+
+    def consultar_distribuicao(self, cnpj_cpf, ultimo_nsu=False):
+        self.consultas.append((cnpj_cpf, ultimo_nsu))
+        inicio = int(ultimo_nsu) + 1
+        fim = min(inicio + self.tamanho - 1, self.max_nsu)
+        if inicio > self.max_nsu:
+            resposta = SimpleNamespace(
+                cStat="137", ultNSU=ultimo_nsu, maxNSU=str(self.max_nsu).zfill(15)
+            )
+        else:
+            resposta = SimpleNamespace(
+                cStat="138",
+                ultNSU=str(fim).zfill(15),
+                maxNSU=str(self.max_nsu).zfill(15),
+                loteDistDFeInt=SimpleNamespace(
+                    docZip=[
+                        doc_zip(str(nsu).zfill(15)) for nsu in range(inicio, fim + 1)
+                    ]
+                ),
+            )
+        return SimpleNamespace(resposta=resposta)
+
+
+class SincronizadorDistribuicaoTests(TestCase):
+    def test_retoma_do_cursor_gravado(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "cursores.sqlite")
+            documento = DistribuicaoFalsa(max_nsu=5)
+            sincronizador = SincronizadorDistribuicao(CursoresSQLite(caminho))
+
+            documentos = sincronizador.sincronizar(documento, "00000000000191")
+            # Interrompido no meio do segundo lote, que será entregue de novo
+            self.assertEqual([int(next(documentos).nsu) for _ in range(3)], [1, 2, 3])
+            documentos.close()
+
+            sincronizador = SincronizadorDistribuicao(CursoresSQLite(caminho))
+            documentos = list(sincronizador.sincronizar(documento, "00000000000191"))
+            self.assertEqual([int(d.nsu) for d in documentos], [3, 4, 5])
+            self.assertEqual(
+                documentos[0].xml, b"<resNFe><NSU>000000000000003</NSU></resNFe>"
+            )
+
+            # ultNSU = maxNSU: aguarda uma hora antes de consultar de novo
+            consultas = len(documento.consultas)
+            self.assertEqual(
+                list(sincronizador.sincronizar(documento, "00000000000191")), []
+            )
+            self.assertEqual(len(documento.consultas), consultas)
+
+    def test_rodizio_entre_cnpjs(self):
+        sincronizador = SincronizadorDistribuicao()
+        sincronizador.inscrever(DistribuicaoFalsa(max_nsu=4), "00000000000191")
+        sincronizador.inscrever(DistribuicaoFalsa(max_nsu=2), "00000000000272")
+        self.assertEqual(
+            [(d.cnpj_cpf[-3:], int(d.nsu)) for d in sincronizador.executar()],
+            [("191", 1), ("191", 2), ("272", 1), ("272", 2), ("191", 3), ("191", 4)],
+        )
+
+    def test_falha_de_comunicacao(self):
+        documento = DistribuicaoFalsa(max_nsu=2)
+        consultar = documento.consultar_distribuicao
+        falhas = [ConnectTimeout, ConnectTimeout]
+
+        def consultar_distribuicao(*args, **kwargs):
+            if falhas:
+                raise falhas.pop()
+            return consultar(*args, **kwargs)
+
+        documento.consultar_distribuicao = consultar_distribuicao
+        sincronizador = SincronizadorDistribuicao()
+        with mock.patch("erpbrasil.edoc.distribuicao.time") as relogio, mock.patch(
+            "erpbrasil.edoc.distribuicao._logger"
+        ):
+            relogio.time.return_value = 0
+            sincronizador.inscrever(documento, "00000000000191")
+            sincronizador.inscrever(DistribuicaoFalsa(max_nsu=1), "00000000000272")
+            # O CNPJ com falha não impede o atendimento dos demais
+            self.assertEqual(
+                [(d.cnpj_cpf[-3:], int(d.nsu)) for d in sincronizador.executar()],
+                [("272", 1)],
+            )
+            relogio.time.return_value = 60
+            self.assertEqual(list(sincronizador.executar()), [])
+            # Segunda falha seguida: espera dobrada
+            relogio.time.return_value = 180
+            self.assertEqual([int(d.nsu) for d in sincronizador.executar()], [1, 2])
+
+    def test_consumo_indevido(self):
+        documento = DistribuicaoFalsa(max_nsu=2)
+        documento.consultar_distribuicao = lambda *args, **kwargs: SimpleNamespace(
+            resposta=SimpleNamespace(cStat="656", xMotivo="Consumo Indevido")
+        )
+        sincronizador = SincronizadorDistribuicao()
+        with self.assertRaises(ErroDistribuicao):
+            list(sincronizador.sincronizar(documento, "00000000000191"))
+        self.assertEqual(
+            list(sincronizador.sincronizar(documento, "00000000000191")), []
+        )
+
+
+class DecodificarLoteTests(TestCase):
+    def test_ordem_de_nsu(self):
+        lote = SimpleNamespace(
+            docZip=[doc_zip(str(nsu).zfill(15)) for nsu in (7, 3, 50, 12)]
+        )
+        with ThreadPoolExecutor(2) as compartilhado:
+            resultados = [
+                list(decodificar_lote(lote, executor=executor))
+                for executor in (None, compartilhado)
+            ]
+        for resultado in resultados:
+            self.assertEqual([int(nsu) for nsu, _, _ in resultado], [3, 7, 12, 50])
+            _, schema, elemento = resultado[0]
+            self.assertEqual(schema, "resNFe_v1.01.xsd")
+            self.assertEqual(elemento.findtext("NSU"), "000000000000003")
+        self.assertEqual(list(decodificar_lote(None)), [])
+
+
+def chave(numero):
+    return CHAVE[:25] + str(numero).zfill(9) + CHAVE[34:]
+
+
+def res_nfe(numero, situacao="1"):
+    xml = RES_NFE.replace(CHAVE, chave(numero)).replace(
+        "<cSitNFe>1<", f"<cSitNFe>{situacao}<"
+    )
+    return DocumentoDistribuido(
+        "00000000000191", str(numero), "resNFe_v1.01.xsd", xml, etree.fromstring(xml)
+    )
+
+
+class ManifestacaoFalsa:
+    limitador = None
+
+    def __init__(self):
+        self.lotes = []
+
+    def _clonar(self):
+        return self
+
+    def ciencia_da_operacao_lote(self, chaves, cnpj_cpf):
+        self.lotes.append(chaves)
+        return [
+            SimpleNamespace(
+                resposta=SimpleNamespace(
+                    retEvento=[
+                        SimpleNamespace(
+                            infEvento=SimpleNamespace(
+                                chNFe=ch, cStat="650" if ch == chave(3) else "135"
+                            )
+                        )
+                        for ch in chaves
+                    ]
+                )
+            )
+        ]
+
+    def consultar_distribuicao(self, cnpj_cpf, chave=False):
+        xml = PROC_NFE.replace(CHAVE, chave).encode()
+        return SimpleNamespace(
+            resposta=SimpleNamespace(
+                cStat="138",
+                loteDistDFeInt=SimpleNamespace(
+                    docZip=[
+                        SimpleNamespace(
+                            NSU="000000000000000",
+                            schema="procNFe_v4.00.xsd",
+                            valueOf_=base64.b64encode(gzip.compress(xml)).decode(),
+                        )
+                    ]
+                ),
+            )
+        )
+
+
+class EntradaDocumentosTests(TestCase):
+    def test_ciencia_em_lotes_e_download(self):
+        mde = ManifestacaoFalsa()
+        entrada = EntradaDocumentos(mde, "00000000000191")
+        documentos = [res_nfe(numero) for numero in range(1, 26)]
+        documentos.append(res_nfe(99, situacao="3"))  # cancelada
+
+        baixados = list(entrada.processar(documentos))
+
+        self.assertEqual([len(lote) for lote in mde.lotes], [20, 5])
+        self.assertEqual(entrada.rejeitadas, {chave(3): "650"})
+        self.assertEqual(
+            [documento.resumo.chNFe for documento in baixados],
+            [chave(numero) for numero in range(1, 26) if numero != 3],
+        )
+
+    def test_downloads_paralelos_apenas_com_limitador(self):
+        mde = ManifestacaoFalsa()
+        documentos = [res_nfe(numero) for numero in range(1, 5)]
+        for limitador, paralelo in ((None, False), (mock.Mock(), True)):
+            mde.limitador = limitador
+            with mock.patch(
+                "erpbrasil.edoc.distribuicao.ThreadPoolExecutor",
+                wraps=ThreadPoolExecutor,
+            ) as pool:
+                baixados = list(
+                    EntradaDocumentos(mde, "00000000000191").processar(documentos)
+                )
+            self.assertEqual(len(baixados), 3)  # ciência da chave 3 rejeitada
+            self.assertEqual(pool.called, paralelo)
+
+    def test_eventos_assinados_juntos(self):
+        mde = MDe(None, "35", versao="1.00", ambiente="1")
+        chaves = [chave(numero) for numero in range(45)]
+        with mock.patch.object(
+            MDe,
+            "assina_lote_etree",
+            side_effect=lambda eventos: [
+                mde._generateds_to_etree(evento) for evento, _ in eventos
+            ],
+        ), mock.patch.object(MDe, "_post") as post:
+            mde.ciencia_da_operacao_lote(chaves, "00000000000191")
+
+        lotes = [chamada.args[0] for chamada in post.call_args_list]
+        self.assertEqual(
+            [len(lote.findall("{*}evento")) for lote in lotes], [20, 20, 5]
+        )
+        self.assertEqual(len({lote.findtext("{*}idLote") for lote in lotes}), 3)
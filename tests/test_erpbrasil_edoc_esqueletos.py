@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.nfe import NFe
+from erpbrasil.edoc.resposta import RetornoSoap
+from lxml import etree
+
+CHAVE = "35200159594315000157550010000000012062777161"
+
+
+class EsqueletosTests(TestCase):
+    def setUp(self):
+        self.nfe = NFe(None, "35", versao="4.00", ambiente="1")
+
+    def mensagens(self, chamada):
+        """XML canônico da mensagem montada pelo esqueleto e pelo generateDS"""
+        mensagens = []
+        for esqueletos_xml in (True, False):
+            self.nfe.esqueletos_xml = esqueletos_xml
+            with mock.patch.object(NFe, "_post") as post:
+                chamada()
+            raiz = self.nfe._generateds_to_etree(post.call_args[0][0])
+            mensagens.append(etree.tostring(raiz, method="c14n"))
+        return mensagens
+
+    def test_igual_ao_generateds(self):
+        chamadas = (
+            self.nfe.status_servico,
+            lambda: self.nfe.consulta_documento(CHAVE),
+            lambda: self.nfe.consulta_recibo(numero="351000000000001"),
+            lambda: self.nfe.consultar_distribuicao(
+                "59594315000157", ultimo_nsu="000000000000010"
+            ),
+            lambda: self.nfe.consultar_distribuicao(
+                "12345678909", nsu_especifico="000000000000010"
+            ),
+            lambda: self.nfe.consultar_distribuicao("59594315000157", chave=CHAVE),
+        )
+        for chamada in chamadas:
+            esqueleto, generateds = self.mensagens(chamada)
+            self.assertEqual(esqueleto, generateds)
+
+    def test_campos_da_raiz(self):
+        with mock.patch.object(NFe, "_post") as post:
+            self.nfe.consultar_distribuicao("59594315000157", chave=CHAVE)
+        raiz = post.call_args[0][0]
+        self.nfe._transmissao = SimpleNamespace(certificado=None)
+        self.assertEqual(
+            self.nfe._chave_limitador(raiz, "nfeDistDFeInteresse"),
+            ("59594315000157", 35, "nfeDistDFeInteresse"),
+        )
+
+    def test_envio_xml_em_str(self):
+        self.assertFalse(NFe.esqueletos_xml)
+        self.nfe.esqueletos_xml = True
+        with mock.patch.object(NFe, "_post") as post:
+            self.nfe.status_servico()
+        raiz = post.call_args[0][0]
+        envelope = etree.fromstring(b"<Envelope><Body/></Envelope>")
+        envelope[0].append(raiz)
+        ret = RetornoSoap("nfeStatusServicoNF", raiz, raiz, None, None)
+        self.assertIsInstance(ret.envio_xml, str)
+        self.assertTrue(ret.envio_xml.startswith("<consStatServ "))
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.estimador import EstimadorTempoProcessamento
+from erpbrasil.edoc.nfe import NFe
+
+CHAVE = ("35", "55", "1")
+
+
+class EstimadorTempoProcessamentoTests(TestCase):
+    def setUp(self):
+        self.estimador = EstimadorTempoProcessamento(minimo=0.0, margem=1.0)
+
+    def test_sem_amostras_usa_padrao(self):
+        self.assertEqual(self.estimador.tempo_espera(CHAVE, 5.0), 5.0)
+        self.assertEqual(self.estimador.tempo_espera(CHAVE, 5.0, decorrido=2.0), 3.0)
+
+    def test_media_converge_para_tempo_real(self):
+        for _ in range(50):
+            self.estimador.registrar(CHAVE, 3.0, em_processamento_ate=1.0)
+        self.assertAlmostEqual(self.estimador.tempo_espera(CHAVE, 10.0), 2.0)
+        # Outras chaves continuam usando o tMed informado
+        self.assertEqual(self.estimador.tempo_espera(("41", "55", "1"), 10.0), 10.0)
+
+    def test_estimativa_diminui_sem_em_processamento(self):
+        self.estimador.registrar(CHAVE, 10.0)
+        anterior = self.estimador.tempo_espera(CHAVE, 10.0)
+        for _ in range(10):
+            self.estimador.registrar(CHAVE, anterior)
+            atual = self.estimador.tempo_espera(CHAVE, 10.0)
+            self.assertLess(atual, anterior)
+            anterior = atual
+
+    def test_limites(self):
+        estimador = EstimadorTempoProcessamento(minimo=1.0, maximo=20.0)
+        estimador.registrar(CHAVE, 100.0, em_processamento_ate=100.0)
+        self.assertEqual(estimador.tempo_espera(CHAVE, 1.0), 20.0)
+        self.assertEqual(estimador.tempo_espera(CHAVE, 1.0, decorrido=200.0), 1.0)
+
+    def test_estatisticas(self):
+        self.estimador.registrar_em_processamento(CHAVE)
+        self.estimador.registrar(CHAVE, 4.0, em_processamento_ate=2.0)
+        estatisticas = self.estimador.estatisticas()[CHAVE]
+        self.assertEqual(estatisticas["amostras"], 1)
+        self.assertEqual(estatisticas["em_processamento"], 1)
+        self.assertEqual(estatisticas["media"], 3.0)
+
+    def test_observa_recibo(self):
+        nfe = NFe(None, "35", versao="4.00", ambiente="1")
+        nfe.estimador = self.estimador
+        proc_envio = SimpleNamespace(
+            recebido_em=100.0,
+            resposta=SimpleNamespace(infRec=SimpleNamespace(tMed="1")),
+        )
+
+        def recibo(recebido_em, cStat):
+            return SimpleNamespace(
+                recebido_em=recebido_em, resposta=SimpleNamespace(cStat=cStat)
+            )
+
+        nfe._observa_recibo(proc_envio, recibo(101.0, "105"))
+        nfe._observa_recibo(proc_envio, recibo(105.0, "104"))
+
+        estatisticas = self.estimador.estatisticas()[(35, "55", "1")]
+        self.assertEqual(estatisticas["em_processamento"], 1)
+        self.assertEqual(estatisticas["media"], 3.0)
+
+    def test_espera_apos_em_processamento(self):
+        estimador = EstimadorTempoProcessamento()
+        estimador.registrar(CHAVE, 10.0 / 0.9)
+        nfe = NFe(None, "35", versao="4.00", ambiente="1")
+        nfe.estimador = estimador
+        nfe._chave_estimador = lambda: CHAVE
+        proc_envio = SimpleNamespace(
+            recebido_em=100.0,
+            resposta=SimpleNamespace(infRec=SimpleNamespace(tMed="1")),
+        )
+        with mock.patch("erpbrasil.edoc.edoc.time.monotonic", return_value=101.0):
+            self.assertAlmostEqual(nfe._tempo_espera(proc_envio), 10.0)
+
+        esperas = []
+        for consulta in (111.0, 113.0, 117.0):
+            nfe._observa_recibo(
+                proc_envio,
+                SimpleNamespace(
+                    recebido_em=consulta, resposta=SimpleNamespace(cStat="105")
+                ),
+            )
+            with mock.patch(
+                "erpbrasil.edoc.edoc.time.monotonic", return_value=consulta
+            ):
+                esperas.append(nfe._tempo_espera(proc_envio))
+        # Após o "em processamento" a espera não cai para o mínimo e dobra
+        # a cada nova resposta
+        self.assertEqual(esperas, [2.0, 4.0, 8.0])
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from multiprocessing import Pool
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.limitador import (
+    BackendSQLite,
+    LimitadorConsultas,
+    LimiteConsultaExcedido,
+)
+from erpbrasil.edoc.nfe import NFe
+
+TAXAS = {"nfeConsultaNF": (3, 30)}
+
+
+def consumir_em_processo(caminho):
+    limitador = LimitadorConsultas(TAXAS, BackendSQLite(caminho), bloquear=False)
+    concedidas = 0
+    for _ in range(3):
+        try:
+            limitador.adquirir("00000000000191", 35, "nfeConsultaNF")
+            concedidas += 1
+        except LimiteConsultaExcedido:
+            pass
+    return concedidas
+
+
+class LimitadorConsultasTests(TestCase):
+    def test_nao_bloqueante(self):
+        limitador = LimitadorConsultas(TAXAS, bloquear=False)
+        for _ in range(3):
+            limitador.adquirir("00000000000191", 35, "nfeConsultaNF")
+        with self.assertRaises(LimiteConsultaExcedido) as contexto:
+            limitador.adquirir("00000000000191", 35, "nfeConsultaNF")
+        self.assertAlmostEqual(contexto.exception.espera, 10, delta=0.1)
+
+        # Os baldes são independentes por CNPJ, UF e serviço
+        limitador.adquirir("00000000000272", 35, "nfeConsultaNF")
+        limitador.adquirir("00000000000191", 41, "nfeConsultaNF")
+        limitador.adquirir("00000000000191", 35, "nfeRecepcaoEvento")
+
+    def test_bloqueante_aguarda_ficha(self):
+        limitador = LimitadorConsultas(TAXAS)
+        with mock.patch("erpbrasil.edoc.limitador.time") as relogio:
+            relogio.time.return_value = 1000.0
+            relogio.monotonic.return_value = 0.0
+            relogio.sleep.side_effect = lambda segundos: setattr(
+                relogio.time, "return_value", relogio.time.return_value + segundos
+            )
+            for _ in range(4):
+                limitador.adquirir("00000000000191", 35, "nfeConsultaNF")
+        relogio.sleep.assert_called_once()
+        self.assertAlmostEqual(relogio.sleep.call_args[0][0], 10)
+
+    def test_timeout(self):
+        limitador = LimitadorConsultas(TAXAS, timeout=1)
+        for _ in range(3):
+            limitador.adquirir("00000000000191", 35, "nfeConsultaNF")
+        with self.assertRaises(LimiteConsultaExcedido):
+            limitador.adquirir("00000000000191", 35, "nfeConsultaNF")
+
+    def test_sqlite_entre_processos(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "limites.sqlite")
+            BackendSQLite(caminho)
+            with Pool(4) as pool:
+                concedidas = pool.map(consumir_em_processo, [caminho] * 4)
+        self.assertEqual(sum(concedidas), 3)
+
+    def test_post_consulta_limitador(self):
+        nfe = NFe(mock.MagicMock(), "35", versao="4.00", ambiente="1")
+        nfe.limitador = LimitadorConsultas(TAXAS, bloquear=False)
+        nfe._transmissao.certificado.cnpj_cpf = "00000000000191"
+        with mock.patch("erpbrasil.edoc.edoc.analisar_retorno_raw"), mock.patch.object(
+            NFe, "_cliente"
+        ):
+            for _ in range(3):
+                nfe.consulta_documento("35" + "0" * 42)
+            with self.assertRaises(LimiteConsultaExcedido):
+                nfe.consulta_documento("35" + "0" * 42)
+        self.assertEqual(nfe._transmissao.enviar.call_count, 3)
@@ -1,9 +1,11 @@
 import logging.config
 import os
-from unittest import TestCase
+from types import SimpleNamespace
+from unittest import TestCase, mock
 
 import vcr
 from erpbrasil.edoc.mde import MDe, TransmissaoMDE
+from lxml import etree
 from requests import Session
 
 from .test_certificate_mixin import TestCertificateMixin
@@ -80,3 +82,38 @@ class Tests(TestCertificateMixin, TestCase):
         )
 
         self.assertIn(ret.resposta.cStat, VALID_CSTAT_LIST)
+
+
+class CabecalhoTests(TestCase):
+    def test_cabecalho_em_cache(self):
+        transmissao = TransmissaoMDE(None, cache=False)
+        xmlns = "http://www.portalfiscal.inf.br/nfe/wsdl/NFeRecepcaoEvento4"
+        esperado = etree.tostring(
+            etree.fromstring(
+                f'<nfeCabecMsg xmlns="{xmlns}">'
+                "<cUF>SP</cUF><versaoDados>1.00</versaoDados></nfeCabecMsg>"
+            )
+        )
+        cabecalhos = []
+        for _ in range(2):
+            mensagem = transmissao.interpretar_mensagem(
+                etree.Element("TEnvEvento"), operacao="nfeRecepcaoEvento", uf="SP"
+            )
+            cabecalhos.append(mensagem["_soapheaders"][0])
+            self.assertEqual(etree.tostring(cabecalhos[-1]), esperado)
+        # Cada envio recebe a sua própria cópia do cabeçalho
+        self.assertIsNot(cabecalhos[0], cabecalhos[1])
+
+    def test_sigla_do_cuf_autor(self):
+        mde = MDe(mock.MagicMock(), "35", versao="1.00", ambiente="1")
+        mde.disjuntores = mock.Mock()
+        with mock.patch.object(MDe, "_cliente"), mock.patch.object(
+            MDe, "_generateds_to_etree"
+        ), mock.patch.object(MDe, "analisar_retorno_raw") as analisar:
+            proc = mde._post(
+                SimpleNamespace(cUFAutor=35), "url", "nfeDistDFeInteresse", None
+            )
+        self.assertEqual(mde._transmissao.enviar.call_args.kwargs, {"uf": "SP"})
+        self.assertIs(proc, analisar.return_value)
+        self.assertEqual(proc.url, "url")
+        mde.disjuntores.registrar.assert_called_once_with("url", proc, None)
@@ -1,7 +1,14 @@
-from unittest import TestCase
+import collections
+import copy
+import threading
+import time
+from unittest import TestCase, mock
 
-from erpbrasil.edoc.nfe import NFe
+from erpbrasil.edoc.nfe import NFe, gera_id_lote
+from erpbrasil.edoc.resposta import RetornoSoap
+from erpbrasil.nfelib_legacy.v4_00 import retConsReciNFe, retEnviNFe
 from lxml import etree
+from requests import Timeout
 
 
 class NFeTests(TestCase):
@@ -54,3 +61,82 @@ class NFeTests(TestCase):
         child_tags = [child.tag for child in children]
         self.assertIn("{http://www.portalfiscal.inf.br/nfe}NFe", child_tags)
         self.assertIn("{http://www.portalfiscal.inf.br/nfe}protNFe", child_tags)
+
+    def test_consulta_documentos(self):
+        chaves = [
+            uf + "2401" + "12345678000195" + "55" + "001" + "%09d" % numero + "1" * 9
+            for uf in ("35", "43", "31")
+            for numero in range(6)
+        ]
+        trava = threading.Lock()
+        simultaneas = collections.Counter()
+        maximo = collections.Counter()
+
+        def consulta(documento, chave, url):
+            if chave == chaves[1]:
+                raise Timeout
+            with trava:
+                simultaneas[url] += 1
+                maximo[url] = max(maximo[url], simultaneas[url])
+            time.sleep(0.01)
+            with trava:
+                simultaneas[url] -= 1
+            return url
+
+        with mock.patch.object(NFe, "_consulta_documento", consulta):
+            retornos = dict(
+                self.nfe.consulta_documentos(chaves, max_workers=6, max_por_endpoint=2)
+            )
+
+        self.assertEqual(sorted(retornos), sorted(chaves))
+        self.assertIsInstance(retornos[chaves[1]], Timeout)
+        self.assertIn("fazenda.sp.gov.br", retornos[chaves[0]])
+        self.assertIn("sefazrs.rs.gov.br", retornos[chaves[6]])
+        self.assertEqual(len(maximo), 3)
+        self.assertTrue(all(valor <= 2 for valor in maximo.values()))
+
+    def test_divide_lote(self):
+        self.nfe._lote_maximo_documentos = 3
+        xmls = [copy.deepcopy(self.nfe_element) for _ in range(7)]
+        self.assertEqual([len(lote) for lote in self.nfe._divide_lote(xmls)], [3, 3, 1])
+
+        self.nfe._lote_maximo_bytes = 2048 + 2 * len(etree.tostring(xmls[0]))
+        self.assertEqual(
+            [len(lote) for lote in self.nfe._divide_lote(xmls)], [2, 2, 2, 1]
+        )
+
+    def test_gera_id_lote(self):
+        ids = {gera_id_lote() for _ in range(500)}
+        self.assertEqual(len(ids), 500)
+        self.assertTrue(all(len(id_lote) == 15 for id_lote in ids))
+
+    def test_monta_processo_lote(self):
+        chaves = ["3524011234567800019555001%09d1%08d" % (n, n) for n in (1, 2)]
+        envio = etree.Element("{http://www.portalfiscal.inf.br/nfe}enviNFe")
+        for chave in chaves:
+            nfe = copy.deepcopy(self.nfe_element)
+            nfe[0].set("Id", "NFe" + chave)
+            envio.append(nfe)
+        protocolos = [
+            retEnviNFe.TProtNFe(
+                versao="4.00",
+                infProt=retEnviNFe.infProtType(chNFe=chave, cStat="100"),
+            )
+            for chave in reversed(chaves)
+        ]
+        proc_envio = RetornoSoap("nfeAutorizacaoLote", envio, None, None, None)
+        proc_recibo = RetornoSoap(
+            "nfeRetAutorizacaoLote",
+            None,
+            None,
+            None,
+            retConsReciNFe.TRetConsReciNFe(protNFe=protocolos),
+        )
+
+        self.assertTrue(self.nfe.monta_processo(None, proc_envio, proc_recibo))
+        self.assertEqual(sorted(proc_recibo.processos), sorted(chaves))
+        self.assertFalse(hasattr(proc_recibo, "processo"))
+        for chave, processo in proc_recibo.processos.items():
+            self.assertEqual(processo.find(".//{*}infNFe").get("Id"), "NFe" + chave)
+            self.assertEqual(processo.findtext(".//{*}chNFe"), chave)
+        self.assertEqual(len(envio), 2)
@@ -0,0 +1,91 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.pool import AdaptadorCertificado, EntradaPool, PoolClientes
+from erpbrasil.transmissao import TransmissaoSOAP
+
+from .test_certificate_mixin import TestCertificateMixin
+
+
+class PoolFalso(PoolClientes):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.criados = []
+
+    def _criar_entrada(self, transmissao, url, verify):
+        entrada = EntradaPool(object())
+        self.criados.append(entrada)
+        return entrada
+
+
+class PoolClientesTests(TestCertificateMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.transmissao = TransmissaoSOAP(self.certificate)
+
+    def test_reaproveita_cliente(self):
+        pool = PoolFalso()
+        with pool.cliente(self.transmissao, "https://a/ws?wsdl") as primeiro:
+            pass
+        with pool.cliente(self.transmissao, "https://a/ws?wsdl") as segundo:
+            pass
+
+        self.assertIs(primeiro, segundo)
+        self.assertEqual(pool.estatisticas()["acertos"], 1)
+        self.assertEqual(pool.estatisticas()["falhas"], 1)
+
+    def test_descarta_menos_usado(self):
+        pool = PoolFalso(tamanho_maximo=2)
+        for url in ("https://a", "https://b", "https://a", "https://c"):
+            with pool.cliente(self.transmissao, url):
+                pass
+
+        self.assertEqual(len(pool.criados), 3)
+        self.assertEqual(pool.estatisticas()["descartes"], 1)
+        self.assertTrue(pool.criados[1].descartado)
+        self.assertFalse(pool.criados[0].descartado)
+
+    def test_expira_por_ttl(self):
+        pool = PoolFalso(ttl=10)
+        with mock.patch(
+            "erpbrasil.edoc.pool.time.monotonic", return_value=0
+        ), pool.cliente(self.transmissao, "https://a"):
+            pass
+        with mock.patch(
+            "erpbrasil.edoc.pool.time.monotonic", return_value=11
+        ), pool.cliente(self.transmissao, "https://a"):
+            pass
+
+        self.assertEqual(len(pool.criados), 2)
+        self.assertEqual(pool.estatisticas()["falhas"], 2)
+
+    def test_nao_fecha_cliente_em_uso(self):
+        pool = PoolFalso(tamanho_maximo=1)
+        with pool.cliente(self.transmissao, "https://a"):
+            with pool.cliente(self.transmissao, "https://b"):
+                pass
+            entrada = pool.criados[0]
+            self.assertTrue(entrada.descartado)
+            self.assertEqual(entrada.em_uso, 1)
+        self.assertEqual(entrada.em_uso, 0)
+
+    def test_chave_privada_apenas_em_memoria(self):
+        pool = PoolClientes()
+        with tempfile.TemporaryDirectory() as diretorio, mock.patch.object(
+            tempfile, "tempdir", diretorio
+        ), mock.patch("erpbrasil.edoc.pool.Client") as cliente, mock.patch(
+            "erpbrasil.edoc.wsdl.Document"
+        ):
+            entrada = pool._criar_entrada(self.transmissao, "https://a", False)
+            self.assertEqual(os.listdir(diretorio), [])
+
+        session = cliente.call_args.kwargs["transport"].session
+        self.assertIsNone(session.cert)
+        adaptador = session.get_adapter("https://a")
+        self.assertIsInstance(adaptador, AdaptadorCertificado)
+        self.assertIs(
+            adaptador.contexto,
+            pool._contexto(self.transmissao, False),
+        )
+        entrada.fechar()
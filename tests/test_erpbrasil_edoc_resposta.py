@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+from erpbrasil.edoc.resposta import (
+    RetornoSoap,
+    analisar_retorno_raw,
+    construir_binding,
+)
+from erpbrasil.nfelib_legacy.v4_00 import retConsStatServ
+from lxml import etree
+from nfelib.cte.bindings.v4_0 import RetConsStatServCte
+
+from .test_erpbrasil_edoc_assincrono import RETORNO_STATUS, resposta_http
+
+
+class AnalisarRetornoRawTests(TestCase):
+    def test_envelope_soap12(self):
+        retorno = resposta_http(RETORNO_STATUS)
+        ret = analisar_retorno_raw(
+            "nfeStatusServicoNF", None, "", retorno, retConsStatServ
+        )
+        self.assertEqual(ret.resposta.cStat, "107")
+        self.assertEqual(ret.resposta.tMed, "1")
+
+    def test_prefixo_qualquer(self):
+        conteudo = RETORNO_STATUS.replace(b"soap:", b"env:").replace(
+            b"xmlns:soap", b"xmlns:env"
+        )
+        ret = analisar_retorno_raw(
+            "nfeStatusServicoNF", None, "", resposta_http(conteudo), retConsStatServ
+        )
+        self.assertEqual(ret.resposta.xMotivo, "Servico em Operacao")
+
+    def test_sem_body(self):
+        with self.assertLogs(level="WARNING"):
+            ret = analisar_retorno_raw(
+                "nfeStatusServicoNF",
+                None,
+                "",
+                resposta_http(b"<html>erro</html>"),
+                retConsStatServ,
+            )
+        self.assertIsNone(ret)
+
+
+class ConstruirBindingTests(TestCase):
+    def test_generateds(self):
+        elemento = etree.fromstring(RETORNO_STATUS)[0][0][0]
+        resposta = construir_binding(elemento, retConsStatServ)
+        self.assertIsInstance(resposta, retConsStatServ.TRetConsStatServ)
+        self.assertEqual(resposta.cStat, "107")
+
+    def test_xsdata(self):
+        elemento = etree.fromstring(
+            RETORNO_STATUS.replace(
+                b'portalfiscal.inf.br/nfe"', b'portalfiscal.inf.br/cte"'
+            ).replace(b"retConsStatServ", b"retConsStatServCte")
+        )[0][0][0]
+        resposta = construir_binding(elemento, RetConsStatServCte)
+        self.assertEqual(resposta.cStat, "107")
+        self.assertEqual(resposta.xMotivo, "Servico em Operacao")
+
+
+class RetornoSoapTests(TestCase):
+    def test_envio_xml_sob_demanda(self):
+        raiz = retConsStatServ.TConsStatServ(versao="4.00", tpAmb="1", xServ="STATUS")
+        elemento = etree.fromstring(
+            b'<consStatServ xmlns="http://www.portalfiscal.inf.br/nfe" '
+            b'versao="4.00"><tpAmb>1</tpAmb><xServ>STATUS</xServ></consStatServ>'
+        )
+        envelope = etree.fromstring(
+            b'<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope">'
+            b"<soap:Body/></soap:Envelope>"
+        )
+        envelope[0].append(elemento)
+
+        ret = RetornoSoap("nfeStatusServicoNF", raiz, elemento, None, None)
+        self.assertEqual(
+            ret.envio_xml,
+            '<consStatServ xmlns="http://www.portalfiscal.inf.br/nfe" '
+            'versao="4.00"><tpAmb>1</tpAmb><xServ>STATUS</xServ></consStatServ>',
+        )
+
+        ret = RetornoSoap("nfeStatusServicoNF", elemento, elemento, None, None)
+        self.assertIsInstance(ret.envio_xml, bytes)
@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from erpbrasil.edoc.resumo import (
+    Resumo,
+    ResumoEvento,
+    ResumoNFe,
+    ResumoProcNFe,
+    resumir,
+)
+from lxml import etree
+
+CHAVE = "35200159594315000157550010000000012062777161"
+
+RES_NFE = f"""<resNFe xmlns="http://www.portalfiscal.inf.br/nfe" versao="1.01">
+<chNFe>{CHAVE}</chNFe><CNPJ>59594315000157</CNPJ><xNome>EMPRESA LTDA</xNome>
+<IE>123456789012</IE><dhEmi>2020-01-10T10:00:00-03:00</dhEmi><tpNF>1</tpNF>
+<vNF>150.00</vNF><digVal>mkbq7e4dnvoO4lSuvs6q+yy7nYc=</digVal>
+<dhRecbto>2020-01-10T10:00:05-03:00</dhRecbto><nProt>135200000000001</nProt>
+<cSitNFe>1</cSitNFe></resNFe>"""
+
+RES_EVENTO = f"""<resEvento xmlns="http://www.portalfiscal.inf.br/nfe" versao="1.01">
+<cOrgao>35</cOrgao><CPF>12345678909</CPF><chNFe>{CHAVE}</chNFe>
+<dhEvento>2020-01-11T09:00:00-03:00</dhEvento><tpEvento>110111</tpEvento>
+<nSeqEvento>1</nSeqEvento><xEvento>Cancelamento</xEvento>
+<dhRecbto>2020-01-11T09:00:02-03:00</dhRecbto><nProt>135200000000002</nProt>
+</resEvento>"""
+
+PROC_NFE = f"""<nfeProc xmlns="http://www.portalfiscal.inf.br/nfe" versao="4.00">
+<NFe><infNFe Id="NFe{CHAVE}" versao="4.00">
+<ide><cUF>35</cUF><dhEmi>2020-01-10T10:00:00-03:00</dhEmi><tpNF>1</tpNF></ide>
+<emit><CNPJ>59594315000157</CNPJ><xNome>EMPRESA LTDA</xNome><IE>123</IE></emit>
+<total><ICMSTot><vBC>0.00</vBC><vNF>150.00</vNF></ICMSTot></total>
+</infNFe></NFe>
+<protNFe versao="4.00"><infProt><tpAmb>1</tpAmb><chNFe>{CHAVE}</chNFe>
+<dhRecbto>2020-01-10T10:00:05-03:00</dhRecbto><nProt>135200000000001</nProt>
+<cStat>100</cStat></infProt></protNFe></nfeProc>"""
+
+
+class ResumoTests(TestCase):
+    def test_res_nfe(self):
+        resumo = resumir(
+            "resNFe_v1.01.xsd", etree.fromstring(RES_NFE), "000000000000001"
+        )
+        self.assertIsInstance(resumo, ResumoNFe)
+        self.assertEqual(resumo.chNFe, CHAVE)
+        self.assertEqual(resumo.cnpj_cpf, "59594315000157")
+        self.assertEqual(resumo.vNF, "150.00")
+        self.assertEqual(resumo.cSitNFe, "1")
+        self.assertEqual(resumo.nsu, "000000000000001")
+        self.assertFalse(hasattr(resumo, "__dict__"))
+        self.assertFalse(hasattr(resumo, "_elemento"))
+        self.assertEqual(resumo.binding().chNFe, CHAVE)
+        with self.assertRaises(TypeError):
+            Resumo(etree.fromstring(RES_NFE))
+
+    def test_res_evento(self):
+        resumo = resumir("resEvento_v1.01.xsd", etree.fromstring(RES_EVENTO))
+        self.assertIsInstance(resumo, ResumoEvento)
+        self.assertEqual(resumo.cnpj_cpf, "12345678909")
+        self.assertEqual(resumo.tpEvento, "110111")
+
+    def test_proc_nfe(self):
+        resumo = resumir("procNFe_v4.00.xsd", etree.fromstring(PROC_NFE))
+        self.assertIsInstance(resumo, ResumoProcNFe)
+        self.assertEqual(
+            (resumo.chNFe, resumo.CNPJ, resumo.dhEmi, resumo.vNF, resumo.cStat),
+            (CHAVE, "59594315000157", "2020-01-10T10:00:00-03:00", "150.00", "100"),
+        )
+
+    def test_schema_sem_resumo(self):
+        self.assertIsNone(
+            resumir("procEventoNFe_v1.00.xsd", etree.fromstring(RES_EVENTO))
+        )
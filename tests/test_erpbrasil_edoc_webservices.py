@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from erpbrasil.edoc import webservices
+from erpbrasil.edoc.cte import CTe
+from erpbrasil.edoc.nfe import NFe
+from erpbrasil.edoc.webservices import (
+    REGISTRO,
+    WS_CTE_STATUS_SERVICO,
+    WS_NFE_AUTORIZACAO,
+    WS_NFE_CADASTRO,
+    WS_NFE_SITUACAO,
+    RegistroWebservices,
+    localizar_url,
+    validar_indice,
+)
+
+
+class RegistroWebservicesTests(TestCase):
+    def test_nfe_igual_a_resolucao_pelas_tabelas(self):
+        for chave, url in REGISTRO:
+            if chave[2] in ("55", "65") and chave[0] in webservices.SERVICOS_NFE:
+                self.assertEqual(url, webservices._resolver_url(*chave))
+
+    def test_localizar_url(self):
+        self.assertEqual(
+            localizar_url(WS_NFE_AUTORIZACAO, "35", "55", 1),
+            "https://nfe.fazenda.sp.gov.br/ws/nfeautorizacao4.asmx?wsdl",
+        )
+        # SVC-AN para SP
+        self.assertEqual(
+            localizar_url(WS_NFE_AUTORIZACAO, 35, 55, "1", contingencia=True),
+            "https://www.svc.fazenda.gov.br/NFeAutorizacao4/NFeAutorizacao4.asmx?wsdl",
+        )
+        self.assertEqual(
+            localizar_url(WS_NFE_CADASTRO, "43", "55", 1),
+            "https://cad.sefazrs.rs.gov.br/ws/cadconsultacadastro/"
+            "cadconsultacadastro4.asmx?wsdl",
+        )
+        with self.assertRaises(KeyError):
+            localizar_url(WS_NFE_AUTORIZACAO, "99", "55", 1)
+
+    def test_cte_servidor_proprio_da_uf(self):
+        cte = CTe(None, "51", ambiente="1")
+        self.assertEqual(
+            cte._get_ws_endpoint(WS_CTE_STATUS_SERVICO),
+            "https://cte.sefaz.mt.gov.br/ctews2/services/CTeStatusServicoV4?wsdl",
+        )
+
+    def test_validar_indice(self):
+        faltantes = validar_indice()
+        self.assertNotIn((WS_NFE_AUTORIZACAO, "35", "55", 1, False), faltantes)
+        # Nem todas as UF oferecem a consulta cadastro na SVC
+        self.assertIn((WS_NFE_CADASTRO, "35", "55", 1, True), faltantes)
+
+    def test_alteracoes(self):
+        registro = RegistroWebservices.padrao()
+        registro.aplicar(
+            {
+                "servidores": {"nfe.fazenda.sp.gov.br": "http://localhost:8080"},
+                "urls": [
+                    {
+                        "servico": WS_NFE_SITUACAO,
+                        "uf": "41",
+                        "url": "https://status.local/ws",
+                    }
+                ],
+            }
+        )
+        self.assertEqual(
+            registro.url(WS_NFE_AUTORIZACAO, "35", "55", 1),
+            "http://localhost:8080/ws/nfeautorizacao4.asmx?wsdl",
+        )
+        for mod in ("55", "65"):
+            for ambiente in (1, 2):
+                self.assertEqual(
+                    registro.url(WS_NFE_SITUACAO, "41", mod, ambiente),
+                    "https://status.local/ws",
+                )
+        # O registro padrão não é alterado
+        self.assertNotIn("localhost", localizar_url(WS_NFE_AUTORIZACAO, "35", "55", 1))
+
+        nfe = NFe(None, "35", ambiente="1")
+        nfe.registro_webservices = registro
+        self.assertTrue(
+            nfe._get_ws_endpoint(WS_NFE_AUTORIZACAO).startswith(
+                "http://localhost:8080/"
+            )
+        )
+
+    def test_arquivo_na_variavel_de_ambiente(self):
+        codigo = (
+            "import sys; from erpbrasil.edoc.webservices import localizar_url; "
+            "print(localizar_url('NfeAutorizacao', '35', '55', 1)); "
+            "assert not [m for m in sys.modules if 'nfelib' in m]"
+        )
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "webservices.json")
+            with open(caminho, "w") as arquivo:
+                json.dump(
+                    {"servidores": {"nfe.fazenda.sp.gov.br": "sefaz.local"}}, arquivo
+                )
+            saida = subprocess.run(
+                [sys.executable, "-c", codigo],
+                check=True,
+                capture_output=True,
+                text=True,
+                env=dict(os.environ, ERPBRASIL_EDOC_WEBSERVICES=caminho),
+            ).stdout
+        self.assertEqual(
+            saida.strip(), "https://sefaz.local/ws/nfeautorizacao4.asmx?wsdl"
+        )
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from erpbrasil.edoc.wsdl import CacheWSDL, TransportCacheWSDL, urls_wsdl
+from zeep.transports import Transport
+
+URL = "https://nfe.fazenda.sp.gov.br/ws/nfestatusservico4.asmx?wsdl"
+
+
+class CacheWSDLTests(TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.cache = CacheWSDL(self.diretorio)
+
+    def test_grava_e_le(self):
+        self.cache.gravar(URL, b"<definitions/>")
+
+        self.assertEqual(CacheWSDL(self.diretorio).obter(URL), b"<definitions/>")
+        self.assertEqual(self.cache.verificar(), [])
+
+    def test_checksum_invalido(self):
+        self.cache.gravar(URL, b"<definitions/>")
+        caminho = os.path.join(self.diretorio, self.cache.nome_arquivo(URL))
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(b"<alterado/>")
+
+        self.assertIsNone(self.cache.obter(URL))
+        self.assertEqual(self.cache.verificar(), [URL])
+
+    def test_transport_usa_cache(self):
+        self.cache.gravar(URL, b"<definitions/>")
+        transport = TransportCacheWSDL(self.cache)
+        with mock.patch.object(Transport, "load") as load:
+            self.assertEqual(transport.load(URL), b"<definitions/>")
+            load.assert_not_called()
+
+    def test_transport_grava_no_primeiro_uso(self):
+        transport = TransportCacheWSDL(self.cache)
+        with mock.patch.object(Transport, "load", return_value=b"<novo/>") as load:
+            transport.load(URL)
+            transport.load(URL)
+
+        load.assert_called_once_with(URL)
+        self.assertEqual(self.cache.obter(URL), b"<novo/>")
+
+    def test_documento_analisado_uma_vez(self):
+        transport = TransportCacheWSDL(self.cache)
+        with mock.patch("erpbrasil.edoc.wsdl.Document") as documento:
+            primeiro = self.cache.documento(URL, transport)
+            self.assertIs(self.cache.documento(URL, transport), primeiro)
+        documento.assert_called_once_with(URL, transport)
+
+    def test_transport_atualiza_cache(self):
+        transport = TransportCacheWSDL(self.cache, atualizar=True)
+        with mock.patch.object(Transport, "load", return_value=b"<novo/>"):
+            transport.load(URL)
+
+        self.assertEqual(self.cache.obter(URL), b"<novo/>")
+
+    def test_urls_wsdl(self):
+        urls = urls_wsdl()
+        self.assertIn(URL, urls)
+        self.assertTrue(all(url.lower().endswith("?wsdl") for url in urls))